@@ -0,0 +1,100 @@
+"""Benchmark the fact table write path (rows/sec).
+
+Generates ``--rows`` bout records spread over consecutive basho like the
+real table (from the fixture pages), then times, best of ``--repeat``:
+
+    write    write_fact_csv() of every record to a new file
+    force    update_fact_csv_batch() replacing the newest basho (--force)
+    upsert   update_fact_csv_batch() upserting the newest basho
+    force-partitioned, upsert-partitioned
+             the same updates on the table split per basho (FactStore)
+
+Rates count every row of the table, including the existing rows an update
+reads back and rewrites (or, partitioned, leaves alone).
+
+Usage:
+    uv run python scripts/bench_csv.py [--rows 369000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from sumodata.fact_store import FactStore  # noqa: E402
+from sumodata.io_csv import update_fact_csv_batch, write_fact_csv  # noqa: E402
+from sumodata.models import BoutRecord  # noqa: E402
+from sumodata.parse_results import parse_results_page  # noqa: E402
+
+FIXTURES = ROOT / "tests" / "fixtures"
+BOUTS_PER_DAY = 500
+BOUTS_PER_BASHO = 15 * BOUTS_PER_DAY
+
+
+def _records(n: int) -> list[BoutRecord]:
+    template = []
+    for path in sorted(FIXTURES.glob("results_*.html")):
+        template.extend(parse_results_page(
+            path.read_text(encoding="utf-8"), "", "honbasho_regular", "T", "", 1, "", "",
+        ))
+    records = []
+    for i in range(n):
+        basho = f"{2000 + i // BOUTS_PER_BASHO // 6}{(i // BOUTS_PER_BASHO % 6) * 2 + 1:02d}"
+        day = i // BOUTS_PER_DAY % 15 + 1
+        records.append(replace(
+            template[i % len(template)],
+            event_id=f"honbasho-{basho}", basho=basho, day=day,
+            bout_no=i % BOUTS_PER_DAY + 1, source_row_index=i % BOUTS_PER_DAY + 1,
+            source_url=f"https://sumodb.sumogames.de/Results.aspx?b={basho}&d={day}",
+            fetched_at="2025-01-27T00:00:00+00:00",
+        ))
+    return records
+
+
+def _best(run: Callable[[], None], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=369_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    records = _records(args.rows)
+    newest = records[-1].event_id
+    batch = {newest: [r for r in records if r.event_id == newest]}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fact_bout_daily.csv"
+        results = {
+            "write": _best(lambda: write_fact_csv(records, path), args.repeat),
+            "force": _best(lambda: update_fact_csv_batch(batch, path, True), args.repeat),
+            "upsert": _best(lambda: update_fact_csv_batch(batch, path, False), args.repeat),
+        }
+        store = FactStore(path)
+        store.split()
+        results["force-partitioned"] = _best(lambda: store.update(batch, True), args.repeat)
+        results["upsert-partitioned"] = _best(lambda: store.update(batch, False), args.repeat)
+    print(f"{args.rows} rows, {len(batch[newest])} in the updated basho")
+    for name, seconds in results.items():
+        print(f"{name:<20}{seconds:8.2f} s {args.rows / seconds:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
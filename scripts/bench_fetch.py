@@ -0,0 +1,82 @@
+"""Benchmark pooled keep-alive fetching against a local stand-in server.
+
+Serves fixture Results pages from the SumoDB stand-in (``sumodata.standin``)
+and fetches them repeatedly, once opening a new connection per page (the
+old ``requests.get`` path) and once through the shared pooled session in
+``sumodata.fetch``. Each new
+connection is charged ``--handshake-ms`` on the server side to stand in for
+the TCP+TLS setup cost of the real site.
+
+Usage:
+    uv run python scripts/bench_fetch.py [--pages 50] [--handshake-ms 60]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from sumodata import fetch  # noqa: E402
+from sumodata.standin import FixtureSource, StandinConfig, StandinServer  # noqa: E402
+
+FIXTURES = ROOT / "tests" / "fixtures"
+
+
+def _time_pages(get, url: str, pages: int) -> list[float]:
+    timings = []
+    for i in range(pages):
+        t0 = time.perf_counter()
+        resp = get(f"{url}?b=202501&d={i % 15 + 1}")
+        resp.raise_for_status()
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> float:
+    mean_ms = statistics.mean(timings) * 1000
+    p95_ms = sorted(timings)[int(len(timings) * 0.95) - 1] * 1000
+    print(f"{label:<22} mean={mean_ms:7.2f} ms  p95={p95_ms:7.2f} ms")
+    return mean_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--handshake-ms", type=float, default=60.0)
+    args = parser.parse_args()
+
+    server = StandinServer(
+        FixtureSource(FIXTURES, last_day="results_multi_division.html"),
+        StandinConfig(handshake=args.handshake_ms / 1000),
+    )
+    url = f"{server.base_url}/Results.aspx"
+
+    with server:
+        per_request = _time_pages(
+            lambda u: requests.get(u, headers=fetch.HEADERS, timeout=30),
+            url, args.pages,
+        )
+        session = fetch.get_session()
+        try:
+            pooled = _time_pages(
+                lambda u: session.get(u, timeout=30), url, args.pages,
+            )
+        finally:
+            fetch.close_session()
+
+    print(f"{args.pages} pages, simulated handshake {args.handshake_ms:.0f} ms")
+    before = _report("new connection/page", per_request)
+    after = _report("pooled session", pooled)
+    print(f"saved per page: {before - after:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
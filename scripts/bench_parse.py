@@ -0,0 +1,101 @@
+"""Benchmark full vs. strained parsing of Results and Banzuke pages.
+
+Parses each page with the whole document built (``strained=False``) and
+with only the tables the parser reads (the default), and reports the best
+parse time and the peak memory allocated during one parse (tracemalloc).
+The lxml backend is timed too when it is installed.
+
+Pages are the fixtures in tests/fixtures unless ``--pages`` points at
+saved pages (e.g. files from a ``dir`` raw cache), which are much closer
+to what the real site serves: the fixtures hold little besides the tables.
+
+Usage:
+    uv run python scripts/bench_parse.py [--repeat 20]
+    uv run python scripts/bench_parse.py --pages data/raw/honbasho-202401/*.html
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from sumodata import parse_lxml  # noqa: E402
+from sumodata.parse_banzuke import parse_banzuke_page  # noqa: E402
+from sumodata.parse_results import read_results_page  # noqa: E402
+
+FIXTURES = ROOT / "tests" / "fixtures"
+
+
+def _parsers(html: str) -> dict:
+    if 'class="banzuke"' in html:
+        parsers = {
+            "full": lambda: parse_banzuke_page(html, "202501", "", strained=False),
+            "strained": lambda: parse_banzuke_page(html, "202501", ""),
+        }
+        lxml_parse = lambda: parse_lxml.parse_banzuke_page(html, "202501", "")  # noqa: E731
+    else:
+        parsers = {
+            "full": lambda: read_results_page(html, strained=False),
+            "strained": lambda: read_results_page(html),
+        }
+        lxml_parse = lambda: parse_lxml.read_results_page(html)  # noqa: E731
+    if parse_lxml.lxml is not None:
+        parsers["lxml"] = lxml_parse
+    return parsers
+
+
+def _best_ms(parse, repeat: int) -> float:
+    """Fastest of 5 runs of ``repeat`` parses, per parse."""
+    return min(timeit.repeat(parse, number=repeat, repeat=5)) / repeat * 1000
+
+
+def _peak_kib(parse) -> float:
+    gc.collect()
+    tracemalloc.start()
+    result = parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=Path, nargs="*", default=None)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    pages = args.pages or sorted(
+        list(FIXTURES.glob("results_*.html")) + list(FIXTURES.glob("banzuke_*.html"))
+    )
+    totals: dict[str, list[float]] = {}
+    print(f"{'page':<34}{'parser':<10}{'time ms':>9}{'peak KiB':>10}")
+    for path in pages:
+        html = path.read_text(encoding="utf-8")
+        for name, parse in _parsers(html).items():
+            ms, kib = _best_ms(parse, args.repeat), _peak_kib(parse)
+            total = totals.setdefault(name, [0.0, 0.0])
+            total[0] += ms
+            total[1] += kib
+            print(f"{path.name[:33]:<34}{name:<10}{ms:9.3f}{kib:10.1f}")
+
+    print()
+    full_ms, full_kib = totals["full"]
+    for name, (ms, kib) in totals.items():
+        print(
+            f"{'total':<34}{name:<10}{ms:9.3f}{kib:10.1f}"
+            f"   ({ms / full_ms:.0%} time, {kib / full_kib:.0%} memory of full)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""End-to-end pipeline benchmark against the local SumoDB stand-in.
+
+Starts ``sumodata.standin`` in-process, runs the full ``cli.main`` flow
+(fetch, parse, CSV write) for each basho in a scratch project directory
+with the raw cache off, and reports pages/sec and seconds per basho.
+Adaptive rate control is off unless re-enabled; arguments after ``--``
+are passed to the CLI unchanged and override the defaults used here.
+
+Usage:
+    uv run python scripts/bench_pipeline.py --latency-ms 80 --basho 202401 202403
+    uv run python scripts/bench_pipeline.py --raw-dir data/raw -- --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from sumodata import cli  # noqa: E402
+from sumodata.fetch import DEFAULT_CONCURRENCY  # noqa: E402
+from sumodata.standin import (  # noqa: E402
+    StandinServer,
+    add_config_arguments,
+    config_from_args,
+)
+
+FIXTURES = ROOT / "tests" / "fixtures"
+
+
+def main() -> None:
+    argv = sys.argv[1:]
+    cli_args: list[str] = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, cli_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--basho", nargs="+", default=["202501"])
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Passed to the CLI (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rate", type=float, default=1000.0,
+        help="Passed to the CLI; high by default so the stand-in, not the "
+             "politeness budget, is measured (default: 1000)",
+    )
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.fixtures is None and args.raw_dir is None:
+        args.fixtures = FIXTURES
+    elif args.raw_dir is not None:
+        args.raw_dir = args.raw_dir.resolve()
+    source, config = config_from_args(parser, args)
+
+    # Keep the CLI's per-page INFO logs out of the report
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+
+    timings: list[float] = []
+    failed: list[str] = []
+    cwd = Path.cwd()
+    with StandinServer(source, config) as server, tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "data").mkdir()
+        os.chdir(tmp)
+        try:
+            for basho in args.basho:
+                before = server.counts["requests"]
+                t0 = time.perf_counter()
+                try:
+                    cli.main([
+                        "--basho", basho,
+                        "--raw-cache", "off",
+                        "--base-url", server.base_url,
+                        "--concurrency", str(args.concurrency),
+                        "--rate", str(args.rate),
+                        "--adaptive-rate", "off",
+                        *cli_args,
+                    ])
+                except SystemExit:
+                    failed.append(basho)
+                    print(f"{basho}: failed")
+                    continue
+                elapsed = time.perf_counter() - t0
+                timings.append(elapsed)
+                print(
+                    f"{basho}: {server.counts['requests'] - before} requests "
+                    f"in {elapsed:.2f} s"
+                )
+        finally:
+            os.chdir(cwd)
+        counts = dict(server.counts)
+
+    if not timings:
+        sys.exit("every basho failed")
+    total = sum(timings)
+    pages = counts.get("pages", 0)
+    print(
+        f"stand-in: latency={config.latency * 1000:.0f} ms "
+        f"jitter={config.jitter * 1000:.0f} ms error_rate={config.error_rate:g} "
+        f"bandwidth={config.bandwidth or 'unlimited'}"
+    )
+    print(
+        f"served: {counts.get('requests', 0)} requests, {pages} pages, "
+        f"{counts.get('errors', 0)} injected errors, "
+        f"{counts.get('connections', 0)} connections"
+    )
+    print(f"pages/sec:   {pages / total:8.2f}")
+    print(f"s/basho:     {statistics.mean(timings):8.2f}")
+    if failed:
+        print(f"failed:      {' '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
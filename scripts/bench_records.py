@@ -0,0 +1,98 @@
+"""Benchmark the memory held by a fact table's worth of bout records.
+
+Builds ``--rows`` records (default: about the size of the full history)
+by repeating the fixture pages over consecutive basho and days, with
+every string a separate object as when rows are read back from CSV, and
+reports the memory held (tracemalloc) by:
+
+    dataclass   a list of BoutRecord-shaped dataclasses with a __dict__
+    slots       a list of the (slotted) BoutRecord
+    batch       a BoutBatch: int arrays and dictionary-encoded strings
+
+Usage:
+    uv run python scripts/bench_records.py [--rows 369000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import astuple, fields, make_dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from sumodata.batch import BoutBatch  # noqa: E402
+from sumodata.models import BoutRecord  # noqa: E402
+from sumodata.parse_results import parse_results_page  # noqa: E402
+
+FIXTURES = ROOT / "tests" / "fixtures"
+
+PlainBout = make_dataclass(
+    "PlainBout", [(f.name, f.type) for f in fields(BoutRecord)],
+)
+
+
+def _template() -> list[tuple]:
+    rows = []
+    for path in sorted(FIXTURES.glob("results_*.html")):
+        rows.extend(astuple(r) for r in parse_results_page(
+            path.read_text(encoding="utf-8"), "", "honbasho_regular", "T", "", 1, "", "",
+        ))
+    return rows
+
+
+def _rows(n: int) -> Iterator[tuple]:
+    """``n`` row tuples with distinct string objects, like csv.reader's."""
+    template = _template()
+    names = [f.name for f in fields(BoutRecord)]
+    # Spread the rows like the real table: ~500 bouts a day, 15 days a basho
+    for i in range(n):
+        row = dict(zip(names, template[i % len(template)]))
+        basho = f"{2000 + i // 7500 // 6}{(i // 7500 % 6) * 2 + 1:02d}"
+        day = i // 500 % 15 + 1
+        row.update(
+            event_id=f"honbasho-{basho}", basho=basho, day=day,
+            source_url=f"https://sumodb.sumogames.de/Results.aspx?b={basho}&d={day}",
+            fetched_at=f"2025-01-27T00:00:{i // 7500 % 60:02d}+00:00",
+            source_row_index=i % 500 + 1,
+        )
+        yield tuple("".join(v) if isinstance(v, str) else v for v in row.values())
+
+
+def _held_mib(build: Callable[[], object]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=369_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    builds = {
+        "dataclass": lambda: [PlainBout(*row) for row in _rows(args.rows)],
+        "slots": lambda: [BoutRecord(*row) for row in _rows(args.rows)],
+        "batch": lambda: BoutBatch(BoutRecord(*row) for row in _rows(args.rows)),
+    }
+    print(f"{args.rows} rows")
+    base = None
+    for name, build in builds.items():
+        mib = _held_mib(build)
+        base = base or mib
+        print(f"{name:<10}{mib:9.1f} MiB  ({mib / base:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,8 @@ from collections import defaultdict
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
-FACT_CSV = ROOT / "data" / "fact" / "fact_bout_daily.csv"
+FACT_DIR = ROOT / "data" / "fact"
+FACT_CSV = FACT_DIR / "fact_bout_daily.csv"
 DIM_CSV = ROOT / "data" / "dim" / "dim_shikona_by_basho.csv"
 OUT_DIR = ROOT / "docs" / "data"
 
@@ -65,8 +66,16 @@ def rank_to_numeric(rank: str) -> int | None:
 
 
 def load_bouts() -> list[dict]:
-    with open(FACT_CSV, encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+    # After `sumodata fact split` the table is one part.csv per basho
+    if (FACT_DIR / "manifest.json").exists():
+        paths = sorted(FACT_DIR.glob("basho=*/part.csv"))
+    else:
+        paths = [FACT_CSV]
+    bouts: list[dict] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            bouts.extend(csv.DictReader(f))
+    return bouts
 
 
 def load_dim() -> list[dict]:
@@ -29,14 +29,8 @@ case "$COMMAND" in
     ;;
 
   historical)
-    MONTHS=(01 03 05 07 09 11)
-    for year in $(seq 2000 2024); do
-      for month in "${MONTHS[@]}"; do
-        basho="${year}${month}"
-        echo "=== Fetching basho ${basho} ==="
-        uv run python -m sumodata --basho "${basho}" --raw-cache on
-      done
-    done
+    echo "=== Fetching basho 200001..202411 ==="
+    uv run python -m sumodata --from 200001 --to 202411 --raw-cache on
     ;;
 
   *)
@@ -0,0 +1,93 @@
+"""Columnar batches of records for holding many rows in memory.
+
+A list of records costs an object per record plus one per int and per
+string, and rows read back from CSV carry their own copies of strings
+like event_id or source_url. A RecordBatch keeps one column per field
+instead: ints in an ``array`` and strings dictionary-encoded, each
+distinct value stored once and every row holding a 4-byte code.
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import fields
+from operator import attrgetter
+from typing import ClassVar
+
+from sumodata.models import BoutRecord, ShikonaRecord
+
+
+class StringColumn:
+    """Dictionary-encoded strings."""
+
+    __slots__ = ("values", "codes", "_index")
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self.codes = array("I")
+        self._index: dict[str, int] = {}
+
+    def append(self, value: str) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.values[self.codes[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.values.__getitem__, self.codes)
+
+
+class RecordBatch:
+    """Records of ``record_type`` stored column by column.
+
+    Iterating yields records again; rows() yields plain value tuples in
+    field order, which is what the CSV writers need.
+    """
+
+    record_type: ClassVar[type]
+
+    def __init__(self, records: Iterable = ()) -> None:
+        fs = fields(self.record_type)
+        self.names = [f.name for f in fs]
+        self.columns: list[Sequence] = [
+            array("i") if f.type is int else StringColumn() for f in fs
+        ]
+        self._values = attrgetter(*self.names)
+        self.extend(records)
+
+    def append(self, record: object) -> None:
+        for column, value in zip(self.columns, self._values(record)):
+            column.append(value)  # type: ignore[attr-defined]
+
+    def extend(self, records: Iterable) -> None:
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    def __iter__(self) -> Iterator:
+        return (self.record_type(*row) for row in self.rows())
+
+    def __getitem__(self, i: int) -> object:
+        return self.record_type(*(column[i] for column in self.columns))
+
+    def rows(self) -> Iterator[tuple]:
+        return zip(*self.columns)
+
+    def column(self, name: str) -> Sequence:
+        return self.columns[self.names.index(name)]
+
+
+class BoutBatch(RecordBatch):
+    record_type = BoutRecord
+
+
+class ShikonaBatch(RecordBatch):
+    record_type = ShikonaRecord
@@ -0,0 +1,587 @@
+"""Raw HTML cache backends and metadata (validators for conditional requests).
+
+Cached pages are addressed by their directory-layout path, e.g.
+``data/raw/honbasho-202501/results_d01.html``. The directory backend stores
+exactly that file plus a ``.meta.json`` sidecar; the pack backend stores every
+page of an event in one append-only ``data/raw/honbasho-202501.pack`` with a
+``.pack.idx`` offset index next to it. The content-addressed backend stores
+compressed bodies once per distinct SHA-256 under ``data/raw/objects/`` and
+maps pages to hashes in ``data/raw/refs/honbasho-202501.json``.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from sumodata.util import SumodataError
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; packs are then locked per process only
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is used instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+META_SUFFIX = ".meta.json"
+PACK_SUFFIX = ".pack"
+INDEX_SUFFIX = ".pack.idx"
+LOCK_SUFFIX = ".lock"
+
+
+class CacheError(SumodataError):
+    """Corrupt or unreadable raw cache."""
+
+
+@dataclass
+class CacheMeta:
+    url: str
+    fetched_at: str  # ISO format, time of the last 200 or 304
+    etag: str = ""
+    last_modified: str = ""
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class CacheEntry:
+    body: str
+    meta: CacheMeta | None
+
+
+@dataclass
+class EventInfo:
+    """Disk usage of one event's cached pages."""
+
+    event_id: str
+    pages: int
+    bytes: int
+    fetched_at: str  # latest fetch time of any page, "" if unknown
+
+
+def meta_path(cache_path: Path) -> Path:
+    """Sidecar path for a cached page, e.g. results_d01.html.meta.json."""
+    return cache_path.with_name(cache_path.name + META_SUFFIX)
+
+
+def read_meta(cache_path: Path) -> CacheMeta | None:
+    """Read the sidecar for a cached page. None if missing or unreadable."""
+    path = meta_path(cache_path)
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return CacheMeta(**data)
+    except (ValueError, TypeError) as e:
+        logger.warning("Ignoring unreadable cache metadata %s: %s", path, e)
+        return None
+
+
+def write_meta(cache_path: Path, meta: CacheMeta) -> None:
+    path = meta_path(cache_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(asdict(meta), ensure_ascii=False), encoding="utf-8")
+
+
+class DirectoryCache:
+    """One HTML file per page plus a metadata sidecar (the original layout)."""
+
+    name = "dir"
+
+    def get(self, cache_path: Path) -> CacheEntry | None:
+        if not cache_path.exists():
+            return None
+        try:
+            body = cache_path.read_text(encoding="utf-8")
+        except UnicodeDecodeError as e:
+            raise CacheError(f"Undecodable cached page {cache_path}: {e}") from e
+        return CacheEntry(body, read_meta(cache_path))
+
+    def put(self, cache_path: Path, body: str, meta: CacheMeta) -> None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(body, encoding="utf-8")
+        write_meta(cache_path, meta)
+
+    def put_meta(self, cache_path: Path, meta: CacheMeta) -> None:
+        write_meta(cache_path, meta)
+
+    def iter_paths(self, raw_dir: Path) -> Iterator[Path]:
+        """Yield the cache path of every page stored under raw_dir."""
+        if not raw_dir.is_dir():
+            return
+        yield from sorted(raw_dir.glob("*/*.html"))
+
+    def events(self, raw_dir: Path) -> list[str]:
+        return sorted({p.parent.name for p in self.iter_paths(raw_dir)})
+
+    def event_info(self, raw_dir: Path, event_id: str) -> EventInfo:
+        event_dir = raw_dir / event_id
+        files = [f for f in event_dir.iterdir() if f.is_file()] if event_dir.is_dir() else []
+        pages = [f for f in files if f.suffix == ".html"]
+        fetched = [m.fetched_at for m in map(read_meta, pages) if m]
+        return EventInfo(
+            event_id, len(pages), sum(f.stat().st_size for f in files),
+            max(fetched, default=""),
+        )
+
+    def remove_event(self, raw_dir: Path, event_id: str) -> None:
+        shutil.rmtree(raw_dir / event_id, ignore_errors=True)
+
+    def gc(self, raw_dir: Path) -> int:
+        """Nothing to reclaim: removing a page removes its file."""
+        return 0
+
+
+# Pack record: magic, header length, body length, JSON header, zlib body
+_RECORD = struct.Struct(">4sII")
+_MAGIC = b"SDPK"
+
+
+class PackCache:
+    """One append-only pack file per event with a JSON offset index.
+
+    Re-fetched pages are appended and the index repointed, so the pack only
+    grows; compact() drops superseded records. The index is a cache of the
+    pack: if it is missing it is rebuilt by a single sequential scan, and
+    records appended past it (by another process) are scanned in from
+    where it ends. Writers hold an exclusive flock on the pack's lock file,
+    so appends from several processes never interleave.
+    """
+
+    name = "pack"
+
+    def __init__(self) -> None:
+        self._indexes: dict[Path, tuple[int, dict]] = {}  # pack -> (inode, index)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def pack_path(cache_path: Path) -> Path:
+        return cache_path.parent.parent / (cache_path.parent.name + PACK_SUFFIX)
+
+    @staticmethod
+    def index_path(pack: Path) -> Path:
+        return pack.with_name(pack.name[: -len(PACK_SUFFIX)] + INDEX_SUFFIX)
+
+    @staticmethod
+    def lock_path(pack: Path) -> Path:
+        return pack.with_name(pack.name + LOCK_SUFFIX)
+
+    @contextmanager
+    def _write_lock(self, pack: Path) -> Iterator[None]:
+        """This instance's lock plus, where flock exists, the pack's across processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            pack.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path(pack), "a") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _index(self, pack: Path) -> dict:
+        """Return {"size": int, "entries": {name: entry}} for a pack."""
+        stat = pack.stat() if pack.exists() else None
+        size, inode = (stat.st_size, stat.st_ino) if stat else (0, 0)
+        cached = self._indexes.get(pack)
+        index = cached[1] if cached is not None and cached[0] == inode else None
+        if index is None:
+            idx_path = self.index_path(pack)
+            if idx_path.exists():
+                try:
+                    index = json.loads(idx_path.read_text(encoding="utf-8"))
+                except ValueError:
+                    logger.warning("Rebuilding unreadable pack index %s", idx_path)
+        if index is None or index.get("size", 0) > size:
+            index = {"size": 0, "entries": {}}
+        if size > index["size"]:
+            # Records appended since the index was written, or a partial tail
+            self._scan(pack, index)
+        self._indexes[pack] = (inode, index)
+        return index
+
+    @staticmethod
+    def _scan(pack: Path, index: dict) -> None:
+        """Add the records from ``index["size"]`` to the end of the pack to ``index``."""
+        base = index["size"]
+        with open(pack, "rb") as f:
+            f.seek(base)
+            data = f.read()
+        offset = 0
+        while offset < len(data):
+            if len(data) - offset < _RECORD.size:
+                break
+            magic, header_len, body_len = _RECORD.unpack_from(data, offset)
+            if magic != _MAGIC:
+                raise CacheError(f"Bad pack record at offset {base + offset} in {pack}")
+            end = offset + _RECORD.size + header_len + body_len
+            if end > len(data):
+                break
+            start = offset + _RECORD.size
+            header = json.loads(data[start:start + header_len])
+            index["entries"][header.pop("name")] = {
+                "offset": base + start + header_len, "length": body_len, "meta": header,
+            }
+            offset = end
+        # A partial tail is left out here; put() drops it under the write lock
+        index["size"] = base + offset
+
+    def _save_index(self, pack: Path, index: dict) -> None:
+        self.index_path(pack).write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+
+    @staticmethod
+    def _read(pack: Path, name: str, entry: dict) -> CacheEntry:
+        with open(pack, "rb") as f:
+            f.seek(entry["offset"])
+            raw = f.read(entry["length"])
+        meta = CacheMeta(**entry["meta"]) if entry["meta"].get("url") else None
+        try:
+            body = zlib.decompress(raw).decode("utf-8")
+        except (zlib.error, UnicodeDecodeError) as e:
+            raise CacheError(f"Corrupt pack entry {name} in {pack}: {e}") from e
+        return CacheEntry(body, meta)
+
+    def get(self, cache_path: Path) -> CacheEntry | None:
+        pack = self.pack_path(cache_path)
+        with self._lock:
+            if not pack.exists():
+                return None
+            entry = self._index(pack)["entries"].get(cache_path.name)
+        if entry is None:
+            return None
+        return self._read(pack, cache_path.name, entry)
+
+    @staticmethod
+    def _append(pack: Path, index: dict, name: str, body: str, meta: CacheMeta) -> None:
+        header = json.dumps({"name": name, **asdict(meta)}, ensure_ascii=False).encode("utf-8")
+        compressed = zlib.compress(body.encode("utf-8"), 6)
+        with open(pack, "ab") as f:
+            f.write(_RECORD.pack(_MAGIC, len(header), len(compressed)))
+            f.write(header)
+            f.write(compressed)
+        start = index["size"] + _RECORD.size
+        index["entries"][name] = {
+            "offset": start + len(header),
+            "length": len(compressed),
+            "meta": asdict(meta),
+        }
+        index["size"] = start + len(header) + len(compressed)
+
+    def put(self, cache_path: Path, body: str, meta: CacheMeta) -> None:
+        pack = self.pack_path(cache_path)
+        with self._write_lock(pack):
+            pack.parent.mkdir(parents=True, exist_ok=True)
+            index = self._index(pack)
+            if pack.exists() and pack.stat().st_size > index["size"]:
+                # No writer is mid-append while we hold the lock, so this is
+                # a record cut short by a crash; drop it to keep appends aligned
+                logger.warning("Dropping partial record at %d in %s", index["size"], pack)
+                with open(pack, "r+b") as f:
+                    f.truncate(index["size"])
+            self._append(pack, index, cache_path.name, body, meta)
+            self._save_index(pack, index)
+
+    def put_meta(self, cache_path: Path, meta: CacheMeta) -> None:
+        """Refresh metadata after a 304 without appending the body again.
+
+        Only the index is updated; a rebuild from the pack falls back to
+        the metadata recorded with the body, which is merely older.
+        """
+        pack = self.pack_path(cache_path)
+        with self._write_lock(pack):
+            index = self._index(pack)
+            entry = index["entries"].get(cache_path.name)
+            if entry is not None:
+                entry["meta"] = asdict(meta)
+                self._save_index(pack, index)
+
+    def iter_paths(self, raw_dir: Path) -> Iterator[Path]:
+        if not raw_dir.is_dir():
+            return
+        for pack in sorted(raw_dir.glob("*" + PACK_SUFFIX)):
+            event_dir = raw_dir / pack.name[: -len(PACK_SUFFIX)]
+            with self._lock:
+                names = sorted(self._index(pack)["entries"])
+            for name in names:
+                yield event_dir / name
+
+    def events(self, raw_dir: Path) -> list[str]:
+        return sorted(p.name[: -len(PACK_SUFFIX)] for p in raw_dir.glob("*" + PACK_SUFFIX))
+
+    def event_info(self, raw_dir: Path, event_id: str) -> EventInfo:
+        pack = raw_dir / (event_id + PACK_SUFFIX)
+        if not pack.exists():
+            return EventInfo(event_id, 0, 0, "")
+        with self._lock:
+            entries = self._index(pack)["entries"]
+        idx = self.index_path(pack)
+        size = pack.stat().st_size + (idx.stat().st_size if idx.exists() else 0)
+        fetched = [e["meta"].get("fetched_at", "") for e in entries.values()]
+        return EventInfo(event_id, len(entries), size, max(fetched, default=""))
+
+    def _remove(self, pack: Path) -> None:
+        self._indexes.pop(pack, None)
+        pack.unlink(missing_ok=True)
+        self.index_path(pack).unlink(missing_ok=True)
+        self.lock_path(pack).unlink(missing_ok=True)
+
+    def remove_event(self, raw_dir: Path, event_id: str) -> None:
+        pack = raw_dir / (event_id + PACK_SUFFIX)
+        with self._write_lock(pack):
+            self._remove(pack)
+
+    def gc(self, raw_dir: Path) -> int:
+        """Compact every pack under raw_dir. Returns bytes reclaimed."""
+        return sum(
+            self.compact(raw_dir / (event + PACK_SUFFIX)) for event in self.events(raw_dir)
+        )
+
+    def compact(self, pack: Path) -> int:
+        """Rewrite a pack keeping only the latest record per page.
+
+        Returns the number of bytes reclaimed.
+        """
+        with self._write_lock(pack):
+            before = pack.stat().st_size
+            entries = self._index(pack)["entries"]
+            if not entries:
+                self._remove(pack)
+                return before
+            tmp = pack.with_name(pack.name + ".tmp")
+            tmp.unlink(missing_ok=True)
+            index: dict = {"size": 0, "entries": {}}
+            for name in sorted(entries):
+                entry = self._read(pack, name, entries[name])
+                meta = entry.meta or CacheMeta(url="", fetched_at="")
+                self._append(tmp, index, name, entry.body, meta)
+            tmp.replace(pack)
+            self._indexes[pack] = (pack.stat().st_ino, index)
+            self._save_index(pack, index)
+        return before - index["size"]
+
+
+def _compress(data: bytes) -> tuple[bytes, str]:
+    """Compress with zstd when available, else gzip. Returns (blob, suffix)."""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data), ".zst"
+    return gzip.compress(data, compresslevel=9, mtime=0), ".gz"
+
+
+def _decompress(blob: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        if zstandard is None:
+            raise CacheError("zstandard is required to read .zst cache objects")
+        try:
+            return zstandard.ZstdDecompressor().decompress(blob)
+        except zstandard.ZstdError as e:
+            raise CacheError(f"Corrupt zstd cache object: {e}") from e
+    try:
+        return gzip.decompress(blob)
+    except (OSError, EOFError, zlib.error) as e:
+        raise CacheError(f"Corrupt gzip cache object: {e}") from e
+
+
+class ContentAddressedCache:
+    """Compressed bodies stored once per SHA-256, plus per-event page refs.
+
+    An unchanged re-fetch only rewrites the small refs file; the body is
+    already on disk under its hash. Objects no longer referenced by any
+    page are removed by gc().
+    """
+
+    name = "cas"
+
+    def __init__(self) -> None:
+        self._refs: dict[Path, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def refs_path(cache_path: Path) -> Path:
+        return cache_path.parent.parent / "refs" / (cache_path.parent.name + ".json")
+
+    @staticmethod
+    def object_stem(raw_dir: Path, digest: str) -> Path:
+        return raw_dir / "objects" / digest[:2] / digest[2:]
+
+    def _load_refs(self, refs: Path) -> dict:
+        """Return {page name: {"hash": str, "suffix": str, "meta": dict}}."""
+        loaded = self._refs.get(refs)
+        if loaded is None:
+            loaded = {}
+            if refs.exists():
+                try:
+                    loaded = json.loads(refs.read_text(encoding="utf-8"))
+                except ValueError as e:
+                    raise CacheError(f"Unreadable cache refs {refs}: {e}") from e
+            self._refs[refs] = loaded
+        return loaded
+
+    def _save_refs(self, refs: Path, loaded: dict) -> None:
+        refs.parent.mkdir(parents=True, exist_ok=True)
+        tmp = refs.with_name(refs.name + ".tmp")
+        tmp.write_text(json.dumps(loaded, ensure_ascii=False, sort_keys=True), encoding="utf-8")
+        tmp.replace(refs)
+
+    def get(self, cache_path: Path) -> CacheEntry | None:
+        with self._lock:
+            ref = self._load_refs(self.refs_path(cache_path)).get(cache_path.name)
+        if ref is None:
+            return None
+        stem = self.object_stem(cache_path.parent.parent, ref["hash"])
+        obj = stem.with_name(stem.name + ref["suffix"])
+        if not obj.exists():
+            logger.warning("Missing cache object %s for %s", obj, cache_path)
+            return None
+        data = _decompress(obj.read_bytes(), ref["suffix"])
+        if hashlib.sha256(data).hexdigest() != ref["hash"]:
+            raise CacheError(f"Checksum mismatch for cache object {obj}")
+        body = data.decode("utf-8")
+        meta = CacheMeta(**ref["meta"]) if ref["meta"].get("url") else None
+        return CacheEntry(body, meta)
+
+    def put(self, cache_path: Path, body: str, meta: CacheMeta) -> None:
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        stem = self.object_stem(cache_path.parent.parent, digest)
+        existing = [s for s in (".zst", ".gz") if stem.with_name(stem.name + s).exists()]
+        if existing:
+            suffix = existing[0]
+            logger.debug("Deduplicated %s -> %s", cache_path, digest[:12])
+        else:
+            blob, suffix = _compress(data)
+            obj = stem.with_name(stem.name + suffix)
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp = obj.with_name(f"{obj.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(blob)
+            tmp.replace(obj)
+        refs = self.refs_path(cache_path)
+        with self._lock:
+            loaded = self._load_refs(refs)
+            loaded[cache_path.name] = {"hash": digest, "suffix": suffix, "meta": asdict(meta)}
+            self._save_refs(refs, loaded)
+
+    def put_meta(self, cache_path: Path, meta: CacheMeta) -> None:
+        refs = self.refs_path(cache_path)
+        with self._lock:
+            loaded = self._load_refs(refs)
+            if cache_path.name in loaded:
+                loaded[cache_path.name]["meta"] = asdict(meta)
+                self._save_refs(refs, loaded)
+
+    def iter_paths(self, raw_dir: Path) -> Iterator[Path]:
+        for refs in sorted((raw_dir / "refs").glob("*.json")):
+            event_dir = raw_dir / refs.stem
+            with self._lock:
+                names = sorted(self._load_refs(refs))
+            for name in names:
+                yield event_dir / name
+
+    def events(self, raw_dir: Path) -> list[str]:
+        return sorted(refs.stem for refs in (raw_dir / "refs").glob("*.json"))
+
+    def event_info(self, raw_dir: Path, event_id: str) -> EventInfo:
+        """Usage of one event; objects shared with other events count in full."""
+        refs = raw_dir / "refs" / (event_id + ".json")
+        if not refs.exists():
+            return EventInfo(event_id, 0, 0, "")
+        with self._lock:
+            loaded = dict(self._load_refs(refs))
+        size = refs.stat().st_size
+        for digest, suffix in {(r["hash"], r["suffix"]) for r in loaded.values()}:
+            stem = self.object_stem(raw_dir, digest)
+            obj = stem.with_name(stem.name + suffix)
+            if obj.exists():
+                size += obj.stat().st_size
+        fetched = [r["meta"].get("fetched_at", "") for r in loaded.values()]
+        return EventInfo(event_id, len(loaded), size, max(fetched, default=""))
+
+    def remove_event(self, raw_dir: Path, event_id: str) -> None:
+        """Drop an event's refs; its objects go at the next gc()."""
+        refs = raw_dir / "refs" / (event_id + ".json")
+        with self._lock:
+            self._refs.pop(refs, None)
+            refs.unlink(missing_ok=True)
+
+    def gc(self, raw_dir: Path) -> int:
+        """Delete objects no page refers to. Returns bytes reclaimed."""
+        live = set()
+        with self._lock:
+            for refs in (raw_dir / "refs").glob("*.json"):
+                for ref in self._load_refs(refs).values():
+                    live.add(ref["hash"])
+        reclaimed = 0
+        for obj in (raw_dir / "objects").glob("*/*"):
+            if obj.name.endswith(".tmp"):
+                continue  # a put() still writing it; renamed into place when done
+            digest = obj.parent.name + obj.name.split(".")[0]
+            if digest not in live:
+                reclaimed += obj.stat().st_size
+                obj.unlink()
+        return reclaimed
+
+
+BACKENDS = {
+    "dir": DirectoryCache,
+    "pack": PackCache,
+    "cas": ContentAddressedCache,
+}
+
+CacheBackend = DirectoryCache | PackCache | ContentAddressedCache
+
+_backend: CacheBackend = DirectoryCache()
+
+
+def configure_backend(name: str) -> None:
+    """Select the process-wide raw cache backend ("dir", "pack" or "cas")."""
+    global _backend
+    try:
+        _backend = BACKENDS[name]()
+    except KeyError:
+        raise CacheError(f"Unknown cache backend: {name}") from None
+
+
+def get_backend() -> CacheBackend:
+    return _backend
+
+
+def convert(raw_dir: Path, source: str, target: str) -> int:
+    """Copy every cached page under raw_dir from one backend to another.
+
+    Used to import the directory layout into packs and to export packs back
+    to plain files. Returns the number of pages copied.
+    """
+    src = BACKENDS[source]()
+    dst = BACKENDS[target]()
+    count = 0
+    for path in list(src.iter_paths(raw_dir)):
+        entry = src.get(path)
+        if entry is None:
+            continue
+        meta = entry.meta or CacheMeta(url="", fetched_at="")
+        dst.put(path, entry.body, meta)
+        count += 1
+    logger.info("Copied %d cached pages from %s to %s in %s", count, source, target, raw_dir)
+    return count
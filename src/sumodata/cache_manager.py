@@ -0,0 +1,297 @@
+"""Raw cache statistics, pinning and eviction.
+
+Eviction works per event (one basho's pages), never per page: a basho is
+only useful to reparse when all of its pages are present. In-progress
+basho expire by age (their pages still change), and every basho not
+pinned is evicted least-recently-used first once the cache exceeds its
+byte budget. Pins are explicit (``cache pin``); pinning every finished
+basho as well is opt-in, since it leaves only the current one evictable.
+
+Rikishi profiles (``rikishi/``) are not an event: they are reported on
+their own line and never evicted, since the rikishi refresh revalidates
+them by its own TTL.
+"""
+
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sumodata.cache import CacheBackend, CacheError
+
+logger = logging.getLogger(__name__)
+
+STATS_FILE = "cache_stats.json"
+PINS_FILE = "cache_pins.json"
+
+# hit: served from cache; miss: not cached, fetched;
+# not_modified / modified: revalidated with a conditional request
+OUTCOMES = ("hit", "miss", "not_modified", "modified")
+
+EVENT_PREFIX = "honbasho-"
+PROFILES = "rikishi"
+
+_BASHO_PATTERN = re.compile(r"(\d{6})$")
+_SIZE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([KMG]?)B?$", re.IGNORECASE)
+
+
+class CacheStats:
+    """Per-event cache access counters collected during a run."""
+
+    def __init__(self) -> None:
+        self._events: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, cache_path: Path, outcome: str) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            counts = self._events.setdefault(cache_path.parent.name, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+            counts["last_access"] = now
+
+    def totals(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                o: sum(c.get(o, 0) for c in self._events.values()) for o in OUTCOMES
+            }
+
+    def flush(self, raw_dir: Path) -> None:
+        """Merge this run's counters into raw_dir/cache_stats.json."""
+        with self._lock:
+            run, self._events = self._events, {}
+        if not run:
+            return
+        stored = load_stats(raw_dir)
+        for event_id, counts in run.items():
+            merged = stored.setdefault(event_id, {})
+            for outcome in OUTCOMES:
+                merged[outcome] = merged.get(outcome, 0) + counts.get(outcome, 0)
+            merged["last_access"] = counts["last_access"]
+        _write_json(raw_dir / STATS_FILE, stored)
+
+
+_stats = CacheStats()
+
+
+def get_stats() -> CacheStats:
+    """Counters for the current process; fetch records into these."""
+    return _stats
+
+
+def record_access(cache_path: Path, outcome: str) -> None:
+    _stats.record(cache_path, outcome)
+
+
+def _read_json(path: Path, default):
+    if not path.exists():
+        return default
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        logger.warning("Ignoring unreadable %s", path)
+        return default
+
+
+def _write_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=1, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def load_stats(raw_dir: Path) -> dict[str, dict]:
+    return _read_json(raw_dir / STATS_FILE, {})
+
+
+def load_pins(raw_dir: Path) -> set[str]:
+    return set(_read_json(raw_dir / PINS_FILE, []))
+
+
+def set_pinned(raw_dir: Path, event_id: str, pinned: bool) -> None:
+    pins = load_pins(raw_dir)
+    if pinned:
+        pins.add(event_id)
+    else:
+        pins.discard(event_id)
+    _write_json(raw_dir / PINS_FILE, sorted(pins))
+
+
+def is_finished(event_id: str, now: datetime) -> bool:
+    """A basho is finished once its month is over (honbasho end by the 4th Sunday)."""
+    m = _BASHO_PATTERN.search(event_id)
+    return bool(m) and m.group(1) < now.strftime("%Y%m")
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte budget such as 500M, 2G or 1048576."""
+    m = _SIZE_PATTERN.match(text.strip())
+    if not m:
+        raise ValueError(f"Invalid size: {text}")
+    scale = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}[m.group(2).upper()]
+    return int(float(m.group(1)) * scale)
+
+
+@dataclass
+class EventUsage:
+    event_id: str
+    pages: int
+    bytes: int
+    fetched_at: str
+    last_access: str
+    pinned: bool
+    hits: int = 0
+    lookups: int = 0
+
+    @property
+    def lru_key(self) -> str:
+        return self.last_access or self.fetched_at
+
+
+def _usage(
+    backend: CacheBackend, raw_dir: Path, event_id: str, stats: dict, pinned: bool,
+) -> EventUsage:
+    info = backend.event_info(raw_dir, event_id)
+    counts = stats.get(event_id, {})
+    return EventUsage(
+        event_id=event_id,
+        pages=info.pages,
+        bytes=info.bytes,
+        fetched_at=info.fetched_at,
+        last_access=counts.get("last_access", ""),
+        pinned=pinned,
+        hits=counts.get("hit", 0) + counts.get("not_modified", 0),
+        lookups=sum(counts.get(o, 0) for o in OUTCOMES),
+    )
+
+
+def usage(
+    backend: CacheBackend,
+    raw_dir: Path,
+    pin_finished: bool = False,
+    now: datetime | None = None,
+) -> list[EventUsage]:
+    """Per-event (basho) size, age, access and pin status of the cache."""
+    now = now or datetime.now(timezone.utc)
+    stats = load_stats(raw_dir)
+    pins = load_pins(raw_dir)
+    return [
+        _usage(
+            backend, raw_dir, event_id, stats,
+            event_id in pins or (pin_finished and is_finished(event_id, now)),
+        )
+        for event_id in backend.events(raw_dir)
+        if event_id.startswith(EVENT_PREFIX)
+    ]
+
+
+def profile_usage(backend: CacheBackend, raw_dir: Path) -> EventUsage | None:
+    """Usage of the cached Rikishi profiles, or None if there are none."""
+    if PROFILES not in backend.events(raw_dir):
+        return None
+    return _usage(backend, raw_dir, PROFILES, load_stats(raw_dir), True)
+
+
+def prune(
+    backend: CacheBackend,
+    raw_dir: Path,
+    max_bytes: int | None = None,
+    max_age: timedelta | None = None,
+    pin_finished: bool = False,
+    dry_run: bool = False,
+    now: datetime | None = None,
+) -> list[str]:
+    """Evict expired in-progress and least-recently-used unpinned events.
+
+    ``max_age`` expires only basho that were not finished yet; finished
+    pages do not change. Only basho events count toward ``max_bytes``;
+    profiles are kept. Returns the evicted event ids in eviction order.
+    """
+    now = now or datetime.now(timezone.utc)
+    events = usage(backend, raw_dir, pin_finished, now)
+    evicted: list[EventUsage] = []
+
+    if max_age is not None:
+        cutoff = (now - max_age).isoformat()
+        evicted.extend(
+            e for e in events
+            if not e.pinned and not is_finished(e.event_id, now)
+            and e.fetched_at and e.fetched_at < cutoff
+        )
+
+    if max_bytes is not None:
+        expired = {e.event_id for e in evicted}
+        total = sum(e.bytes for e in events if e.event_id not in expired)
+        candidates = sorted(
+            (e for e in events if not e.pinned and e.event_id not in expired),
+            key=lambda e: e.lru_key,
+        )
+        for e in candidates:
+            if total <= max_bytes:
+                break
+            evicted.append(e)
+            total -= e.bytes
+        if total > max_bytes:
+            logger.warning(
+                "Pinned cache entries alone use %d bytes, over the %d byte budget",
+                total, max_bytes,
+            )
+
+    for e in evicted:
+        logger.info(
+            "%s %s (%d pages, %d bytes)",
+            "Would evict" if dry_run else "Evicting", e.event_id, e.pages, e.bytes,
+        )
+        if not dry_run:
+            backend.remove_event(raw_dir, e.event_id)
+    if evicted and not dry_run:
+        reclaimed = backend.gc(raw_dir)
+        if reclaimed:
+            logger.info("Reclaimed %d bytes of unreferenced cache data", reclaimed)
+    return [e.event_id for e in evicted]
+
+
+def verify(backend: CacheBackend, raw_dir: Path) -> list[str]:
+    """Read back every cached page; return a description of each problem."""
+    problems = []
+    checked = 0
+    for path in backend.iter_paths(raw_dir):
+        checked += 1
+        try:
+            entry = backend.get(path)
+        except (CacheError, OSError) as e:
+            problems.append(f"{path}: {e}")
+            continue
+        if entry is None:
+            problems.append(f"{path}: listed but not readable")
+        elif not entry.body.strip():
+            problems.append(f"{path}: empty body")
+    logger.info("Verified %d cached pages, %d problems", checked, len(problems))
+    return problems
+
+
+def _format_line(e: EventUsage, pinned: str) -> str:
+    rate = f"{e.hits / e.lookups:.0%}" if e.lookups else "-"
+    return (
+        f"{e.event_id:<28} {e.pages:>5} {e.bytes:>12} {rate:>8}  "
+        f"{pinned:<6}  {e.fetched_at[:19]}"
+    )
+
+
+def format_usage(events: list[EventUsage], profiles: EventUsage | None = None) -> list[str]:
+    """Human-readable report lines for `sumodata cache stats`."""
+    lines = [f"{'event':<28} {'pages':>5} {'bytes':>12} {'hit rate':>8}  pinned  last fetched"]
+    for e in events:
+        lines.append(_format_line(e, "yes" if e.pinned else "no"))
+    hits = sum(e.hits for e in events)
+    lookups = sum(e.lookups for e in events)
+    lines.append(
+        f"{'total':<28} {sum(e.pages for e in events):>5} "
+        f"{sum(e.bytes for e in events):>12} "
+        f"{f'{hits / lookups:.0%}' if lookups else '-':>8}"
+    )
+    if profiles is not None:
+        lines.append(_format_line(profiles, "kept"))
+    return lines
@@ -2,46 +2,178 @@
 
 import argparse
 import logging
+import os
 import sys
 import time
-from datetime import datetime, timezone
+from collections.abc import Iterable, Iterator
+from datetime import timedelta
 from pathlib import Path
 
+from sumodata.batch import BoutBatch, ShikonaBatch
+from sumodata.cache import BACKENDS, configure_backend, convert
+from sumodata.cache_manager import (
+    format_usage,
+    get_stats,
+    parse_size,
+    profile_usage,
+    prune,
+    set_pinned,
+    usage,
+    verify,
+)
+from sumodata.fact_store import FactStore
 from sumodata.fetch import (
-    banzuke_url,
-    fetch_with_cache,
-    results_url,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RATE,
+    SessionConfig,
+    close_session,
+    configure_base_url,
+    configure_rate_limit,
+    configure_session,
+)
+from sumodata.io_csv import update_dim_shikona_csv_batch
+from sumodata.journal import RunJournal
+from sumodata.live import DEFAULT_INTERVAL, update_live, watch
+from sumodata.metrics import get_metrics
+from sumodata.pipeline import (
+    DEFAULT_PARSE_WORKERS,
+    PARSE_POOLS,
+    BashoResult,
+    PipelineOptions,
+    event_id_for,
+    iter_basho,
 )
-from sumodata.io_csv import update_dim_shikona_csv, update_fact_csv
-from sumodata.models import BoutRecord, ShikonaRecord
-from sumodata.parse_banzuke import parse_banzuke_page
-from sumodata.parse_results import detect_playoff, parse_results_page
-from sumodata.util import SumodataError
+from sumodata.parsers import PARSERS, configure_parser
+from sumodata.parse_cache import ParseCache
+from sumodata.parse_results import BoutCounts
+from sumodata.reparse import cached_bashos, reparse
+from sumodata.rikishi import DEFAULT_TTL_DAYS, refresh_rikishi
+from sumodata.util import ParseError, SumodataError, honbasho_range
 
 logger = logging.getLogger("sumodata")
 
 
+def _positive_float(text: str) -> float:
+    """argparse type for rates: a usage error instead of a traceback for 0 or less."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {text!r}") from None
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0: {text!r}")
+    return value
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="sumodata",
         description="Fetch sumo bout data from SumoDB and generate CSVs.",
     )
     parser.add_argument(
-        "--basho", required=True,
+        "--basho", default=None,
         help="Target basho in YYYYMM format (e.g. 202601)",
     )
+    parser.add_argument(
+        "--from", dest="from_basho", default=None, metavar="YYYYMM",
+        help="First basho of a range to backfill in one run (with --to)",
+    )
+    parser.add_argument(
+        "--to", dest="to_basho", default=None, metavar="YYYYMM",
+        help="Last basho of the range (inclusive)",
+    )
+    parser.add_argument(
+        "--live", action="store_true", default=False,
+        help="Basho in progress: fetch only the published days that are not "
+             "final in the fact table and replace just their rows",
+    )
     parser.add_argument(
         "--force", action="store_true", default=False,
         help="Force replace rows for the target event (default: upsert)",
     )
     parser.add_argument(
-        "--raw-cache", choices=["on", "off"], default="on",
-        help="HTML cache mode (default: on)",
+        "--raw-cache", choices=["on", "off", "revalidate"], default="on",
+        help="HTML cache mode; revalidate re-checks cached pages with "
+             "conditional requests (default: on)",
+    )
+    parser.add_argument(
+        "--cache-backend", choices=sorted(BACKENDS), default="dir",
+        help="Raw cache storage: one file per page (dir), one pack file "
+             "per basho (pack) or compressed content-addressed objects "
+             "(cas) (default: dir)",
+    )
+    parser.add_argument(
+        "--parser", choices=sorted(PARSERS), default="bs4",
+        help="HTML parser: BeautifulSoup (bs4) or the faster lxml, which "
+             "needs the lxml extra (default: bs4)",
     )
     parser.add_argument(
         "--playoff", choices=["on", "off"], default="on",
         help="Playoff detection and fetch (default: on)",
     )
+    parser.add_argument(
+        "--rikishi", choices=["on", "off"], default="off",
+        help="Refresh dim_rikishi.csv for rikishi in the fact table that are "
+             "new or older than --rikishi-ttl-days (default: off)",
+    )
+    parser.add_argument(
+        "--rikishi-ttl-days", type=float, default=DEFAULT_TTL_DAYS,
+        help=f"Days before a rikishi profile is checked again "
+             f"(default: {DEFAULT_TTL_DAYS})",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Max pages fetched in parallel (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--rate", type=_positive_float, default=DEFAULT_RATE,
+        help=f"Max requests per second to SumoDB (default: {DEFAULT_RATE:g})",
+    )
+    parser.add_argument(
+        "--adaptive-rate", choices=["on", "off"], default="on",
+        help="Adjust the request rate (up to --rate) from server latency, "
+             "429/503 and Retry-After (default: on)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true", default=False,
+        help="Continue an interrupted run with the same arguments from its "
+             "journal, skipping pages it already parsed",
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, default=DEFAULT_PARSE_WORKERS,
+        help=f"Pages parsed in parallel (default: {DEFAULT_PARSE_WORKERS})",
+    )
+    parser.add_argument(
+        "--parse-pool", choices=PARSE_POOLS, default="thread",
+        help="Parse in worker threads, or in --parse-workers processes to "
+             "use several cores (default: thread)",
+    )
+    parser.add_argument(
+        "--parse-cache", choices=["on", "off"], default="on",
+        help="Reuse records parsed from identical pages in earlier runs "
+             "(data/parsed; default: on)",
+    )
+    parser.add_argument(
+        "--pool-size", type=int, default=8,
+        help="Keep-alive HTTP connections per host (default: 8)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0,
+        help="HTTP read timeout in seconds (default: 30)",
+    )
+    parser.add_argument(
+        "--base-url", default=None,
+        help="Fetch from this server instead of SumoDB, e.g. a local "
+             "stand-in (default: $SUMODATA_BASE_URL or SumoDB)",
+    )
+    parser.add_argument(
+        "--metrics-json", type=Path, default=None,
+        help="Write fetch metrics (latency, bytes, retries, waits, cache) "
+             "as JSON to this file at the end of the run",
+    )
+    parser.add_argument(
+        "--metrics-prom", type=Path, default=None,
+        help="Write the same metrics as a Prometheus textfile",
+    )
     parser.add_argument(
         "--log-level", choices=["INFO", "DEBUG"], default="INFO",
         help="Logging level (default: INFO)",
@@ -73,106 +205,591 @@ def _project_root() -> Path:
     return Path.cwd()
 
 
-def main() -> None:
+def _build_cache_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sumodata cache",
+        description="Manage the raw HTML cache.",
+    )
+    parser.add_argument(
+        "command",
+        choices=["stats", "prune", "verify", "pin", "unpin", "import", "export"],
+        help="stats: sizes and hit rates per basho; prune: evict by age and "
+             "byte budget; verify: read back every page; pin/unpin: protect "
+             "a basho from eviction; import/export: convert between the "
+             "directory layout and --backend",
+    )
+    parser.add_argument(
+        "--backend", choices=sorted(BACKENDS), default=None,
+        help="Cache backend to manage (default: dir; pack for import/export)",
+    )
+    parser.add_argument(
+        "--raw-dir", type=Path, default=None,
+        help="Raw cache directory (default: <project>/data/raw)",
+    )
+    parser.add_argument(
+        "--basho", default=None,
+        help="Basho to pin/unpin in YYYYMM format",
+    )
+    parser.add_argument(
+        "--max-bytes", type=parse_size, default=None,
+        help="prune: evict least-recently-used basho above this size (e.g. 500M)",
+    )
+    parser.add_argument(
+        "--max-age-days", type=float, default=None,
+        help="prune: evict unpinned basho fetched longer ago than this",
+    )
+    parser.add_argument(
+        "--pin-finished", choices=["on", "off"], default="off",
+        help="Also treat every basho from past months as pinned, leaving only "
+             "the current one evictable (default: off; see pin)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", default=False,
+        help="prune: only report what would be evicted",
+    )
+    parser.add_argument(
+        "--log-level", choices=["INFO", "DEBUG"], default="INFO",
+        help="Logging level (default: INFO)",
+    )
+    return parser
+
+
+def _cache_main(argv: list[str]) -> None:
+    parser = _build_cache_parser()
+    args = parser.parse_args(argv)
+    _setup_logging(args.log_level)
+    raw_dir = args.raw_dir or _project_root() / "data" / "raw"
+    pin_finished = args.pin_finished == "on"
+
+    try:
+        if args.command in ("import", "export"):
+            backend_name = args.backend or "pack"
+            if backend_name == "dir":
+                parser.error("import/export need a non-dir --backend")
+            if args.command == "import":
+                count = convert(raw_dir, "dir", backend_name)
+            else:
+                count = convert(raw_dir, backend_name, "dir")
+            logger.info("%s: %d pages in %s", args.command, count, raw_dir)
+            return
+
+        backend = BACKENDS[args.backend or "dir"]()
+        if args.command == "stats":
+            events = usage(backend, raw_dir, pin_finished)
+            for line in format_usage(events, profile_usage(backend, raw_dir)):
+                print(line)
+        elif args.command == "prune":
+            if args.max_bytes is None and args.max_age_days is None:
+                parser.error("prune needs --max-bytes and/or --max-age-days")
+            max_age = (
+                timedelta(days=args.max_age_days)
+                if args.max_age_days is not None else None
+            )
+            evicted = prune(
+                backend, raw_dir, args.max_bytes, max_age, pin_finished, args.dry_run,
+            )
+            logger.info("%s %d basho", "Would evict" if args.dry_run else "Evicted", len(evicted))
+        elif args.command == "verify":
+            problems = verify(backend, raw_dir)
+            for problem in problems:
+                print(problem)
+            if problems:
+                sys.exit(1)
+        else:
+            if not args.basho:
+                parser.error(f"{args.command} needs --basho")
+            set_pinned(raw_dir, f"honbasho-{args.basho}", args.command == "pin")
+            logger.info("%sned honbasho-%s", args.command.capitalize(), args.basho)
+    except SumodataError as e:
+        logger.error("Fatal error: %s", e)
+        sys.exit(1)
+
+
+def _build_reparse_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sumodata reparse",
+        description="Rebuild the fact and dim tables from the raw cache without fetching.",
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "--all", action="store_true", default=False,
+        help="Every basho whose pages are all in the raw cache",
+    )
+    target.add_argument(
+        "--basho", default=None,
+        help="Single basho in YYYYMM format",
+    )
+    target.add_argument(
+        "--from", dest="from_basho", default=None,
+        help="First basho of a range in YYYYMM format (with --to)",
+    )
+    parser.add_argument(
+        "--to", dest="to_basho", default=None,
+        help="Last basho of a range in YYYYMM format (inclusive)",
+    )
+    parser.add_argument(
+        "--raw-dir", type=Path, default=None,
+        help="Raw cache directory (default: <project>/data/raw)",
+    )
+    parser.add_argument(
+        "--cache-backend", choices=sorted(BACKENDS), default="dir",
+        help="Raw cache storage (default: dir)",
+    )
+    parser.add_argument(
+        "--parser", choices=sorted(PARSERS), default="bs4",
+        help="HTML parser (default: bs4)",
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, default=os.cpu_count() or 1,
+        help="Pages parsed in parallel (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--parse-pool", choices=PARSE_POOLS, default="process",
+        help="Parse in worker processes or threads (default: process)",
+    )
+    parser.add_argument(
+        "--playoff", choices=["on", "off"], default="on",
+        help="Reparse playoff pages linked from day 15 (default: on)",
+    )
+    parser.add_argument(
+        "--rikishi", choices=["on", "off"], default="on",
+        help="Rebuild dim_rikishi.csv from cached Rikishi pages (default: on)",
+    )
+    parser.add_argument(
+        "--log-level", choices=["INFO", "DEBUG"], default="INFO",
+        help="Logging level (default: INFO)",
+    )
+    return parser
+
+
+def _reparse_main(argv: list[str]) -> None:
+    parser = _build_reparse_parser()
+    args = parser.parse_args(argv)
+    if args.parse_workers < 1:
+        parser.error("--parse-workers must be at least 1")
+    if args.to_basho and not args.from_basho:
+        parser.error("--to needs --from")
+    try:
+        configure_parser(args.parser)
+        if args.basho:
+            bashos = honbasho_range(args.basho, args.basho)
+        elif args.from_basho:
+            if not args.to_basho:
+                parser.error("--from needs --to")
+            bashos = honbasho_range(args.from_basho, args.to_basho)
+    except (ValueError, ParseError) as e:
+        parser.error(str(e))
+    _setup_logging(args.log_level)
+    configure_backend(args.cache_backend)
+
+    root = _project_root()
+    raw_dir = args.raw_dir or root / "data" / "raw"
+    if args.all:
+        bashos = cached_bashos(raw_dir, args.playoff == "on")
+    options = PipelineOptions(
+        playoff=args.playoff == "on",
+        parse_workers=args.parse_workers,
+        parse_pool=args.parse_pool,
+    )
+    start_time = time.time()
+    get_metrics().reset()
+    logger.info(
+        "Reparsing %d basho from %s (parser=%s, %d %s workers)",
+        len(bashos), raw_dir, args.parser, args.parse_workers, args.parse_pool,
+    )
+    try:
+        result = reparse(
+            bashos, raw_dir,
+            root / "data" / "fact" / "fact_bout_daily.csv",
+            root / "data" / "dim" / "dim_shikona_by_basho.csv",
+            options,
+            root / "data" / "dim" / "dim_rikishi.csv" if args.rikishi == "on" else None,
+        )
+    except SumodataError as e:
+        logger.error("Fatal error: %s", e)
+        sys.exit(1)
+
+    summary = get_metrics().to_dict()
+    logger.info("=== Summary ===")
+    logger.info("Basho reparsed: %d", len(result.bashos))
+    logger.info("Fact rows: %d", result.bouts)
+    logger.info("Dim shikona rows: %d", result.shikona)
+    if args.rikishi == "on":
+        logger.info("Dim rikishi rows: %d", result.rikishi)
+    logger.info(
+        "Elapsed: %.1fs %s", time.time() - start_time,
+        " ".join(f"{k}={v:.1f}s" for k, v in summary["phase_seconds"].items()),
+    )
+
+
+def _build_fact_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sumodata fact",
+        description="Manage the storage layout of the fact table.",
+    )
+    parser.add_argument(
+        "command",
+        choices=["split", "export"],
+        help="split: move fact_bout_daily.csv into one partition per basho; "
+             "export: write the partitions back out as one combined CSV",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None,
+        help="export: combined CSV to write, outside data/fact (required)",
+    )
+    parser.add_argument(
+        "--log-level", choices=["INFO", "DEBUG"], default="INFO",
+        help="Logging level (default: INFO)",
+    )
+    return parser
+
+
+def _fact_main(argv: list[str]) -> None:
+    parser = _build_fact_parser()
+    args = parser.parse_args(argv)
+    if args.command == "export" and args.output is None:
+        parser.error("export needs --output")
+    _setup_logging(args.log_level)
+    fact_path = _project_root() / "data" / "fact" / "fact_bout_daily.csv"
+    try:
+        store = FactStore(fact_path)
+        if args.command == "split":
+            store.split()
+        else:
+            store.export(args.output)
+    except SumodataError as e:
+        logger.error("Fatal error: %s", e)
+        sys.exit(1)
+
+
+def _build_watch_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sumodata watch",
+        description="Poll a basho in progress and apply changed days as they appear.",
+    )
+    parser.add_argument(
+        "--basho", required=True,
+        help="Basho in progress in YYYYMM format",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_INTERVAL,
+        help=f"Seconds between polls (default: {DEFAULT_INTERVAL})",
+    )
+    parser.add_argument(
+        "--max-polls", type=int, default=None,
+        help="Stop after this many polls (default: until the basho is complete)",
+    )
+    parser.add_argument(
+        "--raw-cache", choices=["on", "off"], default="on",
+        help="Store pages in the raw cache once final (default: on)",
+    )
+    parser.add_argument(
+        "--cache-backend", choices=sorted(BACKENDS), default="dir",
+        help="Raw cache storage (default: dir)",
+    )
+    parser.add_argument(
+        "--parser", choices=sorted(PARSERS), default="bs4",
+        help="HTML parser (default: bs4)",
+    )
+    parser.add_argument(
+        "--playoff", choices=["on", "off"], default="on",
+        help="Playoff detection and fetch (default: on)",
+    )
+    parser.add_argument(
+        "--rate", type=_positive_float, default=DEFAULT_RATE,
+        help=f"Max requests per second to SumoDB (default: {DEFAULT_RATE:g})",
+    )
+    parser.add_argument(
+        "--adaptive-rate", choices=["on", "off"], default="on",
+        help="Adjust the request rate from server feedback (default: on)",
+    )
+    parser.add_argument(
+        "--base-url", default=None,
+        help="Fetch from this server instead of SumoDB",
+    )
+    parser.add_argument(
+        "--metrics-json", type=Path, default=None,
+        help="Write cumulative fetch metrics as JSON after every poll",
+    )
+    parser.add_argument(
+        "--metrics-prom", type=Path, default=None,
+        help="Write the same metrics as a Prometheus textfile after every poll",
+    )
+    parser.add_argument(
+        "--log-level", choices=["INFO", "DEBUG"], default="INFO",
+        help="Logging level (default: INFO)",
+    )
+    return parser
+
+
+def _watch_main(argv: list[str]) -> None:
+    parser = _build_watch_parser()
+    args = parser.parse_args(argv)
+    try:
+        honbasho_range(args.basho, args.basho)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.interval < 0:
+        parser.error("--interval must not be negative")
+    try:
+        configure_parser(args.parser)
+    except ParseError as e:
+        parser.error(str(e))
+    _setup_logging(args.log_level)
+
+    configure_rate_limit(args.rate, adaptive=args.adaptive_rate == "on")
+    configure_backend(args.cache_backend)
+    if args.base_url:
+        configure_base_url(args.base_url)
+    root = _project_root()
+    get_metrics().reset()
+
+    try:
+        polls = watch(
+            args.basho,
+            root / "data" / "raw",
+            root / "data" / "fact" / "fact_bout_daily.csv",
+            root / "data" / "dim" / "dim_shikona_by_basho.csv",
+            args.raw_cache == "on",
+            interval=args.interval,
+            playoff=args.playoff == "on",
+            max_polls=args.max_polls,
+            on_poll=lambda _: _write_metrics(args),
+        )
+        logger.info("Stopped after %d polls", polls)
+    except KeyboardInterrupt:
+        logger.info("Interrupted; stopping")
+    except SumodataError as e:
+        logger.error("Fatal error: %s", e)
+        sys.exit(1)
+    finally:
+        close_session()
+
+
+def _write_metrics(args: argparse.Namespace) -> None:
+    """Export this run's metrics; written for failed runs too."""
+    try:
+        if args.metrics_json:
+            get_metrics().write_json(args.metrics_json)
+            logger.info("Metrics written to %s", args.metrics_json)
+        if args.metrics_prom:
+            get_metrics().write_prometheus(args.metrics_prom)
+            logger.info("Metrics written to %s", args.metrics_prom)
+    except OSError as e:
+        logger.warning("Could not write metrics: %s", e)
+
+
+def _run_live(
+    args: argparse.Namespace,
+    basho: str,
+    raw_dir: Path,
+    fact_path: Path,
+    dim_path: Path,
+    rikishi_path: Path,
+) -> None:
+    """One incremental update of a basho in progress (--live)."""
+    start_time = time.time()
+    use_cache = args.raw_cache != "off"
+    result = update_live(
+        basho, raw_dir, fact_path, dim_path, use_cache, playoff=args.playoff == "on",
+    )
+    if args.rikishi == "on" and result.bouts:
+        refresh_rikishi(
+            fact_path, rikishi_path, raw_dir, use_cache,
+            ttl=timedelta(days=args.rikishi_ttl_days),
+            concurrency=args.concurrency,
+            revalidate=args.raw_cache == "revalidate",
+        )
+    summary = get_metrics().to_dict()
+    logger.info("=== Summary ===")
+    logger.info("Event: %s (live)", event_id_for(basho))
+    logger.info("Fetched days: %s", ", ".join(map(str, result.fetched)) or "none")
+    logger.info("Final days: %s", ", ".join(map(str, result.final)) or "none")
+    logger.info("Fact rows replaced: %d", result.bouts)
+    logger.info("Dim shikona rows: %d", result.shikona)
+    logger.info("HTTP: requests=%d bytes=%d", summary["requests"], summary["bytes_downloaded"])
+    logger.info("Elapsed: %.1fs", time.time() - start_time)
+
+
+def _basho_events(
+    results: Iterable[BashoResult],
+    counts: BoutCounts,
+    shikona: dict[str, ShikonaBatch],
+) -> Iterator[dict[str, BoutBatch]]:
+    """Each basho's bouts by event, counted; its shikona go into ``shikona``."""
+    metrics = get_metrics()
+    for result in results:
+        events: dict[str, BoutBatch] = {}
+        for r in counts.count(result.bouts):
+            if r.event_id not in events:
+                events[r.event_id] = BoutBatch()
+            events[r.event_id].append(r)
+        shikona[result.basho] = ShikonaBatch(result.shikona)
+        # The consumer writes the basho while this generator is suspended here
+        with metrics.phase("write"):
+            yield events
+
+
+def main(argv: list[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "cache":
+        _cache_main(argv[1:])
+        return
+    if argv and argv[0] == "watch":
+        _watch_main(argv[1:])
+        return
+    if argv and argv[0] == "reparse":
+        _reparse_main(argv[1:])
+        return
+    if argv and argv[0] == "fact":
+        _fact_main(argv[1:])
+        return
+
     parser = _build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.basho:
+        if args.from_basho or args.to_basho:
+            parser.error("--basho cannot be combined with --from/--to")
+        bashos = [args.basho]
+    elif args.from_basho and args.to_basho:
+        try:
+            bashos = honbasho_range(args.from_basho, args.to_basho)
+        except ValueError as e:
+            parser.error(str(e))
+        if not bashos:
+            parser.error(f"no honbasho between {args.from_basho} and {args.to_basho}")
+    else:
+        parser.error("either --basho or both --from and --to are required")
+    if args.live and (len(bashos) != 1 or args.resume):
+        parser.error("--live needs a single --basho and cannot be combined with --resume")
+    try:
+        configure_parser(args.parser)
+    except ParseError as e:
+        parser.error(str(e))
 
     _setup_logging(args.log_level)
 
-    basho = args.basho
-    use_cache = args.raw_cache == "on"
-    do_playoff = args.playoff == "on"
+    use_cache = args.raw_cache != "off"
     force = args.force
+    options = PipelineOptions(
+        use_cache=use_cache,
+        revalidate=args.raw_cache == "revalidate",
+        playoff=args.playoff == "on",
+        concurrency=args.concurrency,
+        parse_workers=args.parse_workers,
+        parse_pool=args.parse_pool,
+    )
+
+    configure_session(SessionConfig(
+        pool_maxsize=args.pool_size,
+        read_timeout=args.timeout,
+    ))
+    configure_rate_limit(args.rate, adaptive=args.adaptive_rate == "on")
+    configure_backend(args.cache_backend)
+    if args.base_url:
+        configure_base_url(args.base_url)
 
-    event_id = f"honbasho-{basho}"
     root = _project_root()
     fact_path = root / "data" / "fact" / "fact_bout_daily.csv"
     dim_path = root / "data" / "dim" / "dim_shikona_by_basho.csv"
-    cache_dir = root / "data" / "raw" / event_id
+    rikishi_path = root / "data" / "dim" / "dim_rikishi.csv"
+    raw_dir = root / "data" / "raw"
 
-    logger.info("Starting sumodata for basho=%s event_id=%s", basho, event_id)
-    logger.info("Options: force=%s cache=%s playoff=%s", force, use_cache, do_playoff)
+    if len(bashos) == 1:
+        logger.info(
+            "Starting sumodata for basho=%s event_id=%s", bashos[0], event_id_for(bashos[0]),
+        )
+    else:
+        logger.info(
+            "Starting sumodata for %d basho %s..%s", len(bashos), bashos[0], bashos[-1],
+        )
+    logger.info(
+        "Options: force=%s cache=%s playoff=%s concurrency=%d rate=%g parse_workers=%d (%s)",
+        force, args.raw_cache, options.playoff, args.concurrency, args.rate,
+        args.parse_workers, args.parse_pool,
+    )
 
     start_time = time.time()
+    metrics = get_metrics()
+    metrics.reset()
 
+    journal: RunJournal | None = None
     try:
-        all_bout_records: list[BoutRecord] = []
-        last_day_html: str = ""
-
-        # 1. Fetch & parse Results (d=1..15)
-        for day in range(1, 16):
-            url = results_url(basho, day)
-            cache_path = cache_dir / f"results_d{day:02d}.html" if use_cache else None
-            fetched_at = datetime.now(timezone.utc).isoformat()
-
-            html = fetch_with_cache(url, cache_path, use_cache)
-            if day == 15:
-                last_day_html = html
-
-            records = parse_results_page(
-                html=html,
-                event_id=event_id,
-                event_type="honbasho_regular",
-                is_regular="T",
-                basho=basho,
-                day=day,
-                source_url=url,
-                fetched_at=fetched_at,
-            )
-            all_bout_records.extend(records)
-            logger.info("Day %d: %d bouts", day, len(records))
-
-        # 2. Fetch & parse Banzuke
-        banz_url = banzuke_url(basho)
-        banz_cache = cache_dir / "banzuke.html" if use_cache else None
-        banz_html = fetch_with_cache(banz_url, banz_cache, use_cache)
-        shikona_records: list[ShikonaRecord] = parse_banzuke_page(
-            banz_html, basho, banz_url,
-        )
-
-        # 3. Playoff detection & fetch
-        if do_playoff and last_day_html:
-            has_playoff = detect_playoff(last_day_html, basho)
-            if has_playoff:
-                playoff_event_id = f"honbasho-{basho}-playoff"
-                playoff_url = results_url(basho, 16)
-                playoff_cache = cache_dir / "playoff.html" if use_cache else None
-                fetched_at = datetime.now(timezone.utc).isoformat()
-                playoff_html = fetch_with_cache(
-                    playoff_url, playoff_cache, use_cache,
-                )
-                playoff_records = parse_results_page(
-                    html=playoff_html,
-                    event_id=playoff_event_id,
-                    event_type="honbasho_playoff",
-                    is_regular="F",
-                    basho=basho,
-                    day=16,
-                    source_url=playoff_url,
-                    fetched_at=fetched_at,
-                )
-                all_bout_records.extend(playoff_records)
-                logger.info("Playoff: %d bouts", len(playoff_records))
-            else:
-                logger.info("No playoff detected for basho %s", basho)
-
-        # 4. CSV output — group by event_id and write each
-        events: dict[str, list[BoutRecord]] = {}
-        for r in all_bout_records:
-            events.setdefault(r.event_id, []).append(r)
+        if args.live:
+            _run_live(args, bashos[0], raw_dir, fact_path, dim_path, rikishi_path)
+            return
 
-        for eid, records in events.items():
-            update_fact_csv(records, fact_path, force, eid)
+        # 1. Fetch and parse every basho through one shared pipeline,
+        #    journaling each page so an interrupted run can --resume
+        journal = RunJournal.open(
+            root / "data" / "journal",
+            {"bashos": bashos, "force": force, "playoff": options.playoff},
+            resume=args.resume,
+        )
+        todo = [b for b in bashos if not journal.is_committed(b)]
+        parsed = (
+            ParseCache.open(root / "data" / "parsed") if args.parse_cache == "on" else None
+        )
+        # 2. CSV output. Each basho's bouts are written as the basho
+        #    completes, so only one basho is held; the dim table (a few
+        #    hundred rows per basho) is written once for the whole run
+        shikona: dict[str, ShikonaBatch] = {}
+        counts = BoutCounts()
+        results = iter_basho(todo, raw_dir, options, journal, parsed)
+        FactStore(fact_path).update_by_basho(_basho_events(results, counts, shikona), force)
+        with metrics.phase("write"):
+            if shikona:
+                update_dim_shikona_csv_batch(shikona, dim_path, force)
+        journal.mark_committed(todo)
+        journal.finish()
 
-        update_dim_shikona_csv(shikona_records, dim_path, force, basho)
+        # 3. (optional) Rikishi profiles — only new and expired rids
+        rikishi_rows = 0
+        if args.rikishi == "on":
+            rikishi_rows = refresh_rikishi(
+                fact_path, rikishi_path, raw_dir, use_cache,
+                ttl=timedelta(days=args.rikishi_ttl_days),
+                concurrency=args.concurrency,
+                revalidate=options.revalidate,
+            )
 
-        # 5. Summary
+        # 4. Summary
         elapsed = time.time() - start_time
         logger.info("=== Summary ===")
-        logger.info("Event: %s", event_id)
-        logger.info("Fact rows: %d", len(all_bout_records))
-        logger.info("Dim shikona rows: %d", len(shikona_records))
+        if len(bashos) == 1:
+            logger.info("Event: %s", event_id_for(bashos[0]))
+        else:
+            logger.info("Events: %d basho %s..%s", len(bashos), bashos[0], bashos[-1])
+        logger.info("Fact rows: %d (%s)", counts.total, counts.summary())
+        logger.info("Dim shikona rows: %d", sum(len(v) for v in shikona.values()))
+        if args.rikishi == "on":
+            logger.info("Dim rikishi rows refreshed: %d", rikishi_rows)
         logger.info("Elapsed: %.1fs", elapsed)
+        summary = metrics.to_dict()
+        logger.info(
+            "Time: network=%.1fs rate-wait=%.1fs backoff=%.1fs %s",
+            summary["latency_seconds"]["sum"],
+            summary["rate_wait_seconds"],
+            summary["backoff_seconds"],
+            " ".join(f"{k}={v:.1f}s" for k, v in summary["phase_seconds"].items()),
+        )
+        logger.info(
+            "HTTP: requests=%d retries=%d bytes=%d",
+            summary["requests"], summary["retries"], summary["bytes_downloaded"],
+        )
+        if parsed is not None:
+            logger.info(
+                "Parse cache: %s",
+                ", ".join(f"{k}={v}" for k, v in summary["parse_cache"].items()),
+            )
+        if use_cache:
+            cache_totals = get_stats().totals()
+            logger.info(
+                "Cache: %s",
+                ", ".join(f"{k}={v}" for k, v in cache_totals.items()),
+            )
+            get_stats().flush(raw_dir)
 
     except SumodataError as e:
         logger.error("Fatal error: %s", e)
@@ -180,3 +797,8 @@ def main() -> None:
     except Exception as e:
         logger.error("Unexpected error: %s", e, exc_info=True)
         sys.exit(1)
+    finally:
+        if journal is not None:
+            journal.close()
+        close_session()
+        _write_metrics(args)
@@ -0,0 +1,225 @@
+"""Fact table storage: one combined CSV, or one partition per basho.
+
+By default the fact table is the single fact_bout_daily.csv, which every
+update reads, re-sorts and rewrites whole. After ``sumodata fact split``
+its directory holds instead
+
+    manifest.json               format version, columns, rows per partition
+    basho=YYYYMM/part.csv       rows of honbasho-YYYYMM and its playoff
+
+and an update reads and rewrites only the partitions of the basho it
+touches. Event ids sort by basho, so the partitions concatenated in basho
+order are exactly the combined CSV, which export() writes on demand to
+a path outside the table's directory.
+"""
+
+import csv
+import json
+import logging
+import re
+import shutil
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from sumodata.io_csv import (
+    FACT_COLUMNS,
+    atomic_write,
+    merge_fact_csv,
+    read_fact_rids,
+    update_fact_csv_batch,
+)
+from sumodata.models import BoutRecord
+from sumodata.util import SumodataError
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+PARTITION_FILE = "part.csv"
+
+_EVENT_BASHO = re.compile(r"honbasho-(\d{6})(-playoff)?")
+
+
+class FactStoreError(SumodataError):
+    """The fact table layout cannot be used."""
+
+
+def basho_of(event_id: str) -> str:
+    """Basho (YYYYMM) of an event id; its partition."""
+    m = _EVENT_BASHO.fullmatch(event_id)
+    if m is None:
+        raise FactStoreError(f"Cannot partition event {event_id!r}: no basho in its id")
+    return m.group(1)
+
+
+def _count_rows(path: Path) -> int:
+    if not path.exists():
+        return 0
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+class FactStore:
+    """The fact table at ``path``, or the partitions beside it once split.
+
+    The layout is chosen by the manifest: without one in ``path``'s
+    directory the combined CSV is the table.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.directory = path.parent
+        self.manifest_path = self.directory / MANIFEST_FILE
+        self.manifest: dict | None = None
+        if self.manifest_path.exists():
+            try:
+                self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            except ValueError as e:
+                raise FactStoreError(f"Unreadable {self.manifest_path}: {e}") from e
+            version = self.manifest.get("version")
+            if version != MANIFEST_VERSION:
+                raise FactStoreError(
+                    f"{self.manifest_path} has version {version}, expected {MANIFEST_VERSION}"
+                )
+
+    @property
+    def partitioned(self) -> bool:
+        return self.manifest is not None
+
+    def bashos(self) -> list[str]:
+        """Basho with a partition, in order."""
+        return sorted(self.manifest["partitions"]) if self.manifest else []
+
+    def partition_path(self, basho: str) -> Path:
+        return self.directory / f"basho={basho}" / PARTITION_FILE
+
+    def path_for(self, basho: str) -> Path:
+        """The CSV that holds (or will hold) the rows of ``basho``."""
+        return self.partition_path(basho) if self.partitioned else self.path
+
+    def paths(self) -> list[Path]:
+        """Every CSV of the table, in row order."""
+        if not self.partitioned:
+            return [self.path]
+        return [self.partition_path(basho) for basho in self.bashos()]
+
+    def update(
+        self,
+        records_by_event: Mapping[str, Iterable[BoutRecord]],
+        force: bool,
+    ) -> None:
+        """update_fact_csv_batch() on the table, one partition per basho."""
+        if not self.partitioned:
+            update_fact_csv_batch(records_by_event, self.path, force)
+            return
+        by_basho: dict[str, dict[str, Iterable[BoutRecord]]] = {}
+        for event_id, records in records_by_event.items():
+            by_basho.setdefault(basho_of(event_id), {})[event_id] = records
+        for basho, events in sorted(by_basho.items()):
+            update_fact_csv_batch(events, self.partition_path(basho), force)
+        self.commit(by_basho)
+
+    def update_by_basho(
+        self,
+        groups: Iterable[Mapping[str, Iterable[BoutRecord]]],
+        force: bool,
+    ) -> None:
+        """update() for the events of one basho at a time, in basho order.
+
+        Each group is written before the next is taken: into its partition,
+        or merged into the combined CSV as it streams by (merge_fact_csv).
+        """
+        if not self.partitioned:
+            merge_fact_csv(groups, self.path, force)
+            return
+        for events in groups:
+            if events:
+                self.update(events, force)
+
+    def commit(self, bashos: Iterable[str]) -> None:
+        """Record the partitions of ``bashos`` in the manifest after a write.
+
+        A partition left without rows is removed. No-op for a combined CSV.
+        """
+        if self.manifest is None:
+            return
+        partitions = self.manifest["partitions"]
+        for basho in bashos:
+            path = self.partition_path(basho)
+            rows = _count_rows(path)
+            if rows:
+                partitions[basho] = {"rows": rows}
+            else:
+                partitions.pop(basho, None)
+                if path.exists():
+                    shutil.rmtree(path.parent)
+        self.manifest["partitions"] = dict(sorted(partitions.items()))
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=1), encoding="utf-8")
+        tmp.replace(self.manifest_path)
+
+    def read_rids(self) -> set[int]:
+        """Distinct rikishi IDs in the table (read_fact_rids over every file)."""
+        rids: set[int] = set()
+        for path in self.paths():
+            rids |= read_fact_rids(path)
+        return rids
+
+    def split(self) -> int:
+        """Move the combined CSV into partitions; return the row count."""
+        if self.partitioned:
+            raise FactStoreError(f"{self.directory} is already partitioned")
+        rows_by_basho: dict[str, list[list[str]]] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8", newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if header is not None and header != FACT_COLUMNS:
+                    raise FactStoreError(f"Unexpected columns in {self.path}: {header}")
+                event = FACT_COLUMNS.index("event_id")
+                for row in reader:
+                    rows_by_basho.setdefault(basho_of(row[event]), []).append(row)
+
+        # The combined CSV is sorted, so each basho's rows already are
+        for basho, rows in rows_by_basho.items():
+            with atomic_write(self.partition_path(basho)) as f:
+                writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator="\n")
+                writer.writerow(FACT_COLUMNS)
+                writer.writerows(rows)
+        self.manifest = {
+            "version": MANIFEST_VERSION,
+            "columns": FACT_COLUMNS,
+            "partitions": {
+                basho: {"rows": len(rows)} for basho, rows in sorted(rows_by_basho.items())
+            },
+        }
+        self._write_manifest()
+        self.path.unlink(missing_ok=True)
+        total = sum(len(rows) for rows in rows_by_basho.values())
+        logger.info(
+            "Split %d rows into %d partitions in %s", total, len(rows_by_basho), self.directory,
+        )
+        return total
+
+    def export(self, output: Path) -> int:
+        """Write the combined CSV to ``output``; return the row count.
+
+        ``output`` must lie outside the table's directory: a snapshot there
+        would go stale beside the partitions and be committed with them.
+        """
+        if not self.partitioned:
+            raise FactStoreError(f"{self.directory} is not partitioned; {self.path} is the table")
+        if output.resolve().is_relative_to(self.directory.resolve()):
+            raise FactStoreError(f"Export to {output} would land inside {self.directory}")
+        with atomic_write(output) as out:
+            csv.writer(out, lineterminator="\n").writerow(FACT_COLUMNS)
+            for path in self.paths():
+                with open(path, "r", encoding="utf-8", newline="") as f:
+                    f.readline()  # the partition's header
+                    shutil.copyfileobj(f, out)
+        total = sum(p["rows"] for p in self.manifest["partitions"].values())
+        logger.info("Exported %d rows from %d partitions to %s", total, len(self.paths()), output)
+        return total
@@ -1,17 +1,32 @@
-"""HTTP fetch with retry, backoff, sleep, and caching."""
+"""HTTP fetch with retry, backoff, rate limiting, and caching."""
 
+import asyncio
+import email.utils
 import logging
-import random
+import os
+import queue
+import threading
 import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from sumodata.cache import CacheError, CacheMeta, get_backend
+from sumodata.cache_manager import record_access
+from sumodata.metrics import get_metrics
+from sumodata.ratelimit import AdaptiveRateController, TokenBucket
 from sumodata.util import FetchError
 
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://sumodb.sumogames.de"
+DEFAULT_BASE_URL = "https://sumodb.sumogames.de"
+# Overridable to point the fetcher at a stand-in server (see sumodata.standin)
+BASE_URL = os.environ.get("SUMODATA_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
 HEADERS = {
     "User-Agent": "sumodata/0.1 (+https://github.com/owner/sumo_scrape)"
 }
@@ -20,6 +35,92 @@ BACKOFF_BASE = 1  # seconds: 1, 2, 4
 SLEEP_MIN = 0.5
 SLEEP_MAX = 1.5
 
+# Request budget: the ceiling matches the fastest pace the old fixed
+# SLEEP_MIN..SLEEP_MAX sleeps allowed; adaptive control starts at their mean
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 1 / SLEEP_MIN  # requests/sec
+INITIAL_RATE = 2 / (SLEEP_MIN + SLEEP_MAX)  # requests/sec
+THROTTLE_STATUSES = (429, 503)
+MAX_RETRY_AFTER = 300  # seconds; cap on a server-requested pause
+
+
+@dataclass
+class SessionConfig:
+    """Connection settings for the shared HTTP session."""
+
+    pool_connections: int = 4  # number of per-host pools kept
+    pool_maxsize: int = 8  # connections kept alive per host
+    pool_block: bool = True  # never exceed pool_maxsize connections per host
+    keep_alive: bool = True
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+
+
+_session_config = SessionConfig()
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def _build_session(config: SessionConfig) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=0,  # retries are handled by fetch_page
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def configure_session(config: SessionConfig) -> None:
+    """Replace the session settings; the next fetch opens a fresh pool."""
+    global _session_config
+    with _session_lock:
+        _session_config = config
+    close_session()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session(_session_config)
+            logger.debug(
+                "Opened HTTP session (pool_maxsize=%d, keep_alive=%s)",
+                _session_config.pool_maxsize, _session_config.keep_alive,
+            )
+        return _session
+
+
+def close_session() -> None:
+    """Close the shared session and drop its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def configure_base_url(url: str) -> None:
+    """Send all page requests to ``url`` instead of SumoDB."""
+    global BASE_URL
+    BASE_URL = url.rstrip("/")
+
+
+_offline = False
+
+
+def configure_offline(offline: bool) -> None:
+    """Refuse every network request, so pages can only come from the raw cache."""
+    global _offline
+    _offline = offline
+
 
 def results_url(basho: str, day: int) -> str:
     return f"{BASE_URL}/Results.aspx?b={basho}&d={day}"
@@ -33,16 +134,99 @@ def rikishi_url(rid: int) -> str:
     return f"{BASE_URL}/Rikishi.aspx?r={rid}"
 
 
-def fetch_page(url: str) -> str:
-    """Fetch a page with retry and exponential backoff."""
+_rate_limiter = TokenBucket(DEFAULT_RATE)
+_controller: AdaptiveRateController | None = None
+
+
+def configure_rate_limit(
+    rate: float,
+    burst: float = 1.0,
+    adaptive: bool = False,
+) -> None:
+    """Set the process-wide request budget shared by all page fetches.
+
+    With ``adaptive`` the budget starts at INITIAL_RATE and is steered by
+    server feedback (AIMD), never exceeding ``rate``.
+    """
+    global _rate_limiter, _controller
+    if adaptive:
+        _rate_limiter = TokenBucket(min(INITIAL_RATE, rate), burst)
+        _controller = AdaptiveRateController(_rate_limiter, max_rate=rate)
+    else:
+        _rate_limiter = TokenBucket(rate, burst)
+        _controller = None
+
+
+def get_rate_limiter() -> TokenBucket:
+    return _rate_limiter
+
+
+def _retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (seconds or HTTP date), capped."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+@dataclass
+class FetchResult:
+    status: int  # 200, or 304 for a conditional request
+    text: str
+    etag: str = ""
+    last_modified: str = ""
+
+
+def fetch_response(
+    url: str,
+    session: requests.Session | None = None,
+    headers: dict[str, str] | None = None,
+) -> FetchResult:
+    """Fetch a page with retry and exponential backoff.
+
+    Uses the shared pooled session unless one is passed explicitly, so
+    consecutive pages reuse the same keep-alive connection. Extra request
+    headers (e.g. conditional-GET validators) are sent as given; a 304
+    reply is returned as-is with an empty body.
+    """
+    if _offline:
+        raise FetchError(f"Not in the raw cache (offline): {url}")
+    if session is None:
+        session = get_session()
+    kwargs: dict = {"timeout": (
+        _session_config.connect_timeout, _session_config.read_timeout,
+    )}
+    if headers:
+        kwargs["headers"] = headers
     last_error = None
     for attempt in range(1, MAX_RETRIES + 1):
+        retry_after = None
         try:
             logger.debug("Fetching %s (attempt %d/%d)", url, attempt, MAX_RETRIES)
-            resp = requests.get(url, headers=HEADERS, timeout=30)
-            if resp.status_code == 200:
-                logger.debug("OK %s", url)
-                return resp.text
+            started = time.monotonic()
+            resp = session.get(url, **kwargs)
+            latency = time.monotonic() - started
+            get_metrics().record_response(
+                resp.status_code, latency,
+                len(resp.content) if resp.status_code == 200 else 0,
+            )
+            if resp.status_code in (200, 304):
+                logger.debug("HTTP %d %s (%.2fs)", resp.status_code, url, latency)
+                if _controller:
+                    _controller.on_success(latency)
+                return FetchResult(
+                    status=resp.status_code,
+                    text=resp.text if resp.status_code == 200 else "",
+                    etag=resp.headers.get("ETag", ""),
+                    last_modified=resp.headers.get("Last-Modified", ""),
+                )
             logger.warning(
                 "HTTP %d for %s (attempt %d/%d)",
                 resp.status_code, url, attempt, MAX_RETRIES,
@@ -50,43 +234,279 @@ def fetch_page(url: str) -> str:
             last_error = FetchError(
                 f"HTTP {resp.status_code} for {url}"
             )
+            if resp.status_code in THROTTLE_STATUSES:
+                retry_after = _retry_after(resp.headers.get("Retry-After"))
+                if _controller:
+                    _controller.on_throttle(resp.status_code, retry_after)
         except requests.RequestException as e:
             logger.warning(
                 "Connection error for %s (attempt %d/%d): %s",
                 url, attempt, MAX_RETRIES, e,
             )
             last_error = FetchError(f"Connection error for {url}: {e}")
+            get_metrics().record_response("error", time.monotonic() - started)
+            if _controller:
+                _controller.on_error()
 
         if attempt < MAX_RETRIES:
             backoff = BACKOFF_BASE * (2 ** (attempt - 1))
-            logger.debug("Backoff %ds before retry", backoff)
+            if retry_after is not None:
+                backoff = max(backoff, retry_after)
+            logger.debug("Backoff %ss before retry", backoff)
+            get_metrics().record_backoff(backoff)
             time.sleep(backoff)
+            # A retry is a request too: it waits for the shared budget
+            _page_sleep()
 
     raise last_error  # type: ignore[misc]
 
 
+def fetch_page(url: str, session: requests.Session | None = None) -> str:
+    """Fetch a page body with retry and exponential backoff."""
+    return fetch_response(url, session).text
+
+
 def _page_sleep() -> None:
-    """Random sleep between page fetches."""
-    delay = random.uniform(SLEEP_MIN, SLEEP_MAX)
-    time.sleep(delay)
+    """Wait for the shared request budget before fetching a page."""
+    delay = _rate_limiter.reserve()
+    if delay > 0:
+        get_metrics().record_rate_wait(delay)
+        time.sleep(delay)
 
 
-def fetch_with_cache(
+def _record_cache(cache_path: Path, outcome: str) -> None:
+    record_access(cache_path, outcome)
+    get_metrics().record_cache(outcome)
+
+
+def _read_cache(
+    cache_path: Path | None,
+    use_cache: bool,
+    revalidate: bool = False,
+) -> tuple[str | None, CacheMeta | None]:
+    """Return the cached body and its metadata, if any."""
+    if not (use_cache and cache_path):
+        return None, None
+    try:
+        entry = get_backend().get(cache_path)
+    except CacheError as e:
+        logger.warning("Ignoring unreadable cache entry: %s", e)
+        entry = None
+    if entry is None:
+        return None, None
+    if revalidate:
+        logger.debug("Revalidating cached %s", cache_path)
+    else:
+        logger.info("Cache hit: %s", cache_path)
+        _record_cache(cache_path, "hit")
+    return entry.body, entry.meta
+
+
+def _fetch_and_store(
     url: str,
     cache_path: Path | None,
     use_cache: bool,
+    cached: str | None = None,
+    meta: CacheMeta | None = None,
 ) -> str:
-    """Fetch a page, optionally using/saving cache."""
-    if use_cache and cache_path and cache_path.exists():
-        logger.info("Cache hit: %s", cache_path)
-        return cache_path.read_text(encoding="utf-8")
+    """Fetch url (conditionally if a cached copy has validators) and cache it."""
+    headers = meta.conditional_headers() if cached is not None and meta else {}
+    result = fetch_response(url, headers=headers)
+    now = datetime.now(timezone.utc).isoformat()
 
-    html = fetch_page(url)
-    _page_sleep()
+    if result.status == 304 and cached is not None and meta is not None:
+        logger.info("Not modified: %s", url)
+        _record_cache(cache_path, "not_modified")
+        meta.fetched_at = now
+        get_backend().put_meta(cache_path, meta)
+        return cached
 
     if use_cache and cache_path:
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        cache_path.write_text(html, encoding="utf-8")
+        _record_cache(cache_path, "miss" if cached is None else "modified")
+        get_backend().put(cache_path, result.text, CacheMeta(
+            url=url, fetched_at=now,
+            etag=result.etag, last_modified=result.last_modified,
+        ))
         logger.debug("Cached to %s", cache_path)
+    return result.text
+
+
+def fetch_with_cache(
+    url: str,
+    cache_path: Path | None,
+    use_cache: bool,
+    revalidate: bool = False,
+) -> str:
+    """Fetch a page, optionally using/saving cache.
+
+    With ``revalidate`` a cached page is not trusted blindly: it is
+    re-requested with If-None-Match/If-Modified-Since from its sidecar and
+    reused only if the server answers 304.
+    """
+    cached, meta = _read_cache(cache_path, use_cache, revalidate)
+    if cached is not None and not revalidate:
+        return cached
+
+    _page_sleep()
+    return _fetch_and_store(url, cache_path, use_cache, cached, meta)
+
+
+def fetch_fresh(url: str, headers: dict[str, str] | None = None) -> FetchResult:
+    """Fetch a page under the shared budget without reading or writing the cache.
+
+    For pages that may still change (a basho in progress); the caller
+    decides with cache_page whether the result is final enough to keep.
+    """
+    _page_sleep()
+    return fetch_response(url, headers=headers)
+
+
+def cache_page(cache_path: Path, url: str, result: FetchResult) -> None:
+    """Store a page fetched with fetch_fresh in the raw cache."""
+    _record_cache(cache_path, "miss")
+    get_backend().put(cache_path, result.text, CacheMeta(
+        url=url, fetched_at=datetime.now(timezone.utc).isoformat(),
+        etag=result.etag, last_modified=result.last_modified,
+    ))
+    logger.debug("Cached to %s", cache_path)
+
+
+@dataclass
+class FetchJob:
+    """One page to fetch in a batch."""
+
+    url: str
+    cache_path: Path | None = None
+
+
+def _job_runner(
+    use_cache: bool,
+    concurrency: int,
+    revalidate: bool,
+) -> Callable[[FetchJob], Awaitable[str]]:
+    """Coroutine function fetching one job under the shared budget.
+
+    Must be created inside the event loop that runs it.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    bucket = _rate_limiter
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async def run(job: FetchJob) -> str:
+        cached, meta = _read_cache(job.cache_path, use_cache, revalidate)
+        if cached is not None and not revalidate:
+            return cached
+        async with in_flight:
+            get_metrics().record_rate_wait(await bucket.acquire())
+            return await asyncio.to_thread(
+                _fetch_and_store, job.url, job.cache_path, use_cache, cached, meta,
+            )
+
+    return run
+
+
+async def fetch_many_async(
+    jobs: list[FetchJob],
+    use_cache: bool,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    revalidate: bool = False,
+) -> list[str]:
+    """Fetch jobs concurrently; results are returned in job order.
+
+    Cache hits are served immediately. Network fetches draw from the
+    process-wide token bucket (see configure_rate_limit) and at most
+    ``concurrency`` of them are in flight, which replaces the fixed
+    per-page sleep of fetch_with_cache.
+    """
+    run = _job_runner(use_cache, concurrency, revalidate)
+    return list(await asyncio.gather(*(run(job) for job in jobs)))
+
+
+def fetch_many(
+    jobs: list[FetchJob],
+    use_cache: bool,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    revalidate: bool = False,
+) -> list[str]:
+    """Synchronous wrapper around fetch_many_async."""
+    return asyncio.run(
+        fetch_many_async(jobs, use_cache, concurrency, revalidate),
+    )
+
+
+def iter_fetch(
+    jobs: list[FetchJob],
+    use_cache: bool,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    revalidate: bool = False,
+    buffer: int | None = None,
+    return_exceptions: bool = False,
+) -> Iterator[str]:
+    """Yield page bodies in job order while later jobs are still fetching.
+
+    Fetching runs on a background event loop, so the caller can parse page
+    N while page N+1 is on the wire. At most ``buffer`` (default
+    2 * concurrency) jobs are started ahead of the page being consumed and
+    at most ``buffer`` fetched pages wait in the queue, so memory stays
+    flat however many jobs are given. A fetch error is raised from the
+    iterator at that job's position; with ``return_exceptions`` it is
+    yielded in place of the body and the remaining jobs go on.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    if buffer is None:
+        buffer = 2 * concurrency
+    if buffer < 1:
+        raise ValueError(f"buffer must be at least 1, got {buffer}")
+    pages: queue.Queue = queue.Queue(maxsize=buffer)
+    stop = threading.Event()
+
+    def deliver(item: tuple[bool, object]) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    async def produce() -> None:
+        run = _job_runner(use_cache, concurrency, revalidate)
+        pending: deque[asyncio.Task] = deque()
+        todo = iter(jobs)
+        try:
+            while True:
+                # Keep up to ``buffer`` jobs started ahead of delivery
+                for job in todo:
+                    pending.append(asyncio.create_task(run(job)))
+                    if len(pending) >= buffer:
+                        break
+                if not pending:
+                    return
+                try:
+                    item = (True, await pending.popleft())
+                except Exception as e:
+                    item = (False, e)
+                if not await asyncio.to_thread(deliver, item):
+                    return
+                if not item[0] and not return_exceptions:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
-    return html
+    producer = threading.Thread(
+        target=lambda: asyncio.run(produce()), name="sumodata-fetch", daemon=True,
+    )
+    producer.start()
+    try:
+        for _ in jobs:
+            ok, value = pages.get()
+            if not ok and not return_exceptions:
+                raise value  # type: ignore[misc]
+            yield value  # type: ignore[misc]
+    finally:
+        stop.set()
+        producer.join()
@@ -1,11 +1,19 @@
 """CSV read/write with upsert and force replace."""
 
 import csv
+import io
 import logging
-from dataclasses import asdict, fields
+import os
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from itertools import chain
+from dataclasses import fields
+from operator import attrgetter
 from pathlib import Path
+from typing import TextIO
 
-from sumodata.models import BoutRecord, ShikonaRecord
+from sumodata.batch import RecordBatch
+from sumodata.models import BoutRecord, RikishiRecord, ShikonaRecord
 
 logger = logging.getLogger(__name__)
 
@@ -20,20 +28,43 @@ DIM_SHIKONA_COLUMNS = [
     "basho", "rid", "shikona_at_basho", "source_url", "division", "rank",
 ]
 
+DIM_RIKISHI_COLUMNS = ["rid", "current_shikona", "updated_at", "source_url"]
+
 FACT_KEY_COLUMNS = ["event_id", "day", "division", "bout_no"]
 FACT_SORT_COLUMNS = ["event_id", "day", "division", "bout_no"]
 
 DIM_KEY_COLUMNS = ["basho", "rid"]
 DIM_SORT_COLUMNS = ["basho", "rid"]
 
+DIM_RIKISHI_KEY_COLUMNS = ["rid"]
+
+NUMERIC_COLUMNS = {"day", "bout_no", "rid", "source_row_index", "east_rid", "west_rid"}
+
+
+# A row is a sequence of values in column order. Rows built from records
+# keep native ints (for sorting) and are formatted once, by the CSV writer.
+Row = Sequence
+
+
+def _record_rows(records: Iterable, fieldnames: list[str]) -> list[Row]:
+    """Records as value tuples in column order (columns are the field names)."""
+    if isinstance(records, RecordBatch):
+        return list(records.rows())
+    return list(map(attrgetter(*fieldnames), records))
+
 
-def _records_to_dicts(records: list) -> list[dict]:
+def _dict_rows(rows: Iterable[dict], fieldnames: list[str]) -> list[Row]:
+    return [[row.get(name, "") for name in fieldnames] for row in rows]
+
+
+def _records_to_dicts(records: Iterable) -> list[dict]:
     """Convert dataclass records to list of dicts with string values."""
+    names: list[str] | None = None
     result = []
     for r in records:
-        d = asdict(r)
-        # Ensure all values are strings for CSV
-        result.append({k: str(v) for k, v in d.items()})
+        if names is None:
+            names = [f.name for f in fields(r)]
+        result.append({name: str(getattr(r, name)) for name in names})
     return result
 
 
@@ -46,130 +77,443 @@ def _read_csv(path: Path, fieldnames: list[str]) -> list[dict]:
         return list(reader)
 
 
-def _write_csv(path: Path, rows: list[dict], fieldnames: list[str]) -> None:
-    """Write rows to CSV with LF line endings."""
+def _iter_rows(path: Path, fieldnames: list[str]) -> Iterator[Row]:
+    """Existing rows as lists of strings in ``fieldnames`` order, one at a time."""
+    if not path.exists():
+        return
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        if header == fieldnames:
+            yield from reader
+            return
+        # Columns in another order or missing: pick them by name
+        position = {name: i for i, name in enumerate(header)}
+        picks = [position.get(name) for name in fieldnames]
+        for row in reader:
+            yield [row[i] if i is not None and i < len(row) else "" for i in picks]
+
+
+def _read_rows(path: Path, fieldnames: list[str]) -> list[Row]:
+    """Existing rows as lists of strings in ``fieldnames`` order. Empty if missing."""
+    return list(_iter_rows(path, fieldnames))
+
+
+def _writer(f: TextIO, fieldnames: list[str]) -> csv.DictWriter:
+    return csv.DictWriter(
+        f, fieldnames=fieldnames, quoting=csv.QUOTE_MINIMAL, lineterminator="\n",
+    )
+
+
+@contextmanager
+def atomic_write(path: Path) -> Iterator[TextIO]:
+    """Open ``path`` for writing through a temp file that replaces it.
+
+    The file is swapped in only once fully written and synced, so a crash
+    or error mid-write leaves the previous file intact.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(
-            f, fieldnames=fieldnames, quoting=csv.QUOTE_MINIMAL,
-            lineterminator="\n",
-        )
-        writer.writeheader()
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    tmp.replace(path)
+
+
+def _write_csv(path: Path, rows: Iterable[Row], fieldnames: list[str]) -> None:
+    """Write rows (values in column order) to CSV with LF line endings."""
+    with atomic_write(path) as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator="\n")
+        writer.writerow(fieldnames)
         writer.writerows(rows)
 
 
+def _as_int(value: object) -> int:
+    try:
+        return int(value)  # type: ignore[call-overload]
+    except (ValueError, TypeError):
+        return 0
+
+
+def _sort_key(fieldnames: list[str], sort_columns: list[str]) -> Callable[[Row], tuple]:
+    """Sort key of a row: sort_columns, numeric ones compared as numbers."""
+    parts = [(fieldnames.index(col), col in NUMERIC_COLUMNS) for col in sort_columns]
+
+    def key(row: Row) -> tuple:
+        return tuple(_as_int(row[i]) if numeric else row[i] for i, numeric in parts)
+
+    return key
+
+
 def _sort_rows(rows: list[dict], sort_columns: list[str]) -> list[dict]:
-    """Sort rows by sort_columns. Numeric columns sorted as numbers."""
-    numeric_cols = {"day", "bout_no", "rid", "source_row_index", "east_rid", "west_rid"}
+    """Sort dict rows by sort_columns. Numeric columns sorted as numbers."""
 
     def sort_key(row: dict) -> tuple:
-        parts = []
-        for col in sort_columns:
-            val = row.get(col, "")
-            if col in numeric_cols:
-                try:
-                    parts.append(int(val))
-                except (ValueError, TypeError):
-                    parts.append(0)
-            else:
-                parts.append(val)
-        return tuple(parts)
+        return tuple(
+            _as_int(row.get(col, "")) if col in NUMERIC_COLUMNS else row.get(col, "")
+            for col in sort_columns
+        )
 
     return sorted(rows, key=sort_key)
 
 
-def upsert(
+def _upsert_rows(
     csv_path: Path,
-    new_records: list[dict],
+    new_rows: list[Row],
     key_columns: list[str],
     sort_columns: list[str],
     fieldnames: list[str],
 ) -> None:
-    """Read existing CSV, upsert new records by key, write sorted output."""
-    existing = _read_csv(csv_path, fieldnames)
+    positions = [fieldnames.index(k) for k in key_columns]
 
-    # Build dict keyed by key tuple
-    indexed: dict[tuple, dict] = {}
-    for row in existing:
-        key = tuple(str(row.get(k, "")) for k in key_columns)
-        indexed[key] = row
+    def key(row: Row) -> tuple:
+        # Read rows hold strings, record rows ints: compare as text
+        return tuple(str(row[i]) for i in positions)
 
-    # Upsert
-    for row in new_records:
-        key = tuple(str(row.get(k, "")) for k in key_columns)
-        indexed[key] = row
+    indexed = {key(row): row for row in _read_rows(csv_path, fieldnames)}
+    for row in new_rows:
+        indexed[key(row)] = row
 
-    rows = list(indexed.values())
-    rows = _sort_rows(rows, sort_columns)
+    rows = sorted(indexed.values(), key=_sort_key(fieldnames, sort_columns))
     _write_csv(csv_path, rows, fieldnames)
     logger.info("Upserted %d new records -> %d total rows in %s",
-                len(new_records), len(rows), csv_path)
+                len(new_rows), len(rows), csv_path)
 
 
-def force_replace(
+def _replace_rows(
     csv_path: Path,
-    new_records: list[dict],
+    new_rows: list[Row],
     filter_column: str,
-    filter_value: str,
+    filter_value: str | Collection[str],
     sort_columns: list[str],
     fieldnames: list[str],
 ) -> None:
-    """Remove rows matching filter, add new records, write sorted output."""
-    existing = _read_csv(csv_path, fieldnames)
+    existing = _read_rows(csv_path, fieldnames)
+    values = {filter_value} if isinstance(filter_value, str) else set(filter_value)
+    position = fieldnames.index(filter_column)
 
-    # Remove matching rows
-    kept = [r for r in existing if str(r.get(filter_column, "")) != filter_value]
+    kept = [r for r in existing if r[position] not in values]
     removed = len(existing) - len(kept)
 
-    # Add new
-    kept.extend(new_records)
-    kept = _sort_rows(kept, sort_columns)
+    kept.extend(new_rows)
+    kept.sort(key=_sort_key(fieldnames, sort_columns))
     _write_csv(csv_path, kept, fieldnames)
     logger.info(
         "Force replaced: removed %d, added %d -> %d total rows in %s",
-        removed, len(new_records), len(kept), csv_path,
+        removed, len(new_rows), len(kept), csv_path,
+    )
+
+
+def upsert(
+    csv_path: Path,
+    new_records: list[dict],
+    key_columns: list[str],
+    sort_columns: list[str],
+    fieldnames: list[str],
+) -> None:
+    """Read existing CSV, upsert new records by key, write sorted output."""
+    _upsert_rows(
+        csv_path, _dict_rows(new_records, fieldnames), key_columns, sort_columns, fieldnames,
     )
 
 
-def write_fact_csv(records: list[BoutRecord], path: Path) -> None:
+def force_replace(
+    csv_path: Path,
+    new_records: list[dict],
+    filter_column: str,
+    filter_value: str | Collection[str],
+    sort_columns: list[str],
+    fieldnames: list[str],
+) -> None:
+    """Remove rows matching filter, add new records, write sorted output.
+
+    ``filter_value`` may be a collection to replace several events at once.
+    """
+    _replace_rows(
+        csv_path, _dict_rows(new_records, fieldnames),
+        filter_column, filter_value, sort_columns, fieldnames,
+    )
+
+
+def write_fact_csv(records: Iterable[BoutRecord], path: Path) -> None:
     """Write fact_bout_daily.csv from scratch."""
-    rows = _records_to_dicts(records)
-    rows = _sort_rows(rows, FACT_SORT_COLUMNS)
+    rows = _record_rows(records, FACT_COLUMNS)
+    rows.sort(key=_sort_key(FACT_COLUMNS, FACT_SORT_COLUMNS))
     _write_csv(path, rows, FACT_COLUMNS)
     logger.info("Wrote %d fact rows to %s", len(rows), path)
 
 
-def write_dim_shikona_csv(records: list[ShikonaRecord], path: Path) -> None:
+def write_dim_shikona_csv(records: Iterable[ShikonaRecord], path: Path) -> None:
     """Write dim_shikona_by_basho.csv from scratch."""
-    rows = _records_to_dicts(records)
-    rows = _sort_rows(rows, DIM_SORT_COLUMNS)
+    rows = _record_rows(records, DIM_SHIKONA_COLUMNS)
+    rows.sort(key=_sort_key(DIM_SHIKONA_COLUMNS, DIM_SORT_COLUMNS))
     _write_csv(path, rows, DIM_SHIKONA_COLUMNS)
     logger.info("Wrote %d dim_shikona rows to %s", len(rows), path)
 
 
 def update_fact_csv(
-    new_records: list[BoutRecord],
+    new_records: Iterable[BoutRecord],
     path: Path,
     force: bool,
     event_id: str,
 ) -> None:
     """Update fact CSV with upsert or force replace."""
-    rows = _records_to_dicts(new_records)
+    rows = _record_rows(new_records, FACT_COLUMNS)
     if force:
-        force_replace(path, rows, "event_id", event_id, FACT_SORT_COLUMNS, FACT_COLUMNS)
+        _replace_rows(path, rows, "event_id", event_id, FACT_SORT_COLUMNS, FACT_COLUMNS)
     else:
-        upsert(path, rows, FACT_KEY_COLUMNS, FACT_SORT_COLUMNS, FACT_COLUMNS)
+        _upsert_rows(path, rows, FACT_KEY_COLUMNS, FACT_SORT_COLUMNS, FACT_COLUMNS)
 
 
 def update_dim_shikona_csv(
-    new_records: list[ShikonaRecord],
+    new_records: Iterable[ShikonaRecord],
     path: Path,
     force: bool,
     basho: str,
 ) -> None:
     """Update dim_shikona CSV with upsert or force replace."""
-    rows = _records_to_dicts(new_records)
+    rows = _record_rows(new_records, DIM_SHIKONA_COLUMNS)
+    if force:
+        _replace_rows(path, rows, "basho", basho, DIM_SORT_COLUMNS, DIM_SHIKONA_COLUMNS)
+    else:
+        _upsert_rows(path, rows, DIM_KEY_COLUMNS, DIM_SORT_COLUMNS, DIM_SHIKONA_COLUMNS)
+
+
+def update_fact_csv_batch(
+    records_by_event: Mapping[str, Iterable[BoutRecord]],
+    path: Path,
+    force: bool,
+) -> None:
+    """Update fact CSV for many events with a single read and write.
+
+    Each event's records may be a RecordBatch or any iterable (e.g. a
+    parse stream); they are consumed once.
+    """
+    rows: list[Row] = []
+    for records in records_by_event.values():
+        rows.extend(_record_rows(records, FACT_COLUMNS))
+    if force:
+        _replace_rows(
+            path, rows, "event_id", records_by_event, FACT_SORT_COLUMNS, FACT_COLUMNS,
+        )
+    else:
+        _upsert_rows(path, rows, FACT_KEY_COLUMNS, FACT_SORT_COLUMNS, FACT_COLUMNS)
+
+
+def _is_sorted(path: Path, fieldnames: list[str], sort_columns: list[str]) -> bool:
+    key = _sort_key(fieldnames, sort_columns)
+    previous = None
+    for row in _iter_rows(path, fieldnames):
+        current = key(row)
+        if previous is not None and current < previous:
+            return False
+        previous = current
+    return True
+
+
+def merge_fact_csv(
+    groups: Iterable[Mapping[str, Iterable[BoutRecord]]],
+    path: Path,
+    force: bool,
+) -> None:
+    """update_fact_csv_batch() for events that arrive a group at a time.
+
+    ``groups`` (e.g. one per basho) must come in event_id order. The
+    existing CSV is copied into the new one as they arrive, so only the
+    rows of the events at hand are held, never the whole table or run.
+    Nothing is written if every group is empty. A CSV that is not sorted
+    (edited by hand) falls back to update_fact_csv_batch() over all groups.
+    """
+    if not _is_sorted(path, FACT_COLUMNS, FACT_SORT_COLUMNS):
+        logger.warning("%s is not sorted; merging the whole run at once", path)
+        records_by_event: dict[str, Iterable[BoutRecord]] = {}
+        for group in groups:
+            records_by_event.update(group)
+        if records_by_event:
+            update_fact_csv_batch(records_by_event, path, force)
+        return
+
+    nonempty = (group for group in groups if group)
+    first = next(nonempty, None)
+    if first is None:
+        return
+    position = FACT_COLUMNS.index("event_id")
+    keys = [FACT_COLUMNS.index(k) for k in FACT_KEY_COLUMNS]
+    sort_key = _sort_key(FACT_COLUMNS, FACT_SORT_COLUMNS)
+    old = _iter_rows(path, FACT_COLUMNS)
+    pending = next(old, None)  # the first existing row not copied yet
+    last = ""
+    added = total = 0
+    with atomic_write(path) as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator="\n")
+        writer.writerow(FACT_COLUMNS)
+        for group in chain([first], nonempty):
+            for event_id in sorted(group):
+                if event_id <= last:
+                    raise ValueError(f"Event {event_id} arrived after {last}")
+                last = event_id
+                existing: list[Row] = []
+                while pending is not None and pending[position] <= event_id:
+                    if pending[position] == event_id:
+                        existing.append(pending)
+                    else:
+                        writer.writerow(pending)
+                        total += 1
+                    pending = next(old, None)
+                rows = _record_rows(group[event_id], FACT_COLUMNS)
+                added += len(rows)
+                if not force:
+                    # Read rows hold strings, record rows ints: compare as text
+                    indexed = {tuple(str(r[i]) for i in keys): r for r in existing}
+                    for row in rows:
+                        indexed[tuple(str(row[i]) for i in keys)] = row
+                    rows = list(indexed.values())
+                rows.sort(key=sort_key)
+                writer.writerows(rows)
+                total += len(rows)
+        while pending is not None:
+            writer.writerow(pending)
+            total += 1
+            pending = next(old, None)
+    logger.info(
+        "Merged %d new records (%s) -> %d total rows in %s",
+        added, "force" if force else "upsert", total, path,
+    )
+
+
+def update_dim_shikona_csv_batch(
+    records_by_basho: Mapping[str, Iterable[ShikonaRecord]],
+    path: Path,
+    force: bool,
+) -> None:
+    """Update dim_shikona CSV for many basho with a single read and write."""
+    rows: list[Row] = []
+    for records in records_by_basho.values():
+        rows.extend(_record_rows(records, DIM_SHIKONA_COLUMNS))
     if force:
-        force_replace(path, rows, "basho", basho, DIM_SORT_COLUMNS, DIM_SHIKONA_COLUMNS)
+        _replace_rows(
+            path, rows, "basho", records_by_basho, DIM_SORT_COLUMNS, DIM_SHIKONA_COLUMNS,
+        )
     else:
-        upsert(path, rows, DIM_KEY_COLUMNS, DIM_SORT_COLUMNS, DIM_SHIKONA_COLUMNS)
+        _upsert_rows(path, rows, DIM_KEY_COLUMNS, DIM_SORT_COLUMNS, DIM_SHIKONA_COLUMNS)
+
+
+def read_fact_rids(path: Path) -> set[int]:
+    """Distinct rikishi IDs appearing on either side of the fact table."""
+    rids: set[int] = set()
+    sides = [FACT_COLUMNS.index(col) for col in ("east_rid", "west_rid")]
+    for row in _read_rows(path, FACT_COLUMNS):
+        for i in sides:
+            try:
+                rids.add(int(row[i]))
+            except ValueError:
+                continue
+    rids.discard(0)  # no rikishi link (kyujo side)
+    return rids
+
+
+def read_dim_rikishi(path: Path) -> dict[int, dict]:
+    """Existing dim_rikishi rows keyed by rid. Empty dict if missing."""
+    return {int(row["rid"]): row for row in _read_csv(path, DIM_RIKISHI_COLUMNS)}
+
+
+def update_dim_rikishi_csv(new_records: list[RikishiRecord], path: Path) -> None:
+    """Upsert refreshed rikishi rows into dim_rikishi CSV."""
+    rows = _record_rows(new_records, DIM_RIKISHI_COLUMNS)
+    _upsert_rows(
+        path, rows, DIM_RIKISHI_KEY_COLUMNS, DIM_RIKISHI_KEY_COLUMNS, DIM_RIKISHI_COLUMNS,
+    )
+
+
+def read_fact_rows(path: Path, event_ids: Collection[str]) -> list[dict]:
+    """Existing fact rows of the given events."""
+    wanted = set(event_ids)
+    return [r for r in _read_csv(path, FACT_COLUMNS) if r.get("event_id") in wanted]
+
+
+def read_dim_shikona_bashos(path: Path) -> set[str]:
+    """Basho that already have rows in dim_shikona CSV."""
+    return {r["basho"] for r in _read_csv(path, DIM_SHIKONA_COLUMNS)}
+
+
+def replace_fact_days(
+    records_by_day: dict[tuple[str, int], list[BoutRecord]],
+    path: Path,
+) -> None:
+    """Replace every row of the given (event_id, day) pages with new records.
+
+    Unlike upsert, bouts dropped from a page (a changed schedule) disappear.
+    """
+    existing = _read_rows(path, FACT_COLUMNS)
+    event, day = FACT_COLUMNS.index("event_id"), FACT_COLUMNS.index("day")
+    kept = [r for r in existing if (r[event], _as_int(r[day])) not in records_by_day]
+    removed = len(existing) - len(kept)
+    new_rows: list[Row] = []
+    for records in records_by_day.values():
+        new_rows.extend(_record_rows(records, FACT_COLUMNS))
+    kept.extend(new_rows)
+    kept.sort(key=_sort_key(FACT_COLUMNS, FACT_SORT_COLUMNS))
+    _write_csv(path, kept, FACT_COLUMNS)
+    logger.info(
+        "Replaced %d pages: removed %d, added %d -> %d total rows in %s",
+        len(records_by_day), removed, len(new_rows), len(kept), path,
+    )
+
+
+class FactIndex:
+    """The fact table held in memory by a long-running process.
+
+    Rows of ``live_events`` are kept per (event_id, day) page and replaced
+    as pages change. When those events sort after every other event (the
+    usual case: the basho in progress is the newest), the other rows are
+    serialised once and flush() only re-serialises the live rows after
+    them; otherwise it sorts and serialises every row. Either way the
+    file is replaced through atomic_write() and never read again.
+    """
+
+    def __init__(self, path: Path, live_events: Collection[str]) -> None:
+        self.path = path
+        live = set(live_events)
+        rows = _sort_rows(_read_csv(path, FACT_COLUMNS), FACT_SORT_COLUMNS)
+        self._head = [r for r in rows if r.get("event_id") not in live]
+        self.pages: dict[tuple[str, int], list[dict]] = {}
+        for r in rows:
+            if r.get("event_id") in live:
+                self.pages.setdefault((r["event_id"], int(r["day"])), []).append(r)
+        self._tail_only = all(r.get("event_id", "") < min(live) for r in self._head)
+        self._head_text: str | None = None  # header and head rows, as written
+
+    def rows(self) -> list[dict]:
+        """Rows of the live events."""
+        return [r for rows in self.pages.values() for r in rows]
+
+    def replace_days(self, records_by_day: dict[tuple[str, int], list[BoutRecord]]) -> None:
+        for key, records in records_by_day.items():
+            self.pages[key] = _records_to_dicts(records)
+
+    def flush(self) -> None:
+        """Write the table; after the first write only the tail is re-serialised."""
+        tail = _sort_rows(self.rows(), FACT_SORT_COLUMNS)
+        if self._tail_only:
+            if self._head_text is None:
+                buffer = io.StringIO()
+                writer = _writer(buffer, FACT_COLUMNS)
+                writer.writeheader()
+                writer.writerows(self._head)
+                self._head_text = buffer.getvalue()
+            with atomic_write(self.path) as f:
+                f.write(self._head_text)
+                _writer(f, FACT_COLUMNS).writerows(tail)
+        else:
+            rows = _sort_rows(self._head + tail, FACT_SORT_COLUMNS)
+            _write_csv(self.path, _dict_rows(rows, FACT_COLUMNS), FACT_COLUMNS)
+        logger.info(
+            "Wrote %d rows (%d live) to %s", len(self._head) + len(tail), len(tail), self.path,
+        )
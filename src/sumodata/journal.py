@@ -0,0 +1,156 @@
+"""Durable run journal for resuming long fetch runs.
+
+Every (basho, page) unit moves through fetched -> parsed, and every basho
+through committed once its rows are in the CSVs. Parsed records are
+spooled next to the journal, so a resumed run skips pages it already
+parsed even when the raw cache was off. Journal lines are fsynced after
+the spool file they refer to, so a "parsed" entry always has its records.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from dataclasses import asdict
+from pathlib import Path
+
+from sumodata.util import SumodataError
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = "journal.jsonl"
+RUN_FILE = "run.json"
+SPOOL_DIR = "spool"
+
+# Page states, in order; "absent" marks a playoff page that does not exist
+STATES = ("fetched", "parsed", "absent")
+
+
+class JournalError(SumodataError):
+    """The journal cannot be used to resume this run."""
+
+
+class RunJournal:
+    """Page-level progress of one run, kept under ``directory``."""
+
+    def __init__(self, directory: Path, run: dict) -> None:
+        self.directory = directory
+        self.run = run
+        self._pages: dict[tuple[str, str], str] = {}
+        self._committed: set[str] = set()
+        self._lock = threading.Lock()
+        self._file = None
+
+    @classmethod
+    def open(cls, directory: Path, run: dict, resume: bool) -> "RunJournal":
+        """Start a journal for ``run``, or continue a matching one with ``resume``.
+
+        ``run`` describes the run (basho list and options affecting output);
+        resuming a journal written for a different run raises JournalError.
+        """
+        journal = cls(directory, run)
+        run_path = directory / RUN_FILE
+        if resume and run_path.exists():
+            stored = json.loads(run_path.read_text(encoding="utf-8"))
+            if stored != run:
+                raise JournalError(
+                    f"Journal in {directory} belongs to a different run "
+                    f"({stored}); rerun without --resume to start over"
+                )
+            journal._replay()
+            logger.info(
+                "Resuming: %d pages parsed, %d basho committed",
+                sum(1 for s in journal._pages.values() if s == "parsed"),
+                len(journal._committed),
+            )
+        else:
+            if resume:
+                logger.warning("No journal to resume in %s; starting over", directory)
+            elif run_path.exists():
+                logger.warning("Discarding the journal of an unfinished run in %s", directory)
+            shutil.rmtree(directory, ignore_errors=True)
+            directory.mkdir(parents=True)
+            run_path.write_text(json.dumps(run, sort_keys=True), encoding="utf-8")
+        journal._file = open(directory / JOURNAL_FILE, "a", encoding="utf-8")
+        return journal
+
+    def _replay(self) -> None:
+        path = self.directory / JOURNAL_FILE
+        if not path.exists():
+            return
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut short by the crash that stopped the run
+                logger.debug("Ignoring partial journal line: %r", line)
+                continue
+            if entry["state"] == "committed":
+                self._committed.add(entry["basho"])
+            else:
+                self._pages[(entry["basho"], entry["page"])] = entry["state"]
+
+    def _append(self, entry: dict) -> None:
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _spool_path(self, basho: str, page: str) -> Path:
+        return self.directory / SPOOL_DIR / basho / f"{page}.json"
+
+    def state(self, basho: str, page: str) -> str | None:
+        with self._lock:
+            return self._pages.get((basho, page))
+
+    def is_parsed(self, basho: str, page: str) -> bool:
+        return self.state(basho, page) == "parsed"
+
+    def is_committed(self, basho: str) -> bool:
+        with self._lock:
+            return basho in self._committed
+
+    def mark(self, basho: str, page: str, state: str) -> None:
+        if state not in STATES:
+            raise ValueError(f"Unknown page state: {state}")
+        self._append({"basho": basho, "page": page, "state": state})
+        with self._lock:
+            self._pages[(basho, page)] = state
+
+    def save_parsed(self, basho: str, page: str, records: list) -> None:
+        """Spool a page's records, then mark it parsed."""
+        path = self._spool_path(basho, page)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in records], f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(path)
+        self.mark(basho, page, "parsed")
+
+    def load_parsed(self, basho: str, page: str, record_type: type) -> list:
+        path = self._spool_path(basho, page)
+        try:
+            rows = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            raise JournalError(f"Spooled records for {basho}/{page} unreadable: {e}") from e
+        return [record_type(**row) for row in rows]
+
+    def mark_committed(self, bashos: list[str]) -> None:
+        for basho in bashos:
+            self._append({"basho": basho, "state": "committed"})
+        with self._lock:
+            self._committed.update(bashos)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def finish(self) -> None:
+        """Remove the journal once every basho of the run is committed."""
+        self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+        logger.info("Run complete; removed journal %s", self.directory)
@@ -0,0 +1,329 @@
+"""Incremental update of a basho in progress.
+
+Results pages appear one day at a time and keep changing until the last
+bout of the day is decided. Live mode asks the fact table which days are
+already final, fetches only the remaining days that the daytable says are
+published, and replaces just those days' rows. Such pages bypass the raw
+cache on the way in and are stored only once every bout has a result, so
+a partial page is never served later as the final one.
+
+watch() repeats this in one long-lived process: page validators, parsed
+pages and the fact table stay in memory, polls are conditional requests,
+and the CSV is written only when a page actually changed.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import astuple, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sumodata.fetch import banzuke_url, cache_page, fetch_fresh, fetch_with_cache
+from sumodata.fact_store import FactStore
+from sumodata.io_csv import (
+    FactIndex,
+    read_dim_shikona_bashos,
+    read_fact_rows,
+    replace_fact_days,
+    update_dim_shikona_csv,
+)
+from sumodata.metrics import get_metrics
+from sumodata.models import BoutRecord
+from sumodata.parsers import get_parser
+from sumodata.pipeline import (
+    DAYS,
+    PLAYOFF_DAY,
+    day_bouts,
+    event_id_for,
+    page_cache_path,
+    page_url,
+)
+from sumodata.util import SumodataError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 300  # seconds between polls
+
+
+@dataclass
+class LiveResult:
+    """What one live update fetched and wrote."""
+
+    basho: str
+    fetched: list[int] = field(default_factory=list)  # days fetched (16 = playoff)
+    final: list[int] = field(default_factory=list)  # days final after this update
+    bouts: int = 0
+    shikona: int = 0
+
+
+@dataclass
+class DayPage:
+    """Last seen state of one Results day, with its HTTP validators."""
+
+    records: list[BoutRecord]
+    published: set[int]  # days linked from the page's daytable
+    playoff: bool  # the page links a playoff
+    etag: str = ""
+    last_modified: str = ""
+
+    @property
+    def final(self) -> bool:
+        return is_final(self.records)
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def is_final(records: list[BoutRecord]) -> bool:
+    """A day is final once it has bouts and every one of them has a result."""
+    return bool(records) and all(r.result_type != "unknown" for r in records)
+
+
+def live_event_ids(basho: str) -> list[str]:
+    return [event_id_for(basho), event_id_for(basho, True)]
+
+
+def final_days_of(rows: list[dict]) -> set[int]:
+    """Days (16 = playoff) among fact ``rows`` that have no 'unknown' result."""
+    status: dict[int, bool] = {}
+    for row in rows:
+        day = int(row["day"])
+        status[day] = status.get(day, True) and row["result_type"] != "unknown"
+    return {day for day, final in status.items() if final}
+
+
+def final_days(fact_path: Path, basho: str) -> set[int]:
+    """Days of ``basho`` (16 = playoff) whose rows in the fact table are final."""
+    path = FactStore(fact_path).path_for(basho)
+    return final_days_of(read_fact_rows(path, live_event_ids(basho)))
+
+
+def _bouts_key(records: list[BoutRecord]) -> list[tuple]:
+    """Records without fetched_at (the last field), which every fetch changes."""
+    return [astuple(r)[:-1] for r in records]
+
+
+class LiveBasho:
+    """Walks the days of a basho in progress, keeping page state between polls.
+
+    A one-shot update (--live) polls once. The watch daemon keeps the
+    instance alive, so later polls send conditional requests and skip
+    pages the server reports unchanged.
+    """
+
+    def __init__(
+        self,
+        basho: str,
+        raw_dir: Path,
+        use_cache: bool,
+        final: set[int],
+        playoff: bool = True,
+    ) -> None:
+        self.basho = basho
+        self.raw_dir = raw_dir
+        self.use_cache = use_cache
+        self.final = set(final)
+        self.playoff = playoff
+        self.pages: dict[int, DayPage] = {}
+        # Changed pages not yet written; kept across polls until written()
+        self.pending: dict[tuple[str, int], list[BoutRecord]] = {}
+        self.fetched: list[int] = []
+        self.no_playoff = False  # day 15 is final and links no playoff
+
+    @property
+    def complete(self) -> bool:
+        """Every day is final, and so is the playoff if there is one."""
+        if any(day not in self.final for day in range(1, DAYS + 1)):
+            return False
+        return not self.playoff or self.no_playoff or PLAYOFF_DAY in self.final
+
+    def _fetch_day(self, day: int) -> tuple[DayPage, bool]:
+        """Return the day's page and whether its bouts changed."""
+        url = page_url(self.basho, day)
+        previous = self.pages.get(day)
+        metrics = get_metrics()
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        with metrics.phase("fetch"):
+            result = fetch_fresh(url, previous.conditional_headers() if previous else None)
+        self.fetched.append(day)
+        if result.status == 304 and previous is not None:
+            logger.debug("%s day %d: not modified", self.basho, day)
+            return previous, False
+        with metrics.phase("parse"):
+            parsed = get_parser().read_results_page(result.text)
+            records = day_bouts(parsed, self.basho, day, fetched_at)
+            page = DayPage(
+                records,
+                parsed.published_days(self.basho),
+                day == DAYS and parsed.has_playoff(self.basho),
+                result.etag,
+                result.last_modified,
+            )
+        self.pages[day] = page
+        if self.use_cache and page.final:
+            cache_page(page_cache_path(self.raw_dir, self.basho, day), url, result)
+        return page, previous is None or _bouts_key(previous.records) != _bouts_key(records)
+
+    def poll(self) -> dict[tuple[str, int], list[BoutRecord]]:
+        """Fetch the days that may have changed; return the changed pages.
+
+        Days are walked in order from the first one that is not final. Each
+        page's daytable decides whether the next day is worth a request; a
+        page without bouts (schedule not out yet) ends the walk.
+
+        Pages changed by an earlier poll are returned again until written()
+        is called, so a day made final by a poll that failed later on is
+        not lost.
+        """
+        self.fetched = []
+        changed = self.pending
+        for day in range(1, DAYS + 1):
+            if day in self.final:
+                continue
+            page, modified = self._fetch_day(day)
+            if not page.records:
+                logger.info("%s day %d: not published yet", self.basho, day)
+                break
+            if modified:
+                changed[(event_id_for(self.basho), day)] = page.records
+                logger.info(
+                    "%s day %d: %d bouts (%s)", self.basho, day, len(page.records),
+                    "final" if page.final else "in progress",
+                )
+            if page.final:
+                self.final.add(day)
+            if page.published and day + 1 not in page.published:
+                break
+
+        if self.playoff and DAYS in self.final and not self.complete:
+            if self._playoff_linked():
+                page, modified = self._fetch_day(PLAYOFF_DAY)
+                if page.records and modified:
+                    changed[(event_id_for(self.basho, True), PLAYOFF_DAY)] = page.records
+                if page.final:
+                    self.final.add(PLAYOFF_DAY)
+            else:
+                logger.info("No playoff detected for basho %s", self.basho)
+                self.no_playoff = True
+        return dict(changed)
+
+    def written(self) -> None:
+        """The pages returned by the last poll are on disk."""
+        self.pending = {}
+
+    def _playoff_linked(self) -> bool:
+        page = self.pages.get(DAYS)
+        if page is not None:
+            return page.playoff
+        # Day 15 was final before this process started, so it is cached
+        html = fetch_with_cache(
+            page_url(self.basho, DAYS),
+            page_cache_path(self.raw_dir, self.basho, DAYS),
+            self.use_cache,
+        )
+        return get_parser().detect_playoff(html, self.basho)
+
+
+def update_banzuke(basho: str, raw_dir: Path, dim_path: Path, use_cache: bool) -> int:
+    """Fetch the banzuke until it has rows; it does not change once published."""
+    url = banzuke_url(basho)
+    metrics = get_metrics()
+    with metrics.phase("fetch"):
+        result = fetch_fresh(url)
+    with metrics.phase("parse"):
+        shikona = get_parser().parse_banzuke_page(result.text, basho, url)
+    if shikona:
+        if use_cache:
+            cache_page(page_cache_path(raw_dir, basho, None), url, result)
+        with metrics.phase("write"):
+            update_dim_shikona_csv(shikona, dim_path, False, basho)
+    return len(shikona)
+
+
+def update_live(
+    basho: str,
+    raw_dir: Path,
+    fact_path: Path,
+    dim_path: Path,
+    use_cache: bool,
+    playoff: bool = True,
+) -> LiveResult:
+    """Fetch the published days of ``basho`` that are not final yet and write them."""
+    live = LiveBasho(basho, raw_dir, use_cache, final_days(fact_path, basho), playoff)
+    pages = live.poll()
+    result = LiveResult(basho, fetched=live.fetched, final=sorted(live.final))
+    if pages:
+        fact = FactStore(fact_path)
+        with get_metrics().phase("write"):
+            replace_fact_days(pages, fact.path_for(basho))
+            fact.commit([basho])
+        result.bouts = sum(len(v) for v in pages.values())
+
+    if basho not in read_dim_shikona_bashos(dim_path):
+        result.shikona = update_banzuke(basho, raw_dir, dim_path, use_cache)
+    return result
+
+
+def watch(
+    basho: str,
+    raw_dir: Path,
+    fact_path: Path,
+    dim_path: Path,
+    use_cache: bool,
+    interval: float = DEFAULT_INTERVAL,
+    playoff: bool = True,
+    max_polls: int | None = None,
+    on_poll: Callable[[int], None] | None = None,
+) -> int:
+    """Poll ``basho`` every ``interval`` seconds until it is complete.
+
+    The fact table is read once; each poll applies only the changed pages
+    to it and writes them out. A failed fetch, parse or write is logged
+    and retried at the next poll, and the watch does not stop while
+    changed pages are unwritten. ``on_poll`` is called with the poll
+    number after each poll. Returns the number of polls made.
+    """
+    fact = FactStore(fact_path)
+    index = FactIndex(fact.path_for(basho), live_event_ids(basho))
+    live = LiveBasho(basho, raw_dir, use_cache, final_days_of(index.rows()), playoff)
+    need_banzuke = basho not in read_dim_shikona_bashos(dim_path)
+    logger.info(
+        "Watching basho %s every %gs (final days: %s)",
+        basho, interval, ", ".join(map(str, sorted(live.final))) or "none",
+    )
+    polls = 0
+    while True:
+        polls += 1
+        try:
+            changed = live.poll()
+            if changed:
+                index.replace_days(changed)
+                with get_metrics().phase("write"):
+                    index.flush()
+                    fact.commit([basho])
+                live.written()
+            if need_banzuke:
+                need_banzuke = update_banzuke(basho, raw_dir, dim_path, use_cache) == 0
+        except (SumodataError, OSError) as e:
+            # A fetch or parse error, a half-rendered page or a failed write
+            # must not end a watch meant to run for days
+            logger.warning("Poll %d failed, retrying next poll: %s", polls, e)
+        else:
+            logger.info(
+                "Poll %d: requested days %s, %d pages changed",
+                polls, ", ".join(map(str, live.fetched)) or "none", len(changed),
+            )
+        if on_poll is not None:
+            on_poll(polls)
+        if live.complete and not live.pending:
+            logger.info("Basho %s is complete; stopping", basho)
+            return polls
+        if max_polls is not None and polls >= max_polls:
+            return polls
+        time.sleep(interval)
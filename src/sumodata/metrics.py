@@ -0,0 +1,201 @@
+"""Per-run fetch metrics, exportable as JSON or a Prometheus textfile.
+
+Answers where a run's time went: network (request latency), politeness
+(rate-limit waits and retry backoff) or the parse/write phases timed by
+cli.main.
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from sumodata.cache_manager import OUTCOMES
+
+# Upper bounds in seconds; an implicit +Inf bucket follows
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PREFIX = "sumodata_"
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(le, count) pairs including +Inf."""
+        result = []
+        total = 0
+        for bound, n in zip((*self.buckets, float("inf")), self.counts):
+            total += n
+            result.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return result
+
+
+class FetchMetrics:
+    """Counters for one run; fetch and cli record into get_metrics()."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency = Histogram()
+            self.responses: dict[str, int] = {}  # status code or "error"
+            self.bytes_downloaded = 0
+            self.retries = 0
+            self.backoff_seconds = 0.0
+            self.rate_wait_seconds = 0.0
+            self.cache = dict.fromkeys(OUTCOMES, 0)
+            self.parse_cache = {"hit": 0, "miss": 0}
+            self.phase_seconds: dict[str, float] = {}
+
+    def record_response(self, status: int | str, latency: float, size: int = 0) -> None:
+        with self._lock:
+            self.latency.observe(latency)
+            key = str(status)
+            self.responses[key] = self.responses.get(key, 0) + 1
+            self.bytes_downloaded += size
+
+    def record_backoff(self, seconds: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.backoff_seconds += seconds
+
+    def record_rate_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.rate_wait_seconds += seconds
+
+    def record_cache(self, outcome: str) -> None:
+        with self._lock:
+            self.cache[outcome] += 1
+
+    def record_parse_cache(self, outcome: str) -> None:
+        with self._lock:
+            self.parse_cache[outcome] += 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to phase ``name``."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + elapsed
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            lookups = sum(self.cache.values())
+            return {
+                "requests": self.latency.count,
+                "responses": dict(self.responses),
+                "latency_seconds": {
+                    "sum": round(self.latency.sum, 6),
+                    "count": self.latency.count,
+                    "buckets": dict(self.latency.cumulative()),
+                },
+                "bytes_downloaded": self.bytes_downloaded,
+                "retries": self.retries,
+                "backoff_seconds": round(self.backoff_seconds, 6),
+                "rate_wait_seconds": round(self.rate_wait_seconds, 6),
+                "cache": dict(self.cache),
+                "cache_hit_rate": (
+                    (self.cache["hit"] + self.cache["not_modified"]) / lookups
+                    if lookups else None
+                ),
+                "parse_cache": dict(self.parse_cache),
+                "phase_seconds": {
+                    k: round(v, 6) for k, v in self.phase_seconds.items()
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format, for node_exporter's textfile collector."""
+        data = self.to_dict()
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {PREFIX}{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{PREFIX}{name}{labels} {_format_value(value)}")
+
+        latency = data["latency_seconds"]
+        lines.append(f"# HELP {PREFIX}request_latency_seconds HTTP request latency.")
+        lines.append(f"# TYPE {PREFIX}request_latency_seconds histogram")
+        for le, n in latency["buckets"].items():
+            lines.append(f'{PREFIX}request_latency_seconds_bucket{{le="{le}"}} {n}')
+        lines.append(f"{PREFIX}request_latency_seconds_sum {latency['sum']:g}")
+        lines.append(f"{PREFIX}request_latency_seconds_count {latency['count']}")
+
+        metric("http_responses_total", "counter", "HTTP responses by status.", [
+            (f'{{status="{status}"}}', n) for status, n in sorted(data["responses"].items())
+        ])
+        metric("downloaded_bytes_total", "counter", "Response body bytes downloaded.", [
+            ("", data["bytes_downloaded"]),
+        ])
+        metric("retries_total", "counter", "Request attempts retried after a failure.", [
+            ("", data["retries"]),
+        ])
+        metric("backoff_seconds_total", "counter", "Time slept before retries.", [
+            ("", data["backoff_seconds"]),
+        ])
+        metric("rate_wait_seconds_total", "counter", "Time waited for the request budget.", [
+            ("", data["rate_wait_seconds"]),
+        ])
+        metric("cache_lookups_total", "counter", "Raw cache lookups by outcome.", [
+            (f'{{outcome="{o}"}}', n) for o, n in data["cache"].items()
+        ])
+        metric("parse_cache_lookups_total", "counter", "Parsed-record cache lookups by outcome.", [
+            (f'{{outcome="{o}"}}', n) for o, n in data["parse_cache"].items()
+        ])
+        metric("phase_seconds", "gauge", "Wall time per pipeline phase.", [
+            (f'{{phase="{p}"}}', s) for p, s in data["phase_seconds"].items()
+        ])
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: Path) -> None:
+        _write_atomic(path, json.dumps(self.to_dict(), indent=2) + "\n")
+
+    def write_prometheus(self, path: Path) -> None:
+        _write_atomic(path, self.to_prometheus())
+
+
+def _format_value(value: float) -> str:
+    # Counters are exact; ":g" would turn 12345678 bytes into 1.23457e+07
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # The textfile collector may read at any moment; never expose a partial file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+_metrics = FetchMetrics()
+
+
+def get_metrics() -> FetchMetrics:
+    """Metrics for the current process."""
+    return _metrics
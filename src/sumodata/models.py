@@ -1,9 +1,13 @@
-"""Data models."""
+"""Data models.
+
+Records are slotted: a history's worth of them is held in memory at once.
+For more rows than that, see batch.RecordBatch.
+"""
 
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class BoutRecord:
     event_id: str
     event_type: str  # honbasho_regular / honbasho_playoff
@@ -25,7 +29,7 @@ class BoutRecord:
     fetched_at: str  # ISO format
 
 
-@dataclass
+@dataclass(slots=True)
 class ShikonaRecord:
     basho: str
     rid: int
@@ -35,7 +39,7 @@ class ShikonaRecord:
     rank: str
 
 
-@dataclass
+@dataclass(slots=True)
 class RikishiRecord:
     rid: int
     current_shikona: str
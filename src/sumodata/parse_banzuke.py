@@ -6,10 +6,11 @@ import re
 from bs4 import BeautifulSoup, Tag
 
 from sumodata.models import ShikonaRecord
+from sumodata.soup import PageFilter
 
 logger = logging.getLogger(__name__)
 
-_RID_PATTERN = re.compile(r"Rikishi\.aspx\?r=(\d+)")
+RID_PATTERN = re.compile(r"Rikishi\.aspx\?r=(\d+)")
 
 # Caption text -> division name
 _CAPTION_MAP = {
@@ -24,36 +25,29 @@ _CAPTION_MAP = {
 # Skip these divisions
 _SKIP_DIVISIONS = {"Mae-zumo", "Banzuke-gai"}
 
+BANZUKE_FILTER = PageFilter(("banzuke",))
+
 
 def parse_banzuke_page(
     html: str,
     basho: str,
     source_url: str,
+    strained: bool = True,
 ) -> list[ShikonaRecord]:
-    """Parse a Banzuke page and return ShikonaRecords."""
-    soup = BeautifulSoup(html, "html.parser")
+    """Parse a Banzuke page and return ShikonaRecords.
+
+    Only the banzuke tables are built unless ``strained`` is off.
+    """
+    soup = BeautifulSoup(html, "html.parser", parse_only=BANZUKE_FILTER if strained else None)
     records: list[ShikonaRecord] = []
 
     for table in soup.find_all("table", class_="banzuke"):
         caption = table.find("caption")
         if not caption:
             continue
-        caption_text = caption.get_text(strip=True)
-
-        # Skip non-standard divisions
-        if any(skip in caption_text for skip in _SKIP_DIVISIONS):
-            continue
-
-        division = _CAPTION_MAP.get(caption_text, "")
+        division = caption_division(caption.get_text(strip=True))
         if not division:
-            # Try partial match
-            for key, val in _CAPTION_MAP.items():
-                if val in caption_text:
-                    division = val
-                    break
-            if not division:
-                logger.debug("Skipping unknown banzuke table: %s", caption_text)
-                continue
+            continue
 
         tbody = table.find("tbody")
         if not tbody:
@@ -86,36 +80,44 @@ def parse_banzuke_page(
     return records
 
 
-def _extract_rikishi(
-    cell: Tag,
-    side: str,  # "e" or "w"
+def caption_division(caption_text: str) -> str:
+    """Division of a banzuke table caption ('' for tables to skip)."""
+    # Skip non-standard divisions
+    if any(skip in caption_text for skip in _SKIP_DIVISIONS):
+        return ""
+
+    division = _CAPTION_MAP.get(caption_text, "")
+    if not division:
+        # Try partial match
+        for val in _CAPTION_MAP.values():
+            if val in caption_text:
+                return val
+        logger.debug("Skipping unknown banzuke table: %s", caption_text)
+    return division
+
+
+def shikona_record(
+    href: str,
+    title: str,
+    link_text: str,
+    side: str,
     rank_text: str,
     division: str,
     basho: str,
     source_url: str,
 ) -> ShikonaRecord | None:
-    """Extract a rikishi from a shikona cell."""
-    # Skip empty cells
-    if "emptycell" in cell.get("class", []):
-        return None
-
-    link = cell.find("a", href=_RID_PATTERN)
-    if not link:
-        return None
-
-    # Extract rid
-    m = _RID_PATTERN.search(link["href"])
+    """Build a ShikonaRecord from a shikona link's href, title and text."""
+    m = RID_PATTERN.search(href)
     if not m:
         return None
     rid = int(m.group(1))
 
-    # Extract shikona: title attribute first field (Japanese name), fallback to link text
+    # Shikona: title attribute first field (Japanese name), fallback to link text
     shikona = ""
-    title = link.get("title", "")
     if title:
         shikona = title.split(",")[0].strip()
     if not shikona:
-        shikona = link.get_text(strip=True)
+        shikona = link_text
 
     # Construct full rank
     rank = f"{rank_text}{side}" if rank_text else ""
@@ -128,3 +130,26 @@ def _extract_rikishi(
         division=division,
         rank=rank,
     )
+
+
+def _extract_rikishi(
+    cell: Tag,
+    side: str,  # "e" or "w"
+    rank_text: str,
+    division: str,
+    basho: str,
+    source_url: str,
+) -> ShikonaRecord | None:
+    """Extract a rikishi from a shikona cell."""
+    # Skip empty cells
+    if "emptycell" in cell.get("class", []):
+        return None
+
+    link = cell.find("a", href=RID_PATTERN)
+    if not link:
+        return None
+
+    return shikona_record(
+        link["href"], link.get("title", ""), link.get_text(strip=True),
+        side, rank_text, division, basho, source_url,
+    )
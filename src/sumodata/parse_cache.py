@@ -0,0 +1,84 @@
+"""Cache of parsed page records, keyed by page content and parser version.
+
+A warm raw cache still leaves every run parsing every page. This cache
+keeps the records each page parsed to, as columns (see pipeline._pack)
+serialized with marshal and compressed with zlib, under a key hashing the
+HTML together with whatever else the records depend on (basho, day, base
+URL). A hit skips the HTML parser entirely.
+
+Entries live under ``<directory>/v<PARSER_VERSION>/``; bump PARSER_VERSION
+whenever a parser change alters the records built from the same HTML.
+Directories of other versions are removed when the cache is opened.
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import re
+import shutil
+import zlib
+from pathlib import Path
+
+from sumodata.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+PARSER_VERSION = 1
+
+_VERSION_DIR = re.compile(r"v\d+")
+
+
+class ParseCache:
+    """Parsed records by page key; missing or unreadable entries are misses."""
+
+    def __init__(self, directory: Path) -> None:
+        self.root = directory
+        self.directory = directory / f"v{PARSER_VERSION}"
+
+    @classmethod
+    def open(cls, directory: Path) -> "ParseCache":
+        """Use ``directory``, dropping entries written by other parser versions."""
+        cache = cls(directory)
+        if directory.is_dir():
+            for old in directory.iterdir():
+                if old != cache.directory and _VERSION_DIR.fullmatch(old.name):
+                    logger.info("Removing parse cache of another parser version: %s", old)
+                    shutil.rmtree(old, ignore_errors=True)
+        return cache
+
+    @staticmethod
+    def key(html: str, *context: object) -> str:
+        """Key of the records built from ``html`` given ``context``."""
+        digest = hashlib.sha256(
+            f"{PARSER_VERSION}:{marshal.version}:{context!r}\n".encode("utf-8"),
+        )
+        digest.update(html.encode("utf-8"))
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.bin"
+
+    def get(self, key: str) -> object | None:
+        metrics = get_metrics()
+        try:
+            data = self.path(key).read_bytes()
+        except FileNotFoundError:
+            metrics.record_parse_cache("miss")
+            return None
+        try:
+            value = marshal.loads(zlib.decompress(data))
+        except (zlib.error, ValueError, EOFError, TypeError) as e:
+            logger.warning("Ignoring unreadable parse cache entry %s: %s", key, e)
+            metrics.record_parse_cache("miss")
+            return None
+        metrics.record_parse_cache("hit")
+        return value
+
+    def put(self, key: str, value: object) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Concurrent runs may write the same key; each uses its own tmp file
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(zlib.compress(marshal.dumps(value)))
+        tmp.replace(path)
@@ -0,0 +1,260 @@
+"""lxml implementations of the Results and Banzuke parsers.
+
+These read the same cells as parse_results / parse_banzuke and hand the
+values to their shared builders, so the records are identical; only the
+tree walk runs in C. Requires the optional ``lxml`` package.
+"""
+
+import logging
+import re
+from collections.abc import Callable, Iterator
+from functools import partial
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # optional; the bs4 parser is used instead
+    lxml = None
+
+from sumodata.models import BoutRecord, ShikonaRecord
+from sumodata.parse_banzuke import caption_division, shikona_record
+from sumodata.parse_results import (
+    DAY_LINK_PATTERN,
+    RID_PATTERN,
+    BoutTable,
+    RawBout,
+    ResultsPage,
+    division_name,
+    result_from_src,
+)
+from sumodata.util import ParseError
+
+logger = logging.getLogger(__name__)
+
+
+def read_results_page(html: str) -> ResultsPage:
+    """Parse a Results page once into a ResultsPage."""
+    root = _document(html)
+    title = _first(root.iter("title"))
+    return ResultsPage(
+        tables=_bout_tables(root),
+        day_links=_day_links(root),
+        playoff_links=_playoff_links(root),
+        title=_text(title) if title is not None else "",
+    )
+
+
+def parse_results_page(
+    html: str,
+    event_id: str,
+    event_type: str,
+    is_regular: str,
+    basho: str,
+    day: int,
+    source_url: str,
+    fetched_at: str,
+) -> list[BoutRecord]:
+    """Parse a Results page and return BoutRecords."""
+    return read_results_page(html).bouts(
+        event_id, event_type, is_regular, basho, day, source_url, fetched_at,
+    )
+
+
+def published_days(html: str, basho: str) -> set[int]:
+    """Regular days (1..15) linked from the daytable; empty if there is none."""
+    return read_results_page(html).published_days(basho)
+
+
+def detect_playoff(html: str, basho: str) -> bool:
+    """Detect if a playoff exists by looking for a d=16 playoff link."""
+    return read_results_page(html).has_playoff(basho)
+
+
+def parse_banzuke_page(
+    html: str,
+    basho: str,
+    source_url: str,
+) -> list[ShikonaRecord]:
+    """Parse a Banzuke page and return ShikonaRecords."""
+    records: list[ShikonaRecord] = []
+
+    for table in _iter_class(_document(html), "table", "banzuke"):
+        caption = _first(table.iter("caption"))
+        if caption is None:
+            continue
+        division = caption_division(_text(caption))
+        if not division:
+            continue
+
+        tbody = _first(table.iter("tbody"))
+        if tbody is None:
+            continue
+
+        for tr in tbody.iter("tr"):
+            cells = list(tr.iter("td"))
+            if len(cells) != 5:
+                continue
+
+            # cells: [Result, East shikona, Rank, West shikona, Result]
+            rank_text = _text(cells[2])
+            for cell, side in ((cells[1], "e"), (cells[3], "w")):
+                record = _extract_rikishi(cell, side, rank_text, division, basho, source_url)
+                if record:
+                    records.append(record)
+
+    logger.info("Parsed %d rikishi from banzuke (%s)", len(records), basho)
+    return records
+
+
+def _document(html: str) -> "lxml.html.HtmlElement":
+    if lxml is None:
+        raise ParseError("lxml is required for the lxml parser (pip install sumodata[lxml])")
+    try:
+        return lxml.html.document_fromstring(html)
+    except etree.ParserError:  # empty document
+        return lxml.html.document_fromstring("<html></html>")
+
+
+def _has_class(el, name: str) -> bool:
+    return name in (el.get("class") or "").split()
+
+
+def _iter_class(root, tag: str, name: str) -> Iterator:
+    return (el for el in root.iter(tag) if _has_class(el, name))
+
+
+def _first(elements: Iterator):
+    return next(iter(elements), None)
+
+
+def _text(el) -> str:
+    """Same as bs4's get_text(strip=True): stripped strings, concatenated."""
+    return "".join(s.strip() for s in el.itertext())
+
+
+def _day_links(root) -> list[tuple[str, int]]:
+    table = _first(_iter_class(root, "table", "daytable"))
+    if table is None:
+        return []
+    links = []
+    for link in table.iter("a"):
+        m = DAY_LINK_PATTERN.search(link.get("href", ""))
+        if m:
+            links.append((m.group(1), int(m.group(2))))
+    return links
+
+
+def _playoff_links(root) -> list[str]:
+    return [
+        link.get("href")
+        for link in root.iter("a")
+        if "d=16" in link.get("href", "") and "playoff" in _text(link).lower()
+    ]
+
+
+def _bout_tables(root) -> list[BoutTable]:
+    tables = []
+    for table in _iter_class(root, "table", "tk_table"):
+        header = _first(_iter_class(table, "td", "tk_kaku"))
+        if header is None:
+            continue
+        division = division_name(_text(header))
+        if division:
+            tables.append((division, list(_bout_rows(table))))
+    return tables
+
+
+def _bout_rows(table) -> Iterator[Callable[[], RawBout]]:
+    # Each bout row has 5 cells: tk_kekka, tk_east, tk_kim, tk_west, tk_kekka
+    for tr in table.iter("tr"):
+        cells = list(tr.iter("td"))
+        if len(cells) != 5 or _has_class(cells[0], "tk_kaku"):
+            continue
+        yield partial(_read_bout_row, cells)
+
+
+def _read_bout_row(cells: list) -> RawBout:
+    return RawBout(
+        east_rid=_extract_rid(cells[1]),
+        west_rid=_extract_rid(cells[3]),
+        east_rank=_extract_rank(cells[1]),
+        west_rank=_extract_rank(cells[3]),
+        kimarite=_extract_kimarite(cells[2]),
+        east_result=_detect_result(cells[0]),
+        west_result=_detect_result(cells[4]),
+    )
+
+
+def _rid_link(cell, pattern: re.Pattern):
+    for link in cell.iter("a"):
+        m = pattern.search(link.get("href", ""))
+        if m:
+            return link, m
+    return None, None
+
+
+def _extract_rid(cell) -> int:
+    _, m = _rid_link(cell, RID_PATTERN)
+    return int(m.group(1)) if m else 0
+
+
+def _rank_font(cell):
+    return _first(f for f in cell.iter("font") if f.get("size") == "1")
+
+
+def _extract_rank(cell) -> str:
+    font = _rank_font(cell)
+    return _text(font) if font is not None else ""
+
+
+def _extract_kimarite(cell) -> str:
+    """Text right after the first <font size="1">, skipping <br>s."""
+    font = _rank_font(cell)
+    if font is not None:
+        text = (font.tail or "").strip()
+        if text:
+            return text
+        for sibling in font.itersiblings():
+            if sibling.tag is etree.Comment:
+                text = (sibling.text or "").strip()
+            elif sibling.tag == "br":
+                text = ""
+            else:
+                break
+            if text:
+                return text
+            text = (sibling.tail or "").strip()
+            if text:
+                return text
+
+    # Fallback: first non-empty string in the cell
+    for s in cell.itertext():
+        if s.strip():
+            return s.strip()
+    return ""
+
+
+def _detect_result(cell) -> str:
+    img = _first(cell.iter("img"))
+    if img is None:
+        return ""
+    return result_from_src(img.get("src", ""))
+
+
+def _extract_rikishi(
+    cell,
+    side: str,
+    rank_text: str,
+    division: str,
+    basho: str,
+    source_url: str,
+) -> ShikonaRecord | None:
+    if _has_class(cell, "emptycell"):
+        return None
+    link, _ = _rid_link(cell, RID_PATTERN)
+    if link is None:
+        return None
+    return shikona_record(
+        link.get("href"), link.get("title", ""), _text(link),
+        side, rank_text, division, basho, source_url,
+    )
@@ -2,14 +2,132 @@
 
 import logging
 import re
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import partial
 
 from bs4 import BeautifulSoup, Tag
 
 from sumodata.models import BoutRecord
+from sumodata.soup import PageFilter
 
 logger = logging.getLogger(__name__)
 
-_RID_PATTERN = re.compile(r"Rikishi\.aspx\?r=(\d+)")
+RID_PATTERN = re.compile(r"Rikishi\.aspx\?r=(\d+)")
+DAY_LINK_PATTERN = re.compile(r"Results\.aspx\?b=(\d{6})&(?:amp;)?d=(\d+)")
+
+
+@dataclass
+class RawBout:
+    """Values read from one bout row, before the result rules are applied.
+
+    ``east_result``/``west_result`` are the hoshi image names as returned
+    by result_from_src. Parser backends produce these; build_bouts turns
+    them into BoutRecords, so every backend applies the same rules.
+    """
+
+    east_rid: int
+    west_rid: int
+    east_rank: str
+    west_rank: str
+    kimarite: str
+    east_result: str
+    west_result: str
+
+
+# A division table: its name and one reader per bout row
+BoutTable = tuple[str, list[Callable[[], RawBout]]]
+
+EXCEPTION_RESULTS = ("fusen", "kyujo", "unknown")
+
+
+@dataclass
+class BoutCounts:
+    """Bouts per division and exceptional results, counted as records stream by."""
+
+    divisions: dict[str, int] = field(default_factory=dict)
+    exceptions: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.divisions.values())
+
+    def add(self, record: BoutRecord) -> None:
+        self.divisions[record.division] = self.divisions.get(record.division, 0) + 1
+        if record.result_type in EXCEPTION_RESULTS:
+            self.exceptions += 1
+
+    def count(self, records: Iterable[BoutRecord]) -> Iterator[BoutRecord]:
+        """Pass ``records`` through, counting each one."""
+        for record in records:
+            self.add(record)
+            yield record
+
+    def summary(self) -> str:
+        parts = [f"{d}={n}" for d, n in self.divisions.items()]
+        return ", ".join([*parts, f"exceptions={self.exceptions}"])
+
+
+@dataclass
+class ResultsPage:
+    """Everything read from one parse of a Results page.
+
+    Backends fill it in from their own tree; bout rows are kept as readers
+    so bouts() can still turn a broken row into an 'unknown' record.
+    """
+
+    tables: list[BoutTable]
+    day_links: list[tuple[str, int]]  # (basho, day) linked from the daytable
+    playoff_links: list[str]  # hrefs of day-16 links labelled as a playoff
+    title: str = ""
+
+    @property
+    def divisions(self) -> list[str]:
+        return [division for division, _ in self.tables]
+
+    def bouts(
+        self,
+        event_id: str,
+        event_type: str,
+        is_regular: str,
+        basho: str,
+        day: int,
+        source_url: str,
+        fetched_at: str,
+    ) -> list[BoutRecord]:
+        return build_bouts(
+            self.tables, event_id, event_type, is_regular, basho, day,
+            source_url, fetched_at,
+        )
+
+    def published_days(self, basho: str) -> set[int]:
+        """Regular days (1..15) of ``basho`` linked from the daytable."""
+        return {d for b, d in self.day_links if b == basho and 1 <= d <= 15}
+
+    def has_playoff(self, basho: str) -> bool:
+        if any(f"b={basho}" in href for href in self.playoff_links):
+            logger.info("Playoff detected for basho %s", basho)
+            return True
+        return False
+
+
+# tk_table for bouts, daytable for day links, any day-16 link for the playoff
+RESULTS_FILTER = PageFilter(("tk_table", "daytable"), names=("title",), hrefs=("d=16",))
+
+
+def read_results_page(html: str, strained: bool = True) -> ResultsPage:
+    """Parse a Results page once into a ResultsPage.
+
+    Only the parts read by ResultsPage are built unless ``strained`` is
+    off; the result is the same either way.
+    """
+    soup = BeautifulSoup(html, "html.parser", parse_only=RESULTS_FILTER if strained else None)
+    return ResultsPage(
+        tables=_bout_tables(soup),
+        day_links=_day_links(soup),
+        playoff_links=_playoff_links(soup),
+        title=soup.title.get_text(strip=True) if soup.title else "",
+    )
 
 
 def parse_results_page(
@@ -23,37 +141,111 @@ def parse_results_page(
     fetched_at: str,
 ) -> list[BoutRecord]:
     """Parse a Results page and return BoutRecords."""
-    soup = BeautifulSoup(html, "html.parser")
-    records: list[BoutRecord] = []
-    source_row_index = 0
+    return read_results_page(html).bouts(
+        event_id, event_type, is_regular, basho, day, source_url, fetched_at,
+    )
+
+
+def published_days(html: str, basho: str) -> set[int]:
+    """Regular days (1..15) linked from the daytable; empty if there is none."""
+    return read_results_page(html).published_days(basho)
+
+
+def detect_playoff(html: str, basho: str) -> bool:
+    """Detect if a playoff exists by looking for a d=16 playoff link."""
+    return read_results_page(html).has_playoff(basho)
+
+
+def _day_links(soup: BeautifulSoup) -> list[tuple[str, int]]:
+    table = soup.find("table", class_="daytable")
+    if not table:
+        return []
+    links = []
+    for link in table.find_all("a", href=DAY_LINK_PATTERN):
+        m = DAY_LINK_PATTERN.search(link["href"])
+        if m:
+            links.append((m.group(1), int(m.group(2))))
+    return links
+
 
-    # Find all division tables
+def _playoff_links(soup: BeautifulSoup) -> list[str]:
+    return [
+        link["href"]
+        for link in soup.find_all("a", href=True)
+        if "d=16" in link["href"] and "playoff" in link.get_text(strip=True).lower()
+    ]
+
+
+def _bout_tables(soup: BeautifulSoup) -> list[BoutTable]:
+    tables = []
     for table in soup.find_all("table", class_="tk_table"):
         division = _extract_division(table)
-        if not division:
+        if division:
+            tables.append((division, list(_bout_rows(table))))
+    return tables
+
+
+def _bout_rows(table: Tag) -> Iterator[Callable[[], RawBout]]:
+    # Each bout row has 5 cells: tk_kekka, tk_east, tk_kim, tk_west, tk_kekka
+    for tr in table.find_all("tr"):
+        cells = tr.find_all("td")
+        if len(cells) != 5:
             continue
 
-        bout_no = 0
-        # Each bout row has 5 cells: tk_kekka, tk_east, tk_kim, tk_west, tk_kekka
-        for tr in table.find_all("tr"):
-            cells = tr.find_all("td")
-            if len(cells) != 5:
-                continue
+        # Skip header rows (tk_kaku)
+        if cells[0].get("class") and "tk_kaku" in cells[0].get("class", []):
+            continue
 
-            # Skip header rows (tk_kaku)
-            if cells[0].get("class") and "tk_kaku" in cells[0].get("class", []):
-                continue
+        yield partial(_read_bout_row, cells)
 
+
+def build_bouts(
+    tables: Iterable[BoutTable],
+    event_id: str,
+    event_type: str,
+    is_regular: str,
+    basho: str,
+    day: int,
+    source_url: str,
+    fetched_at: str,
+) -> list[BoutRecord]:
+    """All BoutRecords of a page's division tables (see iter_bouts)."""
+    return list(iter_bouts(
+        tables, event_id, event_type, is_regular, basho, day, source_url, fetched_at,
+    ))
+
+
+def iter_bouts(
+    tables: Iterable[BoutTable],
+    event_id: str,
+    event_type: str,
+    is_regular: str,
+    basho: str,
+    day: int,
+    source_url: str,
+    fetched_at: str,
+) -> Iterator[BoutRecord]:
+    """Number the bout rows of a page's division tables and yield BoutRecords.
+
+    Shared by every parser backend. Each row is read when its record is
+    requested; a row whose reader raises is kept as result_type=unknown.
+    The page summary is logged once the last record has been yielded.
+    """
+    page = BoutCounts()
+    source_row_index = 0
+
+    for division, rows in tables:
+        bout_no = 0
+        for read_row in rows:
             source_row_index += 1
             bout_no += 1
 
             try:
-                record = _parse_bout_row(
-                    cells, division, bout_no, source_row_index,
+                record = _bout_record(
+                    read_row(), division, bout_no, source_row_index,
                     event_id, event_type, is_regular, basho, day,
                     source_url, fetched_at,
                 )
-                records.append(record)
                 logger.debug(
                     "  bout %s #%d: %d vs %d -> %s by %s [%s]",
                     division, bout_no, record.east_rid, record.west_rid,
@@ -64,7 +256,7 @@ def parse_results_page(
                     "Failed to parse bout row %d in %s: %s",
                     source_row_index, division, e,
                 )
-                records.append(BoutRecord(
+                record = BoutRecord(
                     event_id=event_id, event_type=event_type,
                     is_regular=is_regular, basho=basho, day=day,
                     division=division, bout_no=bout_no,
@@ -74,23 +266,13 @@ def parse_results_page(
                     source_url=source_url,
                     source_row_index=source_row_index,
                     fetched_at=fetched_at,
-                ))
-
-    # Division-level and exception summary
-    div_counts: dict[str, int] = {}
-    exception_count = 0
-    for r in records:
-        div_counts[r.division] = div_counts.get(r.division, 0) + 1
-        if r.result_type in ("fusen", "kyujo", "unknown"):
-            exception_count += 1
+                )
+            page.add(record)
+            yield record
 
     logger.info(
-        "Parsed %d bouts from day %d (%s): %s, exceptions=%d",
-        len(records), day, event_id,
-        ", ".join(f"{d}={n}" for d, n in div_counts.items()),
-        exception_count,
+        "Parsed %d bouts from day %d (%s): %s", page.total, day, event_id, page.summary(),
     )
-    return records
 
 
 def _extract_division(table: Tag) -> str | None:
@@ -98,8 +280,11 @@ def _extract_division(table: Tag) -> str | None:
     header = table.find("td", class_="tk_kaku")
     if not header:
         return None
-    text = header.get_text(strip=True)
-    # Division names in the header text
+    return division_name(header.get_text(strip=True))
+
+
+def division_name(text: str) -> str:
+    """Division named in a tk_kaku header text (the text itself if none)."""
     for div_name in [
         "Makuuchi", "Juryo", "Makushita",
         "Sandanme", "Jonidan", "Jonokuchi",
@@ -109,8 +294,27 @@ def _extract_division(table: Tag) -> str | None:
     return text
 
 
-def _parse_bout_row(
-    cells: list[Tag],
+def _read_bout_row(cells: list[Tag]) -> RawBout:
+    """Read a single bout row (5 cells)."""
+    east_kekka = cells[0]
+    east_cell = cells[1]
+    kim_cell = cells[2]
+    west_cell = cells[3]
+    west_kekka = cells[4]
+
+    return RawBout(
+        east_rid=_extract_rid(east_cell),
+        west_rid=_extract_rid(west_cell),
+        east_rank=_extract_rank(east_cell),
+        west_rank=_extract_rank(west_cell),
+        kimarite=_extract_kimarite(kim_cell),
+        east_result=_detect_result(east_kekka),
+        west_result=_detect_result(west_kekka),
+    )
+
+
+def _bout_record(
+    raw: RawBout,
     division: str,
     bout_no: int,
     source_row_index: int,
@@ -122,21 +326,10 @@ def _parse_bout_row(
     source_url: str,
     fetched_at: str,
 ) -> BoutRecord:
-    """Parse a single bout row (5 cells)."""
-    east_kekka = cells[0]
-    east_cell = cells[1]
-    kim_cell = cells[2]
-    west_cell = cells[3]
-    west_kekka = cells[4]
-
-    east_rid = _extract_rid(east_cell)
-    west_rid = _extract_rid(west_cell)
-    east_rank = _extract_rank(east_cell)
-    west_rank = _extract_rank(west_cell)
-    kimarite = _extract_kimarite(kim_cell)
-
-    east_result = _detect_result(east_kekka)
-    west_result = _detect_result(west_kekka)
+    """Apply the result rules to a row's raw values."""
+    east_rid, west_rid = raw.east_rid, raw.west_rid
+    east_result, west_result = raw.east_result, raw.west_result
+    kimarite = raw.kimarite
 
     winner_side = ""
     if east_result in ("shiro", "fusensho"):
@@ -162,7 +355,7 @@ def _parse_bout_row(
         division=division, bout_no=bout_no,
         east_rid=east_rid, west_rid=west_rid,
         winner_side=winner_side, kimarite=kimarite,
-        east_rank=east_rank, west_rank=west_rank,
+        east_rank=raw.east_rank, west_rank=raw.west_rank,
         result_type=result_type, note=note,
         source_url=source_url,
         source_row_index=source_row_index,
@@ -172,9 +365,9 @@ def _parse_bout_row(
 
 def _extract_rid(cell: Tag) -> int:
     """Extract rikishi ID from a cell containing a Rikishi.aspx link."""
-    link = cell.find("a", href=_RID_PATTERN)
+    link = cell.find("a", href=RID_PATTERN)
     if link:
-        m = _RID_PATTERN.search(link["href"])
+        m = RID_PATTERN.search(link["href"])
         if m:
             return int(m.group(1))
     return 0
@@ -227,7 +420,11 @@ def _detect_result(kekka_cell: Tag) -> str:
     img = kekka_cell.find("img")
     if not img:
         return ""
-    src = img.get("src", "")
+    return result_from_src(img.get("src", ""))
+
+
+def result_from_src(src: str) -> str:
+    """Map a hoshi image src to shiro/kuro/fusensho/fusenpai ('' if none)."""
     if "hoshi_shiro" in src:
         return "shiro"
     if "hoshi_kuro" in src:
@@ -267,17 +464,3 @@ def _determine_result_type(
         return "normal"
 
     return "unknown"
-
-
-def detect_playoff(html: str, basho: str) -> bool:
-    """Detect if a playoff exists by looking for d=16 link in daytable."""
-    soup = BeautifulSoup(html, "html.parser")
-    # Look for links containing d=16 in the sidebar
-    for link in soup.find_all("a", href=True):
-        href = link["href"]
-        if f"b={basho}" in href and "d=16" in href:
-            text = link.get_text(strip=True)
-            if "playoff" in text.lower() or "Playoffs" in text:
-                logger.info("Playoff detected for basho %s", basho)
-                return True
-    return False
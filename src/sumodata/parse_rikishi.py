@@ -1 +1,51 @@
-"""Rikishi.aspx parser (future implementation)."""
+"""Rikishi.aspx HTML parser."""
+
+import logging
+
+from bs4 import BeautifulSoup
+
+from sumodata.models import RikishiRecord
+from sumodata.soup import PageFilter
+from sumodata.util import ParseError
+
+logger = logging.getLogger(__name__)
+
+RIKISHI_FILTER = PageFilter(("rikishidata",))
+
+
+def parse_rikishi_page(
+    html: str,
+    rid: int,
+    source_url: str,
+    updated_at: str,
+) -> RikishiRecord:
+    """Parse a Rikishi profile page and return its RikishiRecord."""
+    soup = BeautifulSoup(html, "html.parser", parse_only=RIKISHI_FILTER)
+    profile = _profile_fields(soup)
+
+    shikona = profile.get("Shikona", "")
+    if not shikona:
+        raise ParseError(f"No shikona on Rikishi page r={rid} ({source_url})")
+
+    logger.debug("Parsed rikishi %d: %s", rid, shikona)
+    return RikishiRecord(
+        rid=rid,
+        current_shikona=shikona,
+        updated_at=updated_at,
+        source_url=source_url,
+    )
+
+
+def _profile_fields(soup: BeautifulSoup) -> dict[str, str]:
+    """Map the profile table's category labels to their values."""
+    fields: dict[str, str] = {}
+    table = soup.find("table", class_="rikishidata")
+    if not table:
+        return fields
+    # Rows are <td class="cat">Label</td><td class="val">Value</td>
+    for cat in table.find_all("td", class_="cat"):
+        val = cat.find_next_sibling("td", class_="val")
+        if val is None:
+            continue
+        fields.setdefault(cat.get_text(strip=True), " ".join(val.get_text(" ").split()))
+    return fields
@@ -0,0 +1,59 @@
+"""Selectable HTML parser backends.
+
+"bs4" (BeautifulSoup with html.parser) is the reference and needs nothing
+beyond the base install. "lxml" walks the same cells with lxml's C parser
+and builds identical records several times faster; it needs the optional
+``lxml`` package. The backend is process-wide, like the raw cache backend.
+"""
+
+from sumodata import parse_banzuke, parse_lxml, parse_results
+from sumodata.util import ParseError
+
+
+class SoupParser:
+    """BeautifulSoup (html.parser) backend."""
+
+    name = "bs4"
+    read_results_page = staticmethod(parse_results.read_results_page)
+    parse_results_page = staticmethod(parse_results.parse_results_page)
+    published_days = staticmethod(parse_results.published_days)
+    detect_playoff = staticmethod(parse_results.detect_playoff)
+    parse_banzuke_page = staticmethod(parse_banzuke.parse_banzuke_page)
+
+
+class LxmlParser:
+    """lxml backend; raises ParseError when lxml is not installed."""
+
+    name = "lxml"
+    read_results_page = staticmethod(parse_lxml.read_results_page)
+    parse_results_page = staticmethod(parse_lxml.parse_results_page)
+    published_days = staticmethod(parse_lxml.published_days)
+    detect_playoff = staticmethod(parse_lxml.detect_playoff)
+    parse_banzuke_page = staticmethod(parse_lxml.parse_banzuke_page)
+
+    def __init__(self) -> None:
+        if parse_lxml.lxml is None:
+            raise ParseError("The lxml parser needs lxml (pip install sumodata[lxml])")
+
+
+PARSERS = {
+    "bs4": SoupParser,
+    "lxml": LxmlParser,
+}
+
+HtmlParser = SoupParser | LxmlParser
+
+_parser: HtmlParser = SoupParser()
+
+
+def configure_parser(name: str) -> None:
+    """Select the process-wide HTML parser ("bs4" or "lxml")."""
+    global _parser
+    try:
+        _parser = PARSERS[name]()
+    except KeyError:
+        raise ParseError(f"Unknown parser: {name}") from None
+
+
+def get_parser() -> HtmlParser:
+    return _parser
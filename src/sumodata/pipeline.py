@@ -0,0 +1,411 @@
+"""Fetch/parse scheduling for one or many basho in a single process.
+
+All pages of all requested basho go through one fetch stream (one event
+loop, one connection pool, one request budget); each page is parsed on a
+small worker pool as soon as it arrives, while later pages are still on
+the wire.
+
+Parsing is CPU-bound and holds the GIL, so with parse_pool="process" the
+worker threads only hand pages to a pool of worker processes and get the
+records back as plain columns.
+"""
+
+import logging
+import multiprocessing
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing, nullcontext
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from operator import attrgetter
+from pathlib import Path
+
+from sumodata import fetch
+from sumodata.fetch import (
+    DEFAULT_CONCURRENCY,
+    FetchJob,
+    banzuke_url,
+    configure_base_url,
+    fetch_many,
+    iter_fetch,
+    results_url,
+)
+from sumodata.journal import RunJournal
+from sumodata.metrics import FetchMetrics, get_metrics
+from sumodata.models import BoutRecord, ShikonaRecord
+from sumodata.parse_cache import ParseCache
+from sumodata.parse_results import ResultsPage
+from sumodata.parsers import configure_parser, get_parser
+
+logger = logging.getLogger(__name__)
+
+DAYS = 15
+PLAYOFF_DAY = 16
+DEFAULT_PARSE_WORKERS = 2
+PARSE_POOLS = ("thread", "process")
+
+
+@dataclass
+class PipelineOptions:
+    use_cache: bool = True
+    revalidate: bool = False
+    playoff: bool = True
+    concurrency: int = DEFAULT_CONCURRENCY
+    parse_workers: int = DEFAULT_PARSE_WORKERS
+    parse_pool: str = "thread"  # "process" parses in parse_workers processes
+
+
+@dataclass
+class BashoResult:
+    """Parsed records of one basho, bouts in day order."""
+
+    basho: str
+    bouts: list[BoutRecord]
+    shikona: list[ShikonaRecord]
+
+
+def event_id_for(basho: str, playoff: bool = False) -> str:
+    return f"honbasho-{basho}-playoff" if playoff else f"honbasho-{basho}"
+
+
+def page_name(day: int | None) -> str:
+    """Name of a Results day (16 = playoff) or, for None, the Banzuke page."""
+    if day is None:
+        return "banzuke"
+    if day == PLAYOFF_DAY:
+        return "playoff"
+    return f"results_d{day:02d}"
+
+
+def page_cache_path(raw_dir: Path, basho: str, day: int | None) -> Path:
+    return raw_dir / event_id_for(basho) / f"{page_name(day)}.html"
+
+
+def page_url(basho: str, day: int | None) -> str:
+    return banzuke_url(basho) if day is None else results_url(basho, day)
+
+
+# Pages fetched for every basho, in fetch order
+BASHO_PAGES: list[int | None] = [None, *range(1, DAYS + 1)]
+
+
+def basho_jobs(basho: str, raw_dir: Path, use_cache: bool) -> list[FetchJob]:
+    """Banzuke followed by Results days 1..15."""
+    return [
+        FetchJob(
+            page_url(basho, day),
+            page_cache_path(raw_dir, basho, day) if use_cache else None,
+        )
+        for day in BASHO_PAGES
+    ]
+
+
+def parse_day(basho: str, day: int, html: str, fetched_at: str) -> list[BoutRecord]:
+    """Parse one Results page; day 16 is the playoff."""
+    return day_bouts(get_parser().read_results_page(html), basho, day, fetched_at)
+
+
+def day_bouts(page: ResultsPage, basho: str, day: int, fetched_at: str) -> list[BoutRecord]:
+    """BoutRecords of an already parsed Results page; day 16 is the playoff."""
+    playoff = day == PLAYOFF_DAY
+    return page.bouts(
+        event_id=event_id_for(basho, playoff),
+        event_type="honbasho_playoff" if playoff else "honbasho_regular",
+        is_regular="F" if playoff else "T",
+        basho=basho,
+        day=day,
+        source_url=results_url(basho, day),
+        fetched_at=fetched_at,
+    )
+
+
+def _timed(pages: Iterator[str], metrics: FetchMetrics, phase: str) -> Iterator[str]:
+    """Charge the time spent waiting for each page to ``phase``."""
+    while True:
+        with metrics.phase(phase):
+            page = next(pages, None)
+        if page is None:
+            return
+        yield page
+
+
+def _parse_page(
+    metrics: FetchMetrics,
+    journal: RunJournal | None,
+    basho: str,
+    day: int | None,
+    fn: Callable,
+    *args: object,
+) -> list:
+    with metrics.phase("parse"):
+        records = fn(*args)
+    if journal is not None:
+        journal.save_parsed(basho, page_name(day), records)
+    return records
+
+
+def _pack(records: list) -> tuple[list, ...]:
+    """Records as one list per field: far smaller to pickle than dataclasses."""
+    if not records:
+        return ()
+    values = attrgetter(*(f.name for f in fields(records[0])))
+    return tuple(map(list, zip(*map(values, records))))
+
+
+def _unpack(record_type: type, columns: tuple[list, ...]) -> list:
+    return [record_type(*row) for row in zip(*columns)]
+
+
+def _parse_packed(fn: Callable, *args: object) -> tuple[list, ...]:
+    """Run in a worker process."""
+    return _pack(fn(*args))
+
+
+def _parse_in_process(
+    pool: ProcessPoolExecutor,
+    record_type: type,
+    fn: Callable,
+    *args: object,
+) -> list:
+    return _unpack(record_type, pool.submit(_parse_packed, fn, *args).result())
+
+
+def _init_worker(parser: str, base_url: str) -> None:
+    configure_parser(parser)
+    configure_base_url(base_url)
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Worker processes set up like this one (parser backend, base URL)."""
+    # Fork would copy the fetch threads' locks mid-use; forkserver/spawn
+    # start clean children, given this process's parser and source URLs
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(
+        workers, mp_context=context,
+        initializer=_init_worker, initargs=(get_parser().name, fetch.BASE_URL),
+    )
+
+
+_FETCHED_AT = [f.name for f in fields(BoutRecord)].index("fetched_at")
+
+
+def page_key(html: str, basho: str, day: int | str | None) -> str:
+    """Parse cache key of a page; records also depend on the parser and source URLs."""
+    return ParseCache.key(html, basho, day, get_parser().name, fetch.BASE_URL)
+
+
+def _parse_cached(
+    parsed: ParseCache,
+    key: str,
+    record_type: type,
+    fetched_at: str,
+    fn: Callable,
+    *args: object,
+) -> list:
+    """Records for ``key`` from the parse cache, else from ``fn`` (then cached).
+
+    Cached bouts get this run's fetched_at, like freshly parsed ones.
+    """
+    columns = parsed.get(key)
+    if columns is None:
+        records = fn(*args)
+        parsed.put(key, _pack(records))
+        return records
+    if record_type is BoutRecord and columns:
+        columns = (
+            *columns[:_FETCHED_AT], [fetched_at] * len(columns[0]), *columns[_FETCHED_AT + 1:],
+        )
+    return _unpack(record_type, columns)
+
+
+def _restored(journal: RunJournal, basho: str, day: int | None) -> Future:
+    future: Future = Future()
+    record_type = ShikonaRecord if day is None else BoutRecord
+    future.set_result(journal.load_parsed(basho, page_name(day), record_type))
+    return future
+
+
+def _fetch_playoff(
+    basho: str,
+    raw_dir: Path,
+    options: PipelineOptions,
+    metrics: FetchMetrics,
+    journal: RunJournal | None,
+    parsed: ParseCache | None,
+) -> list[BoutRecord]:
+    cache_path = page_cache_path(raw_dir, basho, PLAYOFF_DAY) if options.use_cache else None
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    with metrics.phase("fetch"):
+        [html] = fetch_many(
+            [FetchJob(results_url(basho, PLAYOFF_DAY), cache_path)],
+            options.use_cache, revalidate=options.revalidate,
+        )
+    if journal is not None:
+        journal.mark(basho, page_name(PLAYOFF_DAY), "fetched")
+    args: tuple = (parse_day, basho, PLAYOFF_DAY, html, fetched_at)
+    if parsed is not None:
+        key = page_key(html, basho, PLAYOFF_DAY)
+        args = (_parse_cached, parsed, key, BoutRecord, fetched_at, *args)
+    return _parse_page(metrics, journal, basho, PLAYOFF_DAY, *args)
+
+
+def _collect(
+    basho: str,
+    banzuke: Future,
+    days: list[Future],
+    playoff: Future | None,
+) -> BashoResult:
+    bouts: list[BoutRecord] = []
+    for day, future in enumerate(days, start=1):
+        records = future.result()
+        bouts.extend(records)
+        logger.info("%s day %d: %d bouts", basho, day, len(records))
+    if playoff is not None:
+        records = playoff.result()
+        bouts.extend(records)
+        logger.info("%s playoff: %d bouts", basho, len(records))
+    return BashoResult(basho, bouts, banzuke.result())
+
+
+def iter_basho(
+    bashos: list[str],
+    raw_dir: Path,
+    options: PipelineOptions,
+    journal: RunJournal | None = None,
+    parsed: ParseCache | None = None,
+) -> Iterator[BashoResult]:
+    """Fetch and parse each basho; results are yielded in basho order.
+
+    A basho is yielded once the pages of the next one are being parsed, so
+    a fetch or parse failure surfaces at most one basho late. Parse work
+    waiting for a worker is bounded to 2 * parse_workers pages.
+
+    With a ``journal``, every parsed page is spooled there, and pages it
+    already holds are restored instead of fetched again. With ``parsed``,
+    pages whose records are in the parse cache are not parsed.
+    """
+    if options.parse_workers < 1:
+        raise ValueError(f"parse_workers must be at least 1, got {options.parse_workers}")
+    if options.parse_pool not in PARSE_POOLS:
+        raise ValueError(f"Unknown parse_pool: {options.parse_pool}")
+    metrics = get_metrics()
+
+    def done(basho: str, day: int | None) -> bool:
+        return journal is not None and journal.is_parsed(basho, page_name(day))
+
+    jobs = [
+        job
+        for basho in bashos
+        for day, job in zip(BASHO_PAGES, basho_jobs(basho, raw_dir, options.use_cache))
+        if not done(basho, day)
+    ]
+    slots = threading.BoundedSemaphore(2 * options.parse_workers)
+    pending: deque[tuple[str, Future, list[Future], Future | None]] = deque()
+
+    with (
+        closing(iter_fetch(
+            jobs, options.use_cache, concurrency=options.concurrency,
+            revalidate=options.revalidate,
+        )) as stream,
+        ThreadPoolExecutor(options.parse_workers, thread_name_prefix="sumodata-parse") as parsers,
+        ThreadPoolExecutor(1, thread_name_prefix="sumodata-playoff") as background,
+        (
+            process_pool(options.parse_workers)
+            if options.parse_pool == "process" else nullcontext()
+        ) as processes,
+    ):
+        pages = _timed(stream, metrics, "fetch")
+
+        def next_page(basho: str, day: int | None) -> str:
+            html = next(pages)
+            if journal is not None:
+                journal.mark(basho, page_name(day), "fetched")
+            return html
+
+        def parse(
+            basho: str, day: int | None, html: str, fn: Callable, *args: object,
+            local: bool = False,
+        ) -> Future:
+            """Parse a page on a worker; ``local`` keeps it out of the process pool."""
+            slots.acquire()
+            record_type = ShikonaRecord if day is None else BoutRecord
+            if processes is not None and not local:
+                args = (processes, record_type, fn, *args)
+                fn = _parse_in_process
+            if parsed is not None:
+                key = page_key(html, basho, day)
+                args = (parsed, key, record_type, fetched_at, fn, *args)
+                fn = _parse_cached
+            future = parsers.submit(_parse_page, metrics, journal, basho, day, fn, *args)
+            future.add_done_callback(lambda _: slots.release())
+            return future
+
+        def start_playoff(basho: str) -> Future:
+            return background.submit(
+                _fetch_playoff, basho, raw_dir, options, metrics, journal, parsed,
+            )
+
+        def has_playoff(basho: str, html: str) -> tuple[bool, ResultsPage | None]:
+            """Whether day 15 links a playoff, and the page if it had to be parsed."""
+            key = page_key(html, basho, "playoff")
+            found = parsed.get(key) if parsed is not None else None
+            if found is not None:
+                return bool(found), None
+            with metrics.phase("parse"):
+                page = get_parser().read_results_page(html)
+            found = page.has_playoff(basho)
+            if parsed is not None:
+                parsed.put(key, found)
+            return found, page
+
+        for basho in bashos:
+            fetched_at = datetime.now(timezone.utc).isoformat()
+            if done(basho, None):
+                banzuke = _restored(journal, basho, None)  # type: ignore[arg-type]
+            else:
+                banz_html = next_page(basho, None)
+                banzuke = parse(
+                    basho, None, banz_html, get_parser().parse_banzuke_page,
+                    banz_html, basho, banzuke_url(basho),
+                )
+            days = []
+            playoff = None
+            for day in range(1, DAYS + 1):
+                if done(basho, day):
+                    days.append(_restored(journal, basho, day))  # type: ignore[arg-type]
+                    if day == DAYS and options.playoff:
+                        # Day 15 was parsed in an earlier run: its playoff
+                        # decision was journaled before that
+                        state = journal.state(basho, page_name(PLAYOFF_DAY))  # type: ignore[union-attr]
+                        if state == "parsed":
+                            playoff = _restored(journal, basho, PLAYOFF_DAY)  # type: ignore[arg-type]
+                        elif state != "absent":
+                            playoff = start_playoff(basho)
+                    continue
+                html = next_page(basho, day)
+                if day == DAYS and options.playoff:
+                    # Day 15 is parsed here, once: the page says whether to
+                    # start the playoff fetch, and a worker builds its bouts
+                    found, page = has_playoff(basho, html)
+                    if found:
+                        playoff = start_playoff(basho)
+                    else:
+                        logger.info("No playoff detected for basho %s", basho)
+                        if journal is not None:
+                            journal.mark(basho, page_name(PLAYOFF_DAY), "absent")
+                    if page is not None:
+                        # The page's tree stays here; only its records are built
+                        days.append(parse(
+                            basho, day, html, day_bouts, page, basho, day, fetched_at,
+                            local=True,
+                        ))
+                        continue
+                days.append(parse(basho, day, html, parse_day, basho, day, html, fetched_at))
+            pending.append((basho, banzuke, days, playoff))
+            while len(pending) > 1:
+                yield _collect(*pending.popleft())
+        while pending:
+            yield _collect(*pending.popleft())
@@ -0,0 +1,135 @@
+"""Request rate limiting shared by concurrent fetches."""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token-bucket limiter: at most ``rate`` requests/sec, ``burst`` at once.
+
+    Tokens are reserved in call order, so concurrent callers queue up behind
+    each other instead of racing for the next free slot.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate,
+        )
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds to wait before using it."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """Wait for a token; return the time spent waiting."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate; tokens earned so far are kept."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for at least ``seconds`` from now."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class AdaptiveRateController:
+    """AIMD control of a TokenBucket's rate from server feedback.
+
+    Every fast, healthy response adds ``increase`` req/s up to ``max_rate``;
+    throttling (429/503), slow responses and connection errors multiply the
+    rate by ``decrease`` down to ``min_rate``. Decreases are spaced at least
+    ``cooldown`` seconds apart so one burst of concurrent failures counts
+    once. A Retry-After value pauses all callers of the bucket.
+    """
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        max_rate: float,
+        min_rate: float = 0.05,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        slow_latency: float = 3.0,
+        cooldown: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.bucket = bucket
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_latency = slow_latency
+        self.cooldown = cooldown
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def on_success(self, latency: float) -> None:
+        if latency > self.slow_latency:
+            self._back_off(f"slow response ({latency:.1f}s)")
+            return
+        with self._lock:
+            self.bucket.set_rate(min(self.max_rate, self.bucket.rate + self.increase))
+
+    def on_throttle(self, status: int, retry_after: float | None = None) -> None:
+        self._back_off(f"HTTP {status}")
+        if retry_after:
+            logger.warning(
+                "HTTP %d: pausing all fetches for %.1fs (Retry-After)",
+                status, retry_after,
+            )
+            self.bucket.pause(retry_after)
+
+    def on_error(self) -> None:
+        self._back_off("connection error")
+
+    def _back_off(self, reason: str) -> None:
+        with self._lock:
+            now = self._clock()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            new_rate = max(self.min_rate, self.bucket.rate * self.decrease)
+            self.bucket.set_rate(new_rate)
+        logger.info("Rate lowered to %.2f req/s after %s", new_rate, reason)
@@ -0,0 +1,186 @@
+"""Rebuild the fact and dim tables from the raw cache, without the network.
+
+After a parser change every cached basho is run through the normal
+pipeline with the fetch layer offline, parsed on a worker pool, and each
+table is written once for the whole run. Basho whose pages are not all
+cached are skipped; rows of basho that are not reparsed are kept.
+"""
+
+import logging
+import re
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sumodata.batch import BoutBatch, ShikonaBatch
+from sumodata.cache import get_backend
+from sumodata.fact_store import FactStore
+from sumodata.fetch import configure_offline, rikishi_url
+from sumodata.io_csv import update_dim_rikishi_csv, update_dim_shikona_csv_batch
+from sumodata.metrics import get_metrics
+from sumodata.models import RikishiRecord
+from sumodata.parse_rikishi import parse_rikishi_page
+from sumodata.parsers import get_parser
+from sumodata.pipeline import (
+    BASHO_PAGES,
+    DAYS,
+    PLAYOFF_DAY,
+    PipelineOptions,
+    event_id_for,
+    iter_basho,
+    page_cache_path,
+    page_name,
+    process_pool,
+)
+from sumodata.rikishi import WRITE_BATCH
+from sumodata.util import ParseError
+
+logger = logging.getLogger(__name__)
+
+_EVENT_PATTERN = re.compile(r"honbasho-(\d{6})")
+_RIKISHI_PATTERN = re.compile(r"r(\d+)")
+
+
+@dataclass
+class ReparseResult:
+    bashos: list[str]
+    bouts: int = 0
+    shikona: int = 0
+    rikishi: int = 0
+
+
+def _links_playoff(raw_dir: Path, basho: str) -> bool:
+    entry = get_backend().get(page_cache_path(raw_dir, basho, DAYS))
+    if entry is None:
+        return False
+    try:
+        return get_parser().read_results_page(entry.body).has_playoff(basho)
+    except ParseError:
+        return False  # reparse itself reports the page
+
+
+def cached_bashos(raw_dir: Path, playoff: bool = True) -> list[str]:
+    """Basho whose banzuke and 15 Results days are all in the raw cache.
+
+    With ``playoff``, a basho whose day 15 links a playoff also needs the
+    playoff page, which reparse would otherwise fail to fetch offline.
+    """
+    pages: dict[str, set[str]] = {}
+    for path in get_backend().iter_paths(raw_dir):
+        m = _EVENT_PATTERN.fullmatch(path.parent.name)
+        if m:
+            pages.setdefault(m.group(1), set()).add(path.stem)
+    needed = {page_name(day) for day in BASHO_PAGES}
+    complete = []
+    for basho, names in sorted(pages.items()):
+        if not needed <= names:
+            logger.warning(
+                "Skipping basho %s: %d of %d pages cached",
+                basho, len(needed & names), len(needed),
+            )
+            continue
+        if playoff and page_name(PLAYOFF_DAY) not in names and _links_playoff(raw_dir, basho):
+            logger.warning("Skipping basho %s: day 15 links a playoff that is not cached", basho)
+            continue
+        complete.append(basho)
+    return complete
+
+
+def reparse(
+    bashos: list[str],
+    raw_dir: Path,
+    fact_path: Path,
+    dim_path: Path,
+    options: PipelineOptions,
+    rikishi_path: Path | None = None,
+) -> ReparseResult:
+    """Parse ``bashos`` from the raw cache and replace their rows.
+
+    With ``rikishi_path``, dim_rikishi is rebuilt from every cached
+    Rikishi page too. Nothing is fetched: a page missing from the cache
+    (e.g. a playoff linked from a cached day 15) fails the run.
+    """
+    options = replace(options, use_cache=True, revalidate=False)
+    result = ReparseResult(bashos)
+    metrics = get_metrics()
+    configure_offline(True)
+    try:
+        events: dict[str, BoutBatch] = {}
+        shikona: dict[str, ShikonaBatch] = {}
+        for parsed in iter_basho(bashos, raw_dir, options):
+            # Listing both events drops a playoff the new parse no longer finds
+            events[event_id_for(parsed.basho)] = BoutBatch()
+            events[event_id_for(parsed.basho, True)] = BoutBatch()
+            for r in parsed.bouts:
+                events[r.event_id].append(r)
+            shikona[parsed.basho] = ShikonaBatch(parsed.shikona)
+            logger.info("Reparsed %s: %d bouts", parsed.basho, len(parsed.bouts))
+
+        with metrics.phase("write"):
+            if bashos:
+                FactStore(fact_path).update(events, True)
+                update_dim_shikona_csv_batch(shikona, dim_path, True)
+        result.bouts = sum(len(v) for v in events.values())
+        result.shikona = sum(len(v) for v in shikona.values())
+
+        if rikishi_path is not None:
+            result.rikishi = reparse_rikishi(raw_dir, rikishi_path, options)
+    finally:
+        configure_offline(False)
+    return result
+
+
+def _parse_profile(job: tuple[str, int, str, str]) -> RikishiRecord | None:
+    html, rid, url, updated_at = job
+    try:
+        return parse_rikishi_page(html, rid, url, updated_at)
+    except ParseError as e:
+        logger.warning("Skipping cached profile: %s", e)
+        return None
+
+
+def _profile_job(path: Path, rid: int) -> tuple[str, int, str, str] | None:
+    entry = get_backend().get(path)
+    if entry is None:
+        return None
+    meta = entry.meta
+    return (
+        entry.body, rid,
+        meta.url if meta else rikishi_url(rid),
+        meta.fetched_at if meta else datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def reparse_rikishi(raw_dir: Path, dim_path: Path, options: PipelineOptions) -> int:
+    """Upsert dim_rikishi from every cached Rikishi page; return the count.
+
+    updated_at is the time the cached page was last fetched or confirmed.
+    """
+    rids = []
+    for path in get_backend().iter_paths(raw_dir):
+        m = _RIKISHI_PATTERN.fullmatch(path.stem)
+        if path.parent.name == "rikishi" and m:
+            rids.append((path, int(m.group(1))))
+    if not rids:
+        return 0
+
+    metrics = get_metrics()
+    records: list[RikishiRecord] = []
+    pool: Executor = (
+        process_pool(options.parse_workers)
+        if options.parse_pool == "process"
+        else ThreadPoolExecutor(options.parse_workers)
+    )
+    with pool:
+        # Bodies are read a batch at a time so memory stays flat
+        for start in range(0, len(rids), WRITE_BATCH):
+            jobs = [
+                job for job in (_profile_job(*r) for r in rids[start:start + WRITE_BATCH])
+                if job is not None
+            ]
+            with metrics.phase("parse"):
+                records.extend(r for r in pool.map(_parse_profile, jobs) if r is not None)
+    with metrics.phase("write"):
+        update_dim_rikishi_csv(records, dim_path)
+    return len(records)
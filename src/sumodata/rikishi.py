@@ -0,0 +1,128 @@
+"""Incremental refresh of dim_rikishi.csv from Rikishi.aspx profiles.
+
+Rids come from the fact table. Only rids missing from the dimension or
+last checked longer ago than the TTL are fetched, so a monthly refresh is
+a small delta rather than a crawl of every rikishi. With the raw cache on,
+stale profiles are revalidated with conditional requests, which cost a
+304 when the page has not changed.
+"""
+
+import logging
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sumodata.fact_store import FactStore
+from sumodata.fetch import DEFAULT_CONCURRENCY, FetchError, FetchJob, iter_fetch, rikishi_url
+from sumodata.io_csv import read_dim_rikishi, update_dim_rikishi_csv
+from sumodata.metrics import get_metrics
+from sumodata.models import RikishiRecord
+from sumodata.parse_rikishi import parse_rikishi_page
+from sumodata.util import ParseError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_DAYS = 90
+WRITE_BATCH = 200  # profiles per dim_rikishi write, so progress survives a failure
+
+
+@dataclass
+class RefreshPlan:
+    """Rids to fetch: never seen, and seen but older than the TTL."""
+
+    new: list[int]
+    stale: list[int]
+
+    def __len__(self) -> int:
+        return len(self.new) + len(self.stale)
+
+
+def rikishi_cache_path(raw_dir: Path, rid: int) -> Path:
+    return raw_dir / "rikishi" / f"r{rid}.html"
+
+
+def plan_refresh(
+    rids: set[int],
+    known: dict[int, dict],
+    ttl: timedelta,
+    now: datetime,
+) -> RefreshPlan:
+    """Split ``rids`` into those missing from ``known`` and those past ``ttl``."""
+    new = sorted(rids - known.keys())
+    stale = []
+    for rid in sorted(rids & known.keys()):
+        try:
+            updated = datetime.fromisoformat(known[rid].get("updated_at", ""))
+        except ValueError:
+            stale.append(rid)
+            continue
+        if updated.tzinfo is None:
+            updated = updated.replace(tzinfo=timezone.utc)
+        if now - updated >= ttl:
+            stale.append(rid)
+    return RefreshPlan(new, stale)
+
+
+def refresh_rikishi(
+    fact_path: Path,
+    dim_path: Path,
+    raw_dir: Path,
+    use_cache: bool,
+    ttl: timedelta = timedelta(days=DEFAULT_TTL_DAYS),
+    concurrency: int = DEFAULT_CONCURRENCY,
+    revalidate: bool = False,
+    now: datetime | None = None,
+) -> int:
+    """Fetch new and stale profiles for rids in the fact table; return the count."""
+    now = now or datetime.now(timezone.utc)
+    plan = plan_refresh(FactStore(fact_path).read_rids(), read_dim_rikishi(dim_path), ttl, now)
+    logger.info(
+        "Rikishi refresh: %d new, %d stale (ttl %s)", len(plan.new), len(plan.stale), ttl,
+    )
+    if not plan:
+        return 0
+
+    metrics = get_metrics()
+    batch: list[RikishiRecord] = []
+    done = failed = 0
+    try:
+        # A cached page of a new rid is as good as a fresh one; a stale rid's
+        # cached page is what the TTL expired, so it is always rechecked
+        for rids, check in ((plan.new, revalidate), (plan.stale, True)):
+            if not rids:
+                continue
+            jobs = [
+                FetchJob(rikishi_url(rid), rikishi_cache_path(raw_dir, rid) if use_cache else None)
+                for rid in rids
+            ]
+            with closing(iter_fetch(
+                jobs, use_cache, concurrency=concurrency, revalidate=check,
+                return_exceptions=True,
+            )) as pages:
+                for rid, job, html in zip(rids, jobs, pages):
+                    updated_at = datetime.now(timezone.utc).isoformat()
+                    try:
+                        if isinstance(html, Exception):
+                            raise html
+                        with metrics.phase("parse"):
+                            batch.append(parse_rikishi_page(html, rid, job.url, updated_at))
+                    except (FetchError, ParseError) as e:
+                        # Skip it; the rid stays new or stale and is retried next run
+                        logger.warning("Skipping profile of rid %d: %s", rid, e)
+                        failed += 1
+                        continue
+                    if len(batch) >= WRITE_BATCH:
+                        with metrics.phase("write"):
+                            update_dim_rikishi_csv(batch, dim_path)
+                        done += len(batch)
+                        batch = []
+    finally:
+        # Profiles already parsed are kept even if the refresh is cut short
+        if batch:
+            with metrics.phase("write"):
+                update_dim_rikishi_csv(batch, dim_path)
+            done += len(batch)
+    if failed:
+        logger.warning("Rikishi refresh: %d profiles could not be fetched or parsed", failed)
+    return done
@@ -0,0 +1,46 @@
+"""BeautifulSoup helpers shared by the page parsers."""
+
+from bs4.filter import ElementFilter
+
+
+class PageFilter(ElementFilter):
+    """Build only the subtrees a parser reads, dropping the rest of the page.
+
+    A top-level tag is kept (with everything inside it) when its name is in
+    ``names``, or it is a table with one of ``table_classes``, or it is a
+    link whose href contains one of ``hrefs``. Text outside kept tags is
+    dropped. Searches over the kept subtrees give the same results as over
+    the whole document.
+    """
+
+    def __init__(
+        self,
+        table_classes: tuple[str, ...],
+        names: tuple[str, ...] = (),
+        hrefs: tuple[str, ...] = (),
+    ) -> None:
+        super().__init__()
+        self.table_classes = set(table_classes)
+        self.names = set(names)
+        self.hrefs = hrefs
+
+    @property
+    def includes_everything(self) -> bool:
+        return False
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        attrs = attrs or {}
+        if name in self.names:
+            return True
+        if name == "table":
+            classes = attrs.get("class") or ""
+            if isinstance(classes, str):
+                classes = classes.split()
+            return not self.table_classes.isdisjoint(classes)
+        if name == "a":
+            href = attrs.get("href") or ""
+            return any(part in href for part in self.hrefs)
+        return False
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
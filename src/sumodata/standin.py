@@ -0,0 +1,326 @@
+"""Local stand-in for SumoDB, for repeatable end-to-end benchmarks.
+
+Serves Results.aspx, Banzuke.aspx and Rikishi.aspx from fixture files or a
+recorded raw cache, with configurable latency, error injection and
+bandwidth limits. Point the fetcher at it with ``--base-url`` or the
+SUMODATA_BASE_URL environment variable.
+
+Usage:
+    python -m sumodata.standin --raw-dir data/raw --latency-ms 80
+"""
+
+import argparse
+import hashlib
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from sumodata.cache import BACKENDS, CacheError
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 16 * 1024  # bytes written per bandwidth-limited step
+
+
+@dataclass
+class StandinConfig:
+    """Behaviour of the stand-in server."""
+
+    latency: float = 0.0  # seconds before every response
+    jitter: float = 0.0  # extra uniformly random latency, seconds
+    handshake: float = 0.0  # seconds charged once per new connection
+    error_rate: float = 0.0  # fraction of requests answered with error_status
+    error_status: int = 503
+    retry_after: float | None = None  # Retry-After sent with injected errors
+    bandwidth: int = 0  # bytes/sec per response; 0 = unlimited
+    seed: int | None = None  # makes jitter and error injection repeatable
+
+
+def page_key(path: str, query: str) -> tuple[str, str] | None:
+    """Map a SumoDB request to (event_id, page name) in the raw cache layout.
+
+    Matches the names cli.main caches pages under, so a recorded cache can
+    be served back as-is.
+    """
+    params = {k: v[0] for k, v in parse_qs(query).items()}
+    page = path.rsplit("/", 1)[-1]
+    if page == "Results.aspx" and "b" in params and params.get("d", "").isdigit():
+        day = int(params["d"])
+        name = "playoff.html" if day == 16 else f"results_d{day:02d}.html"
+        return f"honbasho-{params['b']}", name
+    if page == "Banzuke.aspx" and "b" in params:
+        return f"honbasho-{params['b']}", "banzuke.html"
+    if page == "Rikishi.aspx" and params.get("r", "").isdigit():
+        return "rikishi", f"r{params['r']}.html"
+    return None
+
+
+class FixtureSource:
+    """Serve every basho from the same handful of fixture files.
+
+    Day 15 gets its own page so playoff detection can be exercised; the
+    playoff and Rikishi pages are optional.
+    """
+
+    def __init__(
+        self,
+        fixtures_dir: Path,
+        results: str = "results_multi_division.html",
+        last_day: str = "results_sample.html",
+        playoff: str | None = "results_sample.html",
+        banzuke: str = "banzuke_multi_division.html",
+        rikishi: str | None = None,
+    ) -> None:
+        def read(name: str | None) -> str | None:
+            if name is None:
+                return None
+            return (fixtures_dir / name).read_text(encoding="utf-8")
+
+        self._results = read(results)
+        self._last_day = read(last_day)
+        self._playoff = read(playoff)
+        self._banzuke = read(banzuke)
+        self._rikishi = read(rikishi)
+
+    def get(self, event_id: str, name: str) -> str | None:
+        if event_id == "rikishi":
+            return self._rikishi
+        if name == "banzuke.html":
+            return self._banzuke
+        if name == "playoff.html":
+            return self._playoff
+        if name == "results_d15.html":
+            return self._last_day
+        return self._results
+
+
+class CacheSource:
+    """Serve pages recorded in a raw cache (any backend)."""
+
+    def __init__(self, raw_dir: Path, backend: str = "dir") -> None:
+        self.raw_dir = raw_dir
+        self._backend = BACKENDS[backend]()
+
+    def get(self, event_id: str, name: str) -> str | None:
+        try:
+            entry = self._backend.get(self.raw_dir / event_id / name)
+        except CacheError as e:
+            logger.warning("Unreadable recorded page %s/%s: %s", event_id, name, e)
+            return None
+        return entry.body if entry else None
+
+
+PageSource = FixtureSource | CacheSource
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "StandinServer"
+
+    def setup(self) -> None:
+        # Charged once per TCP connection, like a real TCP+TLS handshake
+        if self.server.config.handshake:
+            time.sleep(self.server.config.handshake)
+        self.server.count("connections")
+        super().setup()
+
+    def do_GET(self) -> None:  # noqa: N802
+        server = self.server
+        config = server.config
+        server.count("requests")
+        delay = config.latency
+        if config.jitter:
+            delay += config.jitter * server.random()
+        if delay:
+            time.sleep(delay)
+
+        if config.error_rate and server.random() < config.error_rate:
+            server.count("errors")
+            headers = {}
+            if config.retry_after is not None:
+                headers["Retry-After"] = f"{config.retry_after:g}"
+            self._reply(config.error_status, b"", headers)
+            return
+
+        split = urlsplit(self.path)
+        key = page_key(split.path, split.query)
+        body = server.source.get(*key) if key else None
+        if body is None:
+            server.count("not_found")
+            self._reply(404, b"")
+            return
+
+        data = body.encode("utf-8")
+        etag = f'"{hashlib.sha1(data).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            server.count("not_modified")
+            self._reply(304, b"", {"ETag": etag})
+            return
+        server.count("pages")
+        server.count("bytes", len(data))
+        self._reply(200, data, {
+            "Content-Type": "text/html; charset=utf-8",
+            "ETag": etag,
+        })
+
+    def _reply(self, status: int, data: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        bandwidth = self.server.config.bandwidth
+        if not bandwidth:
+            self.wfile.write(data)
+            return
+        for start in range(0, len(data), CHUNK_SIZE):
+            chunk = data[start:start + CHUNK_SIZE]
+            self.wfile.write(chunk)
+            time.sleep(len(chunk) / bandwidth)
+
+    def log_message(self, format: str, *args: object) -> None:
+        logger.debug("%s %s", self.address_string(), format % args)
+
+
+class StandinServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering like SumoDB from a PageSource.
+
+    Use as a context manager to serve from a background thread; ``counts``
+    tracks connections, requests, pages, bytes and injected errors.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        source: PageSource,
+        config: StandinConfig | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        super().__init__((host, port), _Handler)
+        self.source = source
+        self.config = config or StandinConfig()
+        self.counts: Counter[str] = Counter()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += n
+
+    def random(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by the stand-in and the benchmark script."""
+    parser.add_argument(
+        "--fixtures", type=Path, default=None,
+        help="Serve every basho from fixture files in this directory",
+    )
+    parser.add_argument(
+        "--raw-dir", type=Path, default=None,
+        help="Serve pages recorded in this raw cache directory",
+    )
+    parser.add_argument(
+        "--backend", choices=sorted(BACKENDS), default="dir",
+        help="Backend of the recorded raw cache (default: dir)",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--handshake-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0,
+        help="Fraction of requests answered with --error-status",
+    )
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument(
+        "--bandwidth-kbps", type=float, default=0.0,
+        help="Per-response bandwidth limit in KiB/s (default: unlimited)",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+) -> tuple[PageSource, StandinConfig]:
+    if (args.fixtures is None) == (args.raw_dir is None):
+        parser.error("give exactly one of --fixtures or --raw-dir")
+    if args.fixtures is not None:
+        source: PageSource = FixtureSource(args.fixtures)
+    else:
+        source = CacheSource(args.raw_dir, args.backend)
+    config = StandinConfig(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        handshake=args.handshake_ms / 1000,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        bandwidth=int(args.bandwidth_kbps * 1024),
+        seed=args.seed,
+    )
+    return source, config
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m sumodata.standin",
+        description="Serve SumoDB pages locally for benchmarks.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    source, config = config_from_args(parser, args)
+    server = StandinServer(source, config, args.host, args.port)
+    print(f"Serving SumoDB stand-in at {server.base_url}", file=sys.stderr)
+    print(f"  export SUMODATA_BASE_URL={server.base_url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served: {dict(server.counts)}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
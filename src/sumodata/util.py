@@ -1,5 +1,9 @@
 """Common utilities and exception classes."""
 
+import re
+
+HONBASHO_MONTHS = (1, 3, 5, 7, 9, 11)
+
 
 class SumodataError(Exception):
     """Base exception for sumodata."""
@@ -11,3 +15,16 @@ class FetchError(SumodataError):
 
 class ParseError(SumodataError):
     """HTML parse failure."""
+
+
+def honbasho_range(start: str, end: str) -> list[str]:
+    """Honbasho (odd months) from start to end YYYYMM, inclusive."""
+    for value in (start, end):
+        if not re.fullmatch(r"\d{4}(0[1-9]|1[0-2])", value):
+            raise ValueError(f"Invalid basho (expected YYYYMM): {value}")
+    return [
+        basho
+        for year in range(int(start[:4]), int(end[:4]) + 1)
+        for basho in (f"{year}{month:02d}" for month in HONBASHO_MONTHS)
+        if start <= basho <= end
+    ]
@@ -1,11 +1,19 @@
 """Shared pytest fixtures for loading HTML test fixtures."""
 
+from collections.abc import Callable
 from pathlib import Path
 
 import pytest
 
+from sumodata.cache import CacheMeta, DirectoryCache
+from sumodata.fetch import results_url
+from sumodata.pipeline import page_cache_path
+
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
+# cache_basho(raw_dir, basho, days=range(1, 16))
+CacheBasho = Callable[..., None]
+
 
 @pytest.fixture()
 def results_sample_html() -> str:
@@ -35,3 +43,27 @@ def banzuke_sample_html() -> str:
 @pytest.fixture()
 def banzuke_multi_division_html() -> str:
     return (FIXTURES_DIR / "banzuke_multi_division.html").read_text(encoding="utf-8")
+
+
+@pytest.fixture()
+def rikishi_sample_html() -> str:
+    return (FIXTURES_DIR / "rikishi_sample.html").read_text(encoding="utf-8")
+
+
+@pytest.fixture()
+def cache_basho() -> CacheBasho:
+    """Put a basho's Banzuke and Results pages (fixtures) in a raw cache."""
+
+    def put(raw_dir: Path, basho: str, days: range = range(1, 16)) -> None:
+        cache = DirectoryCache()
+        fetched_at = "2025-01-27T00:00:00+00:00"
+        banzuke = (FIXTURES_DIR / "banzuke_multi_division.html").read_text(encoding="utf-8")
+        results = (FIXTURES_DIR / "results_no_playoff.html").read_text(encoding="utf-8")
+        cache.put(page_cache_path(raw_dir, basho, None), banzuke, CacheMeta("u", fetched_at))
+        for day in days:
+            cache.put(
+                page_cache_path(raw_dir, basho, day), results,
+                CacheMeta(results_url(basho, day), fetched_at),
+            )
+
+    return put
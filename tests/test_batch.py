@@ -0,0 +1,67 @@
+"""Tests for sumodata.batch."""
+
+from array import array
+from pathlib import Path
+
+from sumodata.batch import BoutBatch, ShikonaBatch, StringColumn
+from sumodata.io_csv import update_dim_shikona_csv_batch, update_fact_csv_batch
+from sumodata.parse_banzuke import parse_banzuke_page
+from sumodata.parse_results import parse_results_page
+
+COMMON = dict(
+    event_id="honbasho-202501",
+    event_type="honbasho_regular",
+    is_regular="T",
+    basho="202501",
+    day=1,
+    source_url="https://example.com",
+    fetched_at="2025-01-12T00:00:00",
+)
+
+
+class TestStringColumn:
+    def test_distinct_values_stored_once(self) -> None:
+        column = StringColumn()
+        for value in ["a", "b", "a", "a", "c"]:
+            column.append(value)
+        assert list(column) == ["a", "b", "a", "a", "c"]
+        assert column.values == ["a", "b", "c"]
+        assert column[3] == "a"
+        assert len(column) == 5
+
+
+class TestBoutBatch:
+    def test_round_trip(self, results_multi_division_html: str) -> None:
+        records = parse_results_page(html=results_multi_division_html, **COMMON)
+        batch = BoutBatch(records)
+        assert len(batch) == len(records)
+        assert list(batch) == records
+        assert batch[1] == records[1]
+        assert list(batch.rows())[0] == tuple(getattr(records[0], n) for n in batch.names)
+
+    def test_columns(self, results_multi_division_html: str) -> None:
+        batch = BoutBatch(iter(parse_results_page(html=results_multi_division_html, **COMMON)))
+        assert isinstance(batch.column("east_rid"), array)
+        assert batch.column("event_id").values == ["honbasho-202501"]
+        assert set(batch.column("division").values) == {"Makuuchi", "Juryo"}
+
+    def test_empty(self) -> None:
+        batch = BoutBatch()
+        assert len(batch) == 0
+        assert list(batch) == []
+
+
+class TestWriteBatch:
+    def test_fact_csv_same_as_records(
+        self, tmp_path: Path, results_multi_division_html: str,
+    ) -> None:
+        records = parse_results_page(html=results_multi_division_html, **COMMON)
+        update_fact_csv_batch({"honbasho-202501": records}, tmp_path / "a.csv", False)
+        update_fact_csv_batch({"honbasho-202501": BoutBatch(records)}, tmp_path / "b.csv", False)
+        assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+    def test_dim_csv_same_as_records(self, tmp_path: Path, banzuke_sample_html: str) -> None:
+        records = parse_banzuke_page(banzuke_sample_html, "202501", "https://example.com")
+        update_dim_shikona_csv_batch({"202501": records}, tmp_path / "a.csv", True)
+        update_dim_shikona_csv_batch({"202501": ShikonaBatch(records)}, tmp_path / "b.csv", True)
+        assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
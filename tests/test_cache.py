@@ -0,0 +1,236 @@
+"""Tests for sumodata.cache."""
+
+from pathlib import Path
+
+import pytest
+
+from sumodata.cache import (
+    CacheError,
+    CacheMeta,
+    ContentAddressedCache,
+    DirectoryCache,
+    PackCache,
+    convert,
+    meta_path,
+    read_meta,
+    write_meta,
+)
+
+
+class TestCacheMeta:
+    def test_sidecar_next_to_page(self, tmp_path: Path) -> None:
+        page = tmp_path / "honbasho-202501" / "results_d01.html"
+        assert meta_path(page) == tmp_path / "honbasho-202501" / "results_d01.html.meta.json"
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        page = tmp_path / "results_d01.html"
+        meta = CacheMeta(url="u", fetched_at="2025-01-12T00:00:00", etag='"x"')
+        write_meta(page, meta)
+        assert read_meta(page) == meta
+
+    def test_missing_sidecar(self, tmp_path: Path) -> None:
+        assert read_meta(tmp_path / "results_d01.html") is None
+
+    def test_corrupt_sidecar_ignored(self, tmp_path: Path) -> None:
+        page = tmp_path / "results_d01.html"
+        meta_path(page).write_text("{not json", encoding="utf-8")
+        assert read_meta(page) is None
+
+    def test_conditional_headers(self) -> None:
+        meta = CacheMeta(url="u", fetched_at="t", etag='"x"', last_modified="date")
+        assert meta.conditional_headers() == {
+            "If-None-Match": '"x"', "If-Modified-Since": "date",
+        }
+        assert CacheMeta(url="u", fetched_at="t").conditional_headers() == {}
+
+
+class TestDirectoryCache:
+    def test_put_get(self, tmp_path: Path) -> None:
+        cache = DirectoryCache()
+        page = tmp_path / "honbasho-202501" / "results_d01.html"
+        cache.put(page, "<html>1</html>", CacheMeta(url="u", fetched_at="t"))
+        assert page.read_text(encoding="utf-8") == "<html>1</html>"
+        entry = cache.get(page)
+        assert entry.body == "<html>1</html>"
+        assert entry.meta.url == "u"
+
+    def test_iter_paths_skips_sidecars(self, tmp_path: Path) -> None:
+        cache = DirectoryCache()
+        page = tmp_path / "honbasho-202501" / "results_d01.html"
+        cache.put(page, "x", CacheMeta(url="u", fetched_at="t"))
+        assert list(cache.iter_paths(tmp_path)) == [page]
+
+
+class TestPackCache:
+    def _page(self, tmp_path: Path, name: str = "results_d01.html") -> Path:
+        return tmp_path / "honbasho-202501" / name
+
+    def test_single_pack_per_event(self, tmp_path: Path) -> None:
+        cache = PackCache()
+        cache.put(self._page(tmp_path), "<html>1</html>", CacheMeta(url="u1", fetched_at="t"))
+        cache.put(self._page(tmp_path, "banzuke.html"), "<html>b</html>", CacheMeta(url="u2", fetched_at="t"))
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "honbasho-202501.pack", "honbasho-202501.pack.idx", "honbasho-202501.pack.lock",
+        ]
+        assert cache.get(self._page(tmp_path)).body == "<html>1</html>"
+        assert cache.get(self._page(tmp_path, "banzuke.html")).meta.url == "u2"
+
+    def test_missing_entry(self, tmp_path: Path) -> None:
+        cache = PackCache()
+        assert cache.get(self._page(tmp_path)) is None
+        cache.put(self._page(tmp_path), "x", CacheMeta(url="u", fetched_at="t"))
+        assert cache.get(self._page(tmp_path, "results_d02.html")) is None
+
+    def test_overwrite_appends_and_repoints(self, tmp_path: Path) -> None:
+        cache = PackCache()
+        cache.put(self._page(tmp_path), "old", CacheMeta(url="u", fetched_at="t1"))
+        cache.put(self._page(tmp_path), "new", CacheMeta(url="u", fetched_at="t2"))
+        assert cache.get(self._page(tmp_path)).body == "new"
+        # A fresh instance reading from disk sees the same thing
+        assert PackCache().get(self._page(tmp_path)).body == "new"
+
+    def test_index_rebuilt_by_scan(self, tmp_path: Path) -> None:
+        cache = PackCache()
+        cache.put(self._page(tmp_path), "body", CacheMeta(url="u", fetched_at="t", etag='"e"'))
+        (tmp_path / "honbasho-202501.pack.idx").unlink()
+        entry = PackCache().get(self._page(tmp_path))
+        assert entry.body == "body"
+        assert entry.meta.etag == '"e"'
+
+    def test_truncated_tail_is_dropped(self, tmp_path: Path) -> None:
+        cache = PackCache()
+        cache.put(self._page(tmp_path), "body", CacheMeta(url="u", fetched_at="t"))
+        pack = tmp_path / "honbasho-202501.pack"
+        with open(pack, "ab") as f:
+            f.write(b"SDPK\x00\x00")
+        (tmp_path / "honbasho-202501.pack.idx").unlink()
+        size = pack.stat().st_size
+        fresh = PackCache()
+        assert fresh.get(self._page(tmp_path)).body == "body"
+        assert pack.stat().st_size == size  # readers leave the tail alone
+        fresh.put(self._page(tmp_path, "banzuke.html"), "b", CacheMeta(url="u", fetched_at="t"))
+        (tmp_path / "honbasho-202501.pack.idx").unlink()
+        assert PackCache().get(self._page(tmp_path, "banzuke.html")).body == "b"
+
+    def test_records_appended_by_another_writer_are_kept(self, tmp_path: Path) -> None:
+        a, b = PackCache(), PackCache()
+        a.put(self._page(tmp_path), "d1", CacheMeta(url="u", fetched_at="t"))
+        assert b.get(self._page(tmp_path)).body == "d1"  # b caches the index here
+        a.put(self._page(tmp_path, "results_d02.html"), "d2", CacheMeta(url="u", fetched_at="t"))
+        b.put(self._page(tmp_path, "banzuke.html"), "b", CacheMeta(url="u", fetched_at="t"))
+        for cache in (b, PackCache()):
+            assert cache.get(self._page(tmp_path)).body == "d1"
+            assert cache.get(self._page(tmp_path, "results_d02.html")).body == "d2"
+            assert cache.get(self._page(tmp_path, "banzuke.html")).body == "b"
+
+    def test_compaction_by_another_writer_is_seen(self, tmp_path: Path) -> None:
+        a, b = PackCache(), PackCache()
+        a.put(self._page(tmp_path), "old" * 100, CacheMeta(url="u", fetched_at="t"))
+        a.put(self._page(tmp_path), "new", CacheMeta(url="u", fetched_at="t"))
+        assert b.get(self._page(tmp_path)).body == "new"
+        a.compact(tmp_path / "honbasho-202501.pack")
+        assert b.get(self._page(tmp_path)).body == "new"
+
+    def test_put_meta_updates_index(self, tmp_path: Path) -> None:
+        cache = PackCache()
+        cache.put(self._page(tmp_path), "body", CacheMeta(url="u", fetched_at="t1"))
+        cache.put_meta(self._page(tmp_path), CacheMeta(url="u", fetched_at="t2"))
+        assert PackCache().get(self._page(tmp_path)).meta.fetched_at == "t2"
+
+    def test_compact_drops_superseded_records(self, tmp_path: Path) -> None:
+        cache = PackCache()
+        cache.put(self._page(tmp_path), "old" * 100, CacheMeta(url="u", fetched_at="t"))
+        cache.put(self._page(tmp_path), "new", CacheMeta(url="u", fetched_at="t"))
+        reclaimed = cache.compact(tmp_path / "honbasho-202501.pack")
+        assert reclaimed > 0
+        assert PackCache().get(self._page(tmp_path)).body == "new"
+
+    def test_compact_empty_pack_removes_index(self, tmp_path: Path) -> None:
+        pack = tmp_path / "honbasho-202501.pack"
+        pack.write_bytes(b"SDPK\x00\x00")
+        cache = PackCache()
+        assert cache.compact(pack) == 6
+        assert not pack.exists()
+        assert not (tmp_path / "honbasho-202501.pack.idx").exists()
+        assert cache.events(tmp_path) == []
+
+    def test_corrupt_pack_raises(self, tmp_path: Path) -> None:
+        (tmp_path / "honbasho-202501.pack").write_bytes(b"garbage-garbage")
+        with pytest.raises(CacheError):
+            PackCache().get(self._page(tmp_path))
+
+
+class TestContentAddressedCache:
+    def _page(self, tmp_path: Path, event: str = "honbasho-202501", name: str = "results_d01.html") -> Path:
+        return tmp_path / event / name
+
+    def _objects(self, tmp_path: Path) -> list[Path]:
+        return sorted((tmp_path / "objects").glob("*/*"))
+
+    def test_put_get(self, tmp_path: Path) -> None:
+        cache = ContentAddressedCache()
+        cache.put(self._page(tmp_path), "<html>1</html>", CacheMeta(url="u", fetched_at="t"))
+        entry = ContentAddressedCache().get(self._page(tmp_path))
+        assert entry.body == "<html>1</html>"
+        assert entry.meta.url == "u"
+        assert (tmp_path / "refs" / "honbasho-202501.json").exists()
+
+    def test_bodies_are_compressed(self, tmp_path: Path) -> None:
+        body = "<tr><td>yorikiri</td></tr>" * 500
+        ContentAddressedCache().put(self._page(tmp_path), body, CacheMeta(url="u", fetched_at="t"))
+        [obj] = self._objects(tmp_path)
+        assert obj.stat().st_size < len(body) / 10
+
+    def test_identical_bodies_stored_once(self, tmp_path: Path) -> None:
+        cache = ContentAddressedCache()
+        meta = CacheMeta(url="u", fetched_at="t")
+        cache.put(self._page(tmp_path), "same", meta)
+        cache.put(self._page(tmp_path, name="results_d02.html"), "same", meta)
+        cache.put(self._page(tmp_path, event="honbasho-202503"), "same", meta)
+        assert len(self._objects(tmp_path)) == 1
+        assert cache.get(self._page(tmp_path, event="honbasho-202503")).body == "same"
+
+    def test_missing(self, tmp_path: Path) -> None:
+        assert ContentAddressedCache().get(self._page(tmp_path)) is None
+
+    def test_gc_removes_unreferenced(self, tmp_path: Path) -> None:
+        cache = ContentAddressedCache()
+        cache.put(self._page(tmp_path), "old", CacheMeta(url="u", fetched_at="t"))
+        cache.put(self._page(tmp_path), "new", CacheMeta(url="u", fetched_at="t"))
+        assert len(self._objects(tmp_path)) == 2
+        assert cache.gc(tmp_path) > 0
+        assert len(self._objects(tmp_path)) == 1
+        assert cache.get(self._page(tmp_path)).body == "new"
+
+    def test_gc_skips_objects_being_written(self, tmp_path: Path) -> None:
+        cache = ContentAddressedCache()
+        cache.put(self._page(tmp_path), "a", CacheMeta(url="u", fetched_at="t"))
+        partial = self._objects(tmp_path)[0].with_name("ab" * 31 + ".gz.123.456.tmp")
+        partial.write_bytes(b"half")
+        assert cache.gc(tmp_path) == 0
+        assert partial.exists()
+
+    def test_iter_paths(self, tmp_path: Path) -> None:
+        cache = ContentAddressedCache()
+        cache.put(self._page(tmp_path), "a", CacheMeta(url="u", fetched_at="t"))
+        assert list(cache.iter_paths(tmp_path)) == [self._page(tmp_path)]
+
+
+class TestConvert:
+    def test_import_and_export_round_trip(self, tmp_path: Path) -> None:
+        src = tmp_path / "src"
+        DirectoryCache().put(src / "honbasho-202501" / "results_d01.html", "<html>1</html>",
+                             CacheMeta(url="u", fetched_at="t", etag='"e"'))
+        (src / "honbasho-202503").mkdir()
+        (src / "honbasho-202503" / "banzuke.html").write_text("<html>b</html>", encoding="utf-8")
+
+        assert convert(src, "dir", "pack") == 2
+        assert PackCache().get(src / "honbasho-202501" / "results_d01.html").meta.etag == '"e"'
+
+        dst = tmp_path / "dst"
+        dst.mkdir()
+        for pack in src.glob("*.pack*"):
+            pack.rename(dst / pack.name)
+        assert convert(dst, "pack", "dir") == 2
+        assert (dst / "honbasho-202503" / "banzuke.html").read_text(encoding="utf-8") == "<html>b</html>"
+        assert read_meta(dst / "honbasho-202501" / "results_d01.html").etag == '"e"'
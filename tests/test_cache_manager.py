@@ -0,0 +1,180 @@
+"""Tests for sumodata.cache_manager."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from sumodata.cache import CacheMeta, ContentAddressedCache, DirectoryCache, PackCache
+from sumodata.cache_manager import (
+    CacheStats,
+    is_finished,
+    load_pins,
+    load_stats,
+    parse_size,
+    profile_usage,
+    prune,
+    set_pinned,
+    usage,
+    verify,
+)
+
+NOW = datetime(2025, 3, 20, tzinfo=timezone.utc)
+
+
+def _fill(cache, raw_dir: Path, event_id: str, fetched_at: str, size: int = 1000) -> None:
+    for name in ("results_d01.html", "banzuke.html"):
+        cache.put(
+            raw_dir / event_id / name,
+            f"<html>{event_id}/{name}</html>" + "x" * size,
+            CacheMeta(url="u", fetched_at=fetched_at),
+        )
+
+
+class TestHelpers:
+    def test_parse_size(self) -> None:
+        assert parse_size("1048576") == 1048576
+        assert parse_size("500M") == 500 * 1024 * 1024
+        assert parse_size("2g") == 2 * 1024 ** 3
+        with pytest.raises(ValueError):
+            parse_size("lots")
+
+    def test_is_finished(self) -> None:
+        assert is_finished("honbasho-202501", NOW)
+        assert not is_finished("honbasho-202503", NOW)
+        assert not is_finished("rikishi", NOW)
+
+    def test_pins_round_trip(self, tmp_path: Path) -> None:
+        set_pinned(tmp_path, "honbasho-202503", True)
+        assert load_pins(tmp_path) == {"honbasho-202503"}
+        set_pinned(tmp_path, "honbasho-202503", False)
+        assert load_pins(tmp_path) == set()
+
+
+class TestCacheStats:
+    def test_flush_merges_counters(self, tmp_path: Path) -> None:
+        page = tmp_path / "honbasho-202501" / "results_d01.html"
+        for _ in range(2):
+            stats = CacheStats()
+            stats.record(page, "hit")
+            stats.record(page, "miss")
+            stats.flush(tmp_path)
+        stored = load_stats(tmp_path)["honbasho-202501"]
+        assert stored["hit"] == 2
+        assert stored["miss"] == 2
+        assert stored["last_access"]
+
+    def test_usage_reports_hit_rate(self, tmp_path: Path) -> None:
+        _fill(DirectoryCache(), tmp_path, "honbasho-202501", "2025-01-27T00:00:00+00:00")
+        stats = CacheStats()
+        page = tmp_path / "honbasho-202501" / "results_d01.html"
+        for outcome in ("hit", "hit", "not_modified", "miss"):
+            stats.record(page, outcome)
+        stats.flush(tmp_path)
+        [event] = usage(DirectoryCache(), tmp_path, now=NOW)
+        assert event.pages == 2
+        assert event.hits == 3
+        assert event.lookups == 4
+        assert not event.pinned
+        [event] = usage(DirectoryCache(), tmp_path, pin_finished=True, now=NOW)
+        assert event.pinned  # January is over
+
+
+@pytest.mark.parametrize("backend_cls", [DirectoryCache, PackCache, ContentAddressedCache])
+class TestPrune:
+    def test_age_expires_only_unpinned(self, backend_cls, tmp_path: Path) -> None:
+        backend = backend_cls()
+        _fill(backend, tmp_path, "honbasho-202501", "2025-01-27T00:00:00+00:00")
+        _fill(backend, tmp_path, "honbasho-202503", "2025-03-10T00:00:00+00:00")
+        evicted = prune(backend, tmp_path, max_age=timedelta(days=3), now=NOW)
+        assert evicted == ["honbasho-202503"]
+        assert backend_cls().events(tmp_path) == ["honbasho-202501"]
+
+    def test_budget_evicts_least_recently_used(self, backend_cls, tmp_path: Path) -> None:
+        backend = backend_cls()
+        for event_id in ("honbasho-202501", "honbasho-202503", "honbasho-202505"):
+            _fill(backend, tmp_path, event_id, "2025-03-01T00:00:00+00:00", size=20000)
+        stats = CacheStats()
+        stats.record(tmp_path / "honbasho-202503" / "banzuke.html", "hit")
+        stats.flush(tmp_path)
+        stats.record(tmp_path / "honbasho-202501" / "banzuke.html", "hit")
+        stats.flush(tmp_path)
+
+        total = sum(e.bytes for e in usage(backend, tmp_path, now=NOW))
+        evicted = prune(
+            backend, tmp_path, max_bytes=total - 1, pin_finished=False, now=NOW,
+        )
+        # 202505 was never accessed, 202503 less recently than 202501
+        assert evicted == ["honbasho-202505"]
+        evicted = prune(backend, tmp_path, max_bytes=1, pin_finished=False, now=NOW)
+        assert evicted == ["honbasho-202503", "honbasho-202501"]
+        assert backend_cls().events(tmp_path) == []
+
+    def test_budget_evicts_historical_basho(self, backend_cls, tmp_path: Path) -> None:
+        backend = backend_cls()
+        for basho, fetched in (
+            ("202409", "2024-09-30"), ("202411", "2024-11-30"),
+            ("202501", "2025-01-30"), ("202503", "2025-03-10"),
+        ):
+            _fill(backend, tmp_path, f"honbasho-{basho}", f"{fetched}T00:00:00+00:00")
+        set_pinned(tmp_path, "honbasho-202411", True)
+        stats = CacheStats()
+        stats.record(tmp_path / "honbasho-202503" / "banzuke.html", "hit")
+        stats.flush(tmp_path)
+        sizes = {e.event_id: e.bytes for e in usage(backend, tmp_path, now=NOW)}
+
+        # Defaults: finished basho are not pinned, so the budget is met by
+        # evicting the least recently used of them; only the explicit pin stays
+        budget = sizes["honbasho-202411"] + sizes["honbasho-202503"]
+        evicted = prune(backend, tmp_path, max_bytes=budget, now=NOW)
+        assert evicted == ["honbasho-202409", "honbasho-202501"]
+        assert backend_cls().events(tmp_path) == ["honbasho-202411", "honbasho-202503"]
+
+    def test_pinned_never_evicted(self, backend_cls, tmp_path: Path) -> None:
+        backend = backend_cls()
+        _fill(backend, tmp_path, "honbasho-202503", "2025-03-01T00:00:00+00:00")
+        set_pinned(tmp_path, "honbasho-202503", True)
+        assert prune(backend, tmp_path, max_bytes=0, now=NOW) == []
+
+    def test_dry_run_keeps_data(self, backend_cls, tmp_path: Path) -> None:
+        backend = backend_cls()
+        _fill(backend, tmp_path, "honbasho-202503", "2025-03-01T00:00:00+00:00")
+        assert prune(backend, tmp_path, max_bytes=0, dry_run=True, now=NOW) == ["honbasho-202503"]
+        assert backend.events(tmp_path) == ["honbasho-202503"]
+
+
+    def test_profiles_are_not_an_event(self, backend_cls, tmp_path: Path) -> None:
+        backend = backend_cls()
+        _fill(backend, tmp_path, "honbasho-202503", "2025-03-01T00:00:00+00:00")
+        backend.put(
+            tmp_path / "rikishi" / "r12270.html", "<html>profile</html>",
+            CacheMeta(url="u", fetched_at="2024-01-01T00:00:00+00:00"),
+        )
+        assert [e.event_id for e in usage(backend, tmp_path, now=NOW)] == ["honbasho-202503"]
+        profiles = profile_usage(backend, tmp_path)
+        assert profiles is not None and profiles.pages == 1
+
+        evicted = prune(
+            backend, tmp_path, max_bytes=0, max_age=timedelta(days=3),
+            pin_finished=False, now=NOW,
+        )
+        assert evicted == ["honbasho-202503"]
+        assert backend_cls().events(tmp_path) == ["rikishi"]
+
+
+class TestVerify:
+    def test_clean_cache(self, tmp_path: Path) -> None:
+        _fill(PackCache(), tmp_path, "honbasho-202501", "t")
+        assert verify(PackCache(), tmp_path) == []
+
+    def test_detects_corrupt_object(self, tmp_path: Path) -> None:
+        _fill(ContentAddressedCache(), tmp_path, "honbasho-202501", "t")
+        obj = next((tmp_path / "objects").glob("*/*"))
+        obj.write_bytes(b"not gzip")
+        problems = verify(ContentAddressedCache(), tmp_path)
+        assert len(problems) == 1
+
+    def test_detects_empty_page(self, tmp_path: Path) -> None:
+        _fill(DirectoryCache(), tmp_path, "honbasho-202501", "t")
+        (tmp_path / "honbasho-202501" / "banzuke.html").write_text("", encoding="utf-8")
+        assert len(verify(DirectoryCache(), tmp_path)) == 1
@@ -0,0 +1,159 @@
+"""Tests for sumodata.fact_store."""
+
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from sumodata import cli
+from sumodata.fact_store import FactStore, FactStoreError, basho_of
+from sumodata.io_csv import update_fact_csv_batch, write_fact_csv
+from sumodata.live import final_days
+from sumodata.models import BoutRecord
+
+
+def _bout(event_id: str, day: int, bout_no: int, rid: int = 1) -> BoutRecord:
+    return BoutRecord(
+        event_id=event_id, event_type="honbasho_regular", is_regular="T",
+        basho=basho_of(event_id), day=day, division="Makuuchi", bout_no=bout_no,
+        east_rid=rid, west_rid=rid + 1, winner_side="E", kimarite="oshidashi",
+        east_rank="M1e", west_rank="M1w", result_type="normal", note="",
+        source_url="https://example.com", source_row_index=bout_no, fetched_at="",
+    )
+
+
+def _table() -> list[BoutRecord]:
+    return [
+        _bout("honbasho-202501", 1, 1, 10),
+        _bout("honbasho-202501", 2, 1, 20),
+        _bout("honbasho-202501-playoff", 16, 1, 30),
+        _bout("honbasho-202503", 1, 1, 40),
+        _bout("honbasho-202503", 1, 2, 50),
+    ]
+
+
+def _split(tmp_path: Path) -> FactStore:
+    path = tmp_path / "fact_bout_daily.csv"
+    write_fact_csv(_table(), path)
+    store = FactStore(path)
+    store.split()
+    return store
+
+
+class TestBashoOf:
+    def test_regular_and_playoff(self) -> None:
+        assert basho_of("honbasho-202501") == "202501"
+        assert basho_of("honbasho-202501-playoff") == "202501"
+
+    def test_unknown_event(self) -> None:
+        with pytest.raises(FactStoreError):
+            basho_of("jungyo-202502")
+
+
+class TestFactStore:
+    def test_combined_csv_without_manifest(self, tmp_path: Path) -> None:
+        path = tmp_path / "fact.csv"
+        store = FactStore(path)
+        assert not store.partitioned
+        assert store.path_for("202501") == path
+        store.update({"honbasho-202501": _table()[:2]}, False)
+        update_fact_csv_batch({"honbasho-202501": _table()[:2]}, tmp_path / "b.csv", False)
+        assert path.read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+    def test_split_and_export_round_trip(self, tmp_path: Path) -> None:
+        path = tmp_path / "fact" / "fact_bout_daily.csv"
+        write_fact_csv(_table(), path)
+        original = path.read_bytes()
+        store = FactStore(path)
+        assert store.split() == 5
+        assert not path.exists()
+        assert store.bashos() == ["202501", "202503"]
+        manifest = json.loads((path.parent / "manifest.json").read_text(encoding="utf-8"))
+        assert manifest["partitions"] == {"202501": {"rows": 3}, "202503": {"rows": 2}}
+
+        output = tmp_path / "export" / "fact_bout_daily.csv"
+        assert FactStore(path).export(output) == 5
+        assert output.read_bytes() == original
+        assert not path.exists()
+
+    def test_update_touches_only_its_partition(self, tmp_path: Path) -> None:
+        store = _split(tmp_path)
+        other = store.partition_path("202501")
+        before = other.read_bytes(), other.stat().st_mtime_ns
+
+        store.update({"honbasho-202503": [_bout("honbasho-202503", 2, 1, 60)]}, False)
+        assert (other.read_bytes(), other.stat().st_mtime_ns) == before
+        assert store.manifest["partitions"]["202503"] == {"rows": 3}
+
+        store.update({"honbasho-202505": [_bout("honbasho-202505", 1, 1, 70)]}, True)
+        assert FactStore(store.path).bashos() == ["202501", "202503", "202505"]
+        assert store.read_rids() == {10, 11, 20, 21, 30, 31, 40, 41, 50, 51, 60, 61, 70, 71}
+
+    def test_export_matches_combined_updates(self, tmp_path: Path) -> None:
+        combined = tmp_path / "combined" / "fact_bout_daily.csv"
+        write_fact_csv(_table(), combined)
+        store = _split(tmp_path / "parts")
+        events = {
+            "honbasho-202501": [replace(r, kimarite="yorikiri") for r in _table()[:2]],
+            "honbasho-202501-playoff": [],
+            "honbasho-202505": [_bout("honbasho-202505", 1, 1)],
+        }
+        update_fact_csv_batch(events, combined, True)
+        store.update(events, True)
+        store.export(tmp_path / "export.csv")
+        assert (tmp_path / "export.csv").read_bytes() == combined.read_bytes()
+
+    def test_empty_partition_is_dropped(self, tmp_path: Path) -> None:
+        store = _split(tmp_path)
+        store.update({"honbasho-202503": []}, True)
+        assert store.bashos() == ["202501"]
+        assert not store.partition_path("202503").parent.exists()
+
+    def test_live_reads_the_partition(self, tmp_path: Path) -> None:
+        store = _split(tmp_path)
+        assert final_days(store.path, "202501") == {1, 2, 16}
+        assert final_days(store.path, "202503") == {1}
+
+    def test_export_refuses_the_table_directory(self, tmp_path: Path) -> None:
+        store = _split(tmp_path)
+        for output in (store.path, tmp_path / "basho=202501" / "all.csv"):
+            with pytest.raises(FactStoreError, match="inside"):
+                store.export(output)
+        assert not store.path.exists()
+
+    def test_split_twice(self, tmp_path: Path) -> None:
+        store = _split(tmp_path)
+        with pytest.raises(FactStoreError, match="already"):
+            store.split()
+
+    def test_unsupported_manifest(self, tmp_path: Path) -> None:
+        (tmp_path / "manifest.json").write_text('{"version": 99}', encoding="utf-8")
+        with pytest.raises(FactStoreError, match="version"):
+            FactStore(tmp_path / "fact_bout_daily.csv")
+
+
+class TestFactCli:
+    def test_split_and_export(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        path = tmp_path / "data" / "fact" / "fact_bout_daily.csv"
+        write_fact_csv(_table(), path)
+        original = path.read_bytes()
+
+        cli.main(["fact", "split"])
+        assert FactStore(path).bashos() == ["202501", "202503"]
+        cli.main(["fact", "export", "--output", str(tmp_path / "out.csv")])
+        assert (tmp_path / "out.csv").read_bytes() == original
+
+    def test_export_needs_partitions(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(SystemExit):
+            cli.main(["fact", "export", "--output", str(tmp_path / "out.csv")])
+
+    def test_export_needs_output(self) -> None:
+        with pytest.raises(SystemExit):
+            cli.main(["fact", "export"])
@@ -1,14 +1,32 @@
 """Tests for sumodata.fetch."""
 
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from sumodata.cache import CacheMeta, configure_backend, read_meta, write_meta
 from sumodata.fetch import (
+    DEFAULT_BASE_URL,
+    DEFAULT_RATE,
+    MAX_RETRY_AFTER,
+    FetchJob,
+    FetchResult,
+    SessionConfig,
     banzuke_url,
+    close_session,
+    configure_base_url,
+    configure_rate_limit,
+    configure_session,
+    fetch_many,
     fetch_page,
+    fetch_response,
     fetch_with_cache,
+    get_rate_limiter,
+    get_session,
+    iter_fetch,
     results_url,
     rikishi_url,
 )
@@ -31,13 +49,23 @@ class TestUrlBuilders:
             "https://sumodb.sumogames.de/Rikishi.aspx?r=12270"
         )
 
+    def test_configure_base_url(self) -> None:
+        configure_base_url("http://127.0.0.1:8080/")
+        try:
+            assert results_url("202501", 3) == (
+                "http://127.0.0.1:8080/Results.aspx?b=202501&d=3"
+            )
+        finally:
+            configure_base_url(DEFAULT_BASE_URL)
+
 
 class TestFetchPage:
     """Tests for fetch_page with mocked HTTP."""
 
     @patch("sumodata.fetch.time.sleep")
-    @patch("sumodata.fetch.requests.get")
-    def test_success_returns_html(self, mock_get: MagicMock, mock_sleep: MagicMock) -> None:
+    @patch("sumodata.fetch.get_session")
+    def test_success_returns_html(self, mock_session: MagicMock, mock_sleep: MagicMock) -> None:
+        mock_get = mock_session.return_value.get
         mock_resp = MagicMock()
         mock_resp.status_code = 200
         mock_resp.text = "<html>OK</html>"
@@ -48,8 +76,9 @@ class TestFetchPage:
         mock_get.assert_called_once()
 
     @patch("sumodata.fetch.time.sleep")
-    @patch("sumodata.fetch.requests.get")
-    def test_retries_on_500(self, mock_get: MagicMock, mock_sleep: MagicMock) -> None:
+    @patch("sumodata.fetch.get_session")
+    def test_retries_on_500(self, mock_session: MagicMock, mock_sleep: MagicMock) -> None:
+        mock_get = mock_session.return_value.get
         fail_resp = MagicMock()
         fail_resp.status_code = 500
         ok_resp = MagicMock()
@@ -63,8 +92,9 @@ class TestFetchPage:
         mock_sleep.assert_called_once()  # backoff between retries
 
     @patch("sumodata.fetch.time.sleep")
-    @patch("sumodata.fetch.requests.get")
-    def test_raises_after_max_retries(self, mock_get: MagicMock, mock_sleep: MagicMock) -> None:
+    @patch("sumodata.fetch.get_session")
+    def test_raises_after_max_retries(self, mock_session: MagicMock, mock_sleep: MagicMock) -> None:
+        mock_get = mock_session.return_value.get
         fail_resp = MagicMock()
         fail_resp.status_code = 503
         mock_get.return_value = fail_resp
@@ -74,8 +104,9 @@ class TestFetchPage:
         assert mock_get.call_count == 3  # MAX_RETRIES
 
     @patch("sumodata.fetch.time.sleep")
-    @patch("sumodata.fetch.requests.get")
-    def test_retries_on_connection_error(self, mock_get: MagicMock, mock_sleep: MagicMock) -> None:
+    @patch("sumodata.fetch.get_session")
+    def test_retries_on_connection_error(self, mock_session: MagicMock, mock_sleep: MagicMock) -> None:
+        mock_get = mock_session.return_value.get
         import requests
         mock_get.side_effect = [
             requests.ConnectionError("timeout"),
@@ -86,9 +117,13 @@ class TestFetchPage:
         assert result == "<html>OK</html>"
         assert mock_get.call_count == 2
 
+    @patch("sumodata.fetch._page_sleep")
     @patch("sumodata.fetch.time.sleep")
-    @patch("sumodata.fetch.requests.get")
-    def test_exponential_backoff(self, mock_get: MagicMock, mock_sleep: MagicMock) -> None:
+    @patch("sumodata.fetch.get_session")
+    def test_exponential_backoff(
+        self, mock_session: MagicMock, mock_sleep: MagicMock, mock_budget: MagicMock,
+    ) -> None:
+        mock_get = mock_session.return_value.get
         fail_resp = MagicMock()
         fail_resp.status_code = 500
         mock_get.return_value = fail_resp
@@ -100,12 +135,119 @@ class TestFetchPage:
         assert mock_sleep.call_count == 2
         mock_sleep.assert_any_call(1)
         mock_sleep.assert_any_call(2)
+        assert mock_budget.call_count == 2  # each retry waits for the rate limit
+
+    @patch("sumodata.fetch.time.sleep")
+    @patch("sumodata.fetch.get_session")
+    def test_retries_take_rate_limit_tokens(
+        self, mock_session: MagicMock, mock_sleep: MagicMock,
+    ) -> None:
+        configure_rate_limit(0.5)
+        try:
+            mock_session.return_value.get.return_value = MagicMock(status_code=500)
+            with pytest.raises(FetchError):
+                fetch_page("https://example.com")
+        finally:
+            configure_rate_limit(DEFAULT_RATE)
+        # Backoffs of 1s and 2s, and the second retry waits ~2s for a token
+        # (the clock does not move: sleep is mocked)
+        waits = [c.args[0] for c in mock_sleep.call_args_list]
+        assert waits[:2] == [1, 2]
+        assert len(waits) == 3 and waits[2] == pytest.approx(2.0, abs=0.1)
+
+
+class TestAdaptiveFetch:
+    """fetch_response feeds the adaptive controller and honours Retry-After."""
+
+    def setup_method(self) -> None:
+        configure_rate_limit(2.0, adaptive=True)
+
+    def teardown_method(self) -> None:
+        configure_rate_limit(DEFAULT_RATE)
+
+    @patch("sumodata.fetch._page_sleep")
+    @patch("sumodata.fetch.time.sleep")
+    def test_retry_after_seconds_used_as_backoff(
+        self, mock_sleep: MagicMock, mock_budget: MagicMock,
+    ) -> None:
+        session = MagicMock()
+        session.get.side_effect = [
+            MagicMock(status_code=429, headers={"Retry-After": "7"}),
+            MagicMock(status_code=200, text="ok", headers={}),
+        ]
+        assert fetch_page("https://example.com", session=session) == "ok"
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch("sumodata.fetch._page_sleep")
+    @patch("sumodata.fetch.time.sleep")
+    def test_retry_after_is_capped(self, mock_sleep: MagicMock, mock_budget: MagicMock) -> None:
+        session = MagicMock()
+        session.get.side_effect = [
+            MagicMock(status_code=503, headers={"Retry-After": "86400"}),
+            MagicMock(status_code=200, text="ok", headers={}),
+        ]
+        fetch_page("https://example.com", session=session)
+        mock_sleep.assert_called_once_with(MAX_RETRY_AFTER)
+
+    @patch("sumodata.fetch.time.sleep")
+    def test_throttle_lowers_shared_rate(self, mock_sleep: MagicMock) -> None:
+        before = get_rate_limiter().rate
+        session = MagicMock()
+        session.get.side_effect = [
+            MagicMock(status_code=429, headers={}),
+            MagicMock(status_code=200, text="ok", headers={}),
+        ]
+        fetch_page("https://example.com", session=session)
+        assert get_rate_limiter().rate < before
+
+    def test_healthy_responses_raise_rate_to_ceiling(self) -> None:
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200, text="ok", headers={})
+        for _ in range(30):
+            fetch_page("https://example.com", session=session)
+        assert get_rate_limiter().rate == 2.0
+
+
+class TestSession:
+    """Tests for the shared pooled session."""
+
+    def teardown_method(self) -> None:
+        configure_session(SessionConfig())
+
+    def test_session_is_reused(self) -> None:
+        assert get_session() is get_session()
+
+    def test_close_session_creates_new_one(self) -> None:
+        first = get_session()
+        close_session()
+        assert get_session() is not first
+
+    def test_configure_applies_pool_settings(self) -> None:
+        configure_session(SessionConfig(pool_maxsize=3, pool_block=False))
+        adapter = get_session().get_adapter("https://sumodb.sumogames.de/")
+        assert adapter._pool_maxsize == 3
+        assert adapter._pool_block is False
+
+    def test_keep_alive_off_sends_connection_close(self) -> None:
+        configure_session(SessionConfig(keep_alive=False))
+        assert get_session().headers["Connection"] == "close"
+
+    def test_user_agent_header(self) -> None:
+        assert get_session().headers["User-Agent"].startswith("sumodata/")
+
+    @patch("sumodata.fetch.time.sleep")
+    def test_fetch_page_uses_timeouts(self, mock_sleep: MagicMock) -> None:
+        configure_session(SessionConfig(connect_timeout=2, read_timeout=5))
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200, text="ok")
+        fetch_page("https://example.com", session=session)
+        session.get.assert_called_once_with("https://example.com", timeout=(2, 5))
 
 
 class TestFetchWithCache:
     """Tests for fetch_with_cache."""
 
-    @patch("sumodata.fetch.fetch_page")
+    @patch("sumodata.fetch.fetch_response")
     @patch("sumodata.fetch._page_sleep")
     def test_cache_hit_skips_fetch(self, mock_sleep: MagicMock, mock_fetch: MagicMock, tmp_path: Path) -> None:
         cache_path = tmp_path / "cached.html"
@@ -115,7 +257,7 @@ class TestFetchWithCache:
         assert result == "<html>cached</html>"
         mock_fetch.assert_not_called()
 
-    @patch("sumodata.fetch.fetch_page", return_value="<html>fetched</html>")
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(200, "<html>fetched</html>"))
     @patch("sumodata.fetch._page_sleep")
     def test_cache_miss_fetches_and_saves(self, mock_sleep: MagicMock, mock_fetch: MagicMock, tmp_path: Path) -> None:
         cache_path = tmp_path / "sub" / "cached.html"
@@ -125,7 +267,7 @@ class TestFetchWithCache:
         assert result == "<html>fetched</html>"
         assert cache_path.read_text(encoding="utf-8") == "<html>fetched</html>"
 
-    @patch("sumodata.fetch.fetch_page", return_value="<html>fetched</html>")
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(200, "<html>fetched</html>"))
     @patch("sumodata.fetch._page_sleep")
     def test_cache_off_does_not_save(self, mock_sleep: MagicMock, mock_fetch: MagicMock, tmp_path: Path) -> None:
         cache_path = tmp_path / "cached.html"
@@ -134,8 +276,237 @@ class TestFetchWithCache:
         assert result == "<html>fetched</html>"
         assert not cache_path.exists()
 
-    @patch("sumodata.fetch.fetch_page", return_value="<html>fetched</html>")
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(200, "<html>fetched</html>"))
     @patch("sumodata.fetch._page_sleep")
     def test_cache_path_none(self, mock_sleep: MagicMock, mock_fetch: MagicMock) -> None:
         result = fetch_with_cache("https://example.com", None, use_cache=True)
         assert result == "<html>fetched</html>"
+
+    @patch("sumodata.fetch.fetch_response")
+    @patch("sumodata.fetch._page_sleep")
+    def test_saves_validators_sidecar(self, mock_sleep: MagicMock, mock_fetch: MagicMock, tmp_path: Path) -> None:
+        mock_fetch.return_value = FetchResult(
+            200, "<html>fetched</html>", etag='"abc"', last_modified="Sun, 12 Jan 2025 10:00:00 GMT",
+        )
+        cache_path = tmp_path / "cached.html"
+        fetch_with_cache("https://example.com", cache_path, use_cache=True)
+        meta = read_meta(cache_path)
+        assert meta is not None
+        assert meta.url == "https://example.com"
+        assert meta.etag == '"abc"'
+        assert meta.last_modified == "Sun, 12 Jan 2025 10:00:00 GMT"
+
+
+class TestPackBackend:
+    """fetch_with_cache goes through the configured cache backend."""
+
+    def setup_method(self) -> None:
+        configure_backend("pack")
+
+    def teardown_method(self) -> None:
+        configure_backend("dir")
+
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(200, "<html>fetched</html>"))
+    @patch("sumodata.fetch._page_sleep")
+    def test_miss_then_hit(self, mock_sleep: MagicMock, mock_fetch: MagicMock, tmp_path: Path) -> None:
+        cache_path = tmp_path / "honbasho-202501" / "results_d01.html"
+        fetch_with_cache("https://example.com", cache_path, use_cache=True)
+        assert not cache_path.exists()
+        assert (tmp_path / "honbasho-202501.pack").exists()
+
+        result = fetch_with_cache("https://example.com", cache_path, use_cache=True)
+        assert result == "<html>fetched</html>"
+        mock_fetch.assert_called_once()
+
+
+class TestRevalidate:
+    """Tests for conditional-GET revalidation of cached pages."""
+
+    def _seed(self, tmp_path: Path) -> Path:
+        cache_path = tmp_path / "cached.html"
+        cache_path.write_text("<html>cached</html>", encoding="utf-8")
+        write_meta(cache_path, CacheMeta(
+            url="https://example.com", fetched_at="2025-01-12T00:00:00",
+            etag='"v1"', last_modified="Sun, 12 Jan 2025 10:00:00 GMT",
+        ))
+        return cache_path
+
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(304, ""))
+    @patch("sumodata.fetch._page_sleep")
+    def test_not_modified_reuses_cached_body(self, mock_sleep: MagicMock, mock_fetch: MagicMock, tmp_path: Path) -> None:
+        cache_path = self._seed(tmp_path)
+        result = fetch_with_cache("https://example.com", cache_path, use_cache=True, revalidate=True)
+        assert result == "<html>cached</html>"
+        mock_fetch.assert_called_once_with("https://example.com", headers={
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Sun, 12 Jan 2025 10:00:00 GMT",
+        })
+        assert read_meta(cache_path).fetched_at != "2025-01-12T00:00:00"
+
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(200, "<html>new</html>", etag='"v2"'))
+    @patch("sumodata.fetch._page_sleep")
+    def test_modified_replaces_cache(self, mock_sleep: MagicMock, mock_fetch: MagicMock, tmp_path: Path) -> None:
+        cache_path = self._seed(tmp_path)
+        result = fetch_with_cache("https://example.com", cache_path, use_cache=True, revalidate=True)
+        assert result == "<html>new</html>"
+        assert cache_path.read_text(encoding="utf-8") == "<html>new</html>"
+        assert read_meta(cache_path).etag == '"v2"'
+
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(200, "<html>new</html>"))
+    @patch("sumodata.fetch._page_sleep")
+    def test_no_sidecar_fetches_unconditionally(self, mock_sleep: MagicMock, mock_fetch: MagicMock, tmp_path: Path) -> None:
+        cache_path = tmp_path / "cached.html"
+        cache_path.write_text("<html>cached</html>", encoding="utf-8")
+        result = fetch_with_cache("https://example.com", cache_path, use_cache=True, revalidate=True)
+        assert result == "<html>new</html>"
+        mock_fetch.assert_called_once_with("https://example.com", headers={})
+
+    @patch("sumodata.fetch.time.sleep")
+    def test_fetch_response_passes_304_through(self, mock_sleep: MagicMock) -> None:
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=304, headers={"ETag": '"v1"'})
+        result = fetch_response("https://example.com", session=session, headers={"If-None-Match": '"v1"'})
+        assert result.status == 304
+        assert result.text == ""
+        assert session.get.call_count == 1
+
+
+class TestFetchMany:
+    """Tests for the concurrent batch fetcher."""
+
+    def setup_method(self) -> None:
+        configure_rate_limit(1000.0)
+
+    def teardown_method(self) -> None:
+        configure_rate_limit(DEFAULT_RATE)
+
+    @patch("sumodata.fetch.fetch_response", side_effect=lambda url, headers: FetchResult(200, f"<html>{url}</html>"))
+    def test_results_in_job_order(self, mock_fetch: MagicMock) -> None:
+        jobs = [FetchJob(f"https://example.com/{i}") for i in range(5)]
+        result = fetch_many(jobs, use_cache=False)
+        assert result == [f"<html>https://example.com/{i}</html>" for i in range(5)]
+
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(200, "<html>fetched</html>"))
+    def test_cache_hits_skip_fetch_and_misses_are_saved(self, mock_fetch: MagicMock, tmp_path: Path) -> None:
+        hit = tmp_path / "hit.html"
+        hit.write_text("<html>cached</html>", encoding="utf-8")
+        miss = tmp_path / "sub" / "miss.html"
+
+        result = fetch_many(
+            [FetchJob("https://example.com/a", hit), FetchJob("https://example.com/b", miss)],
+            use_cache=True,
+        )
+        assert result == ["<html>cached</html>", "<html>fetched</html>"]
+        mock_fetch.assert_called_once_with("https://example.com/b", headers={})
+        assert miss.read_text(encoding="utf-8") == "<html>fetched</html>"
+
+    def test_concurrency_bound(self) -> None:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_fetch(url: str, headers: dict) -> FetchResult:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return FetchResult(200, url)
+
+        with patch("sumodata.fetch.fetch_response", side_effect=slow_fetch):
+            fetch_many(
+                [FetchJob(f"https://example.com/{i}") for i in range(8)],
+                use_cache=False, concurrency=2,
+            )
+        assert peak == 2
+
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(200, "x"))
+    def test_rate_limit_spaces_requests(self, mock_fetch: MagicMock) -> None:
+        configure_rate_limit(20.0)
+        start = time.monotonic()
+        fetch_many([FetchJob(f"https://example.com/{i}") for i in range(4)], use_cache=False)
+        # First token is free, the remaining three wait 50 ms each
+        assert time.monotonic() - start >= 0.14
+
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(304, ""))
+    def test_revalidate_sends_conditional_request(self, mock_fetch: MagicMock, tmp_path: Path) -> None:
+        cache_path = tmp_path / "cached.html"
+        cache_path.write_text("<html>cached</html>", encoding="utf-8")
+        write_meta(cache_path, CacheMeta(url="u", fetched_at="t", etag='"v1"'))
+        result = fetch_many([FetchJob("https://example.com", cache_path)], use_cache=True, revalidate=True)
+        assert result == ["<html>cached</html>"]
+        mock_fetch.assert_called_once_with("https://example.com", headers={"If-None-Match": '"v1"'})
+
+
+class TestIterFetch:
+    """Tests for the pipelined, order-preserving fetch stream."""
+
+    def setup_method(self) -> None:
+        configure_rate_limit(1000.0)
+
+    def teardown_method(self) -> None:
+        configure_rate_limit(DEFAULT_RATE)
+
+    def test_yields_in_job_order(self) -> None:
+        def fetch(url: str, headers: dict) -> FetchResult:
+            # Earlier jobs finish last
+            time.sleep(0.05 - int(url.rsplit("/", 1)[1]) * 0.01)
+            return FetchResult(200, url)
+
+        with patch("sumodata.fetch.fetch_response", side_effect=fetch):
+            result = list(iter_fetch(
+                [FetchJob(f"https://example.com/{i}") for i in range(5)], use_cache=False,
+            ))
+        assert result == [f"https://example.com/{i}" for i in range(5)]
+
+    def test_buffer_bounds_work_ahead(self) -> None:
+        started: list[str] = []
+
+        def fetch(url: str, headers: dict) -> FetchResult:
+            started.append(url)
+            return FetchResult(200, url)
+
+        with patch("sumodata.fetch.fetch_response", side_effect=fetch):
+            pages = iter_fetch(
+                [FetchJob(f"https://example.com/{i}") for i in range(20)],
+                use_cache=False, buffer=2,
+            )
+            next(pages)
+            time.sleep(0.2)  # consumer stalls; producer must stop ahead
+            # 2 queued + 2 in flight + the one consumed
+            assert len(started) <= 5
+            assert len(list(pages)) == 19
+        assert len(started) == 20
+
+    @patch("sumodata.fetch.fetch_response", side_effect=FetchError("HTTP 500"))
+    def test_error_raised_at_position(self, mock_fetch: MagicMock) -> None:
+        with pytest.raises(FetchError):
+            list(iter_fetch([FetchJob("https://example.com/0")], use_cache=False))
+
+    def test_errors_returned_in_place(self) -> None:
+        def fetch(url: str, headers: dict) -> FetchResult:
+            if url.endswith("/1"):
+                raise FetchError("HTTP 404")
+            return FetchResult(200, url)
+
+        with patch("sumodata.fetch.fetch_response", side_effect=fetch):
+            result = list(iter_fetch(
+                [FetchJob(f"https://example.com/{i}") for i in range(3)],
+                use_cache=False, return_exceptions=True,
+            ))
+        assert result[0] == "https://example.com/0"
+        assert isinstance(result[1], FetchError)
+        assert result[2] == "https://example.com/2"
+
+    @patch("sumodata.fetch.fetch_response", return_value=FetchResult(200, "x"))
+    def test_early_close_stops_producer(self, mock_fetch: MagicMock) -> None:
+        pages = iter_fetch(
+            [FetchJob(f"https://example.com/{i}") for i in range(50)],
+            use_cache=False, buffer=1,
+        )
+        assert next(pages) == "x"
+        pages.close()
+        assert not any(t.name == "sumodata-fetch" for t in threading.enumerate())
+        assert mock_fetch.call_count < 50
@@ -1,23 +1,34 @@
 """Tests for sumodata.io_csv."""
 
 import csv
+from dataclasses import asdict, fields
 from pathlib import Path
 
+import pytest
+
+from sumodata import io_csv
 from sumodata.io_csv import (
     DIM_KEY_COLUMNS,
+    DIM_RIKISHI_COLUMNS,
+    FactIndex,
     DIM_SHIKONA_COLUMNS,
     DIM_SORT_COLUMNS,
     FACT_COLUMNS,
     FACT_KEY_COLUMNS,
     FACT_SORT_COLUMNS,
+    atomic_write,
     force_replace,
+    merge_fact_csv,
+    replace_fact_days,
     update_dim_shikona_csv,
+    update_dim_shikona_csv_batch,
     update_fact_csv,
+    update_fact_csv_batch,
     upsert,
     write_dim_shikona_csv,
     write_fact_csv,
 )
-from sumodata.models import BoutRecord, ShikonaRecord
+from sumodata.models import BoutRecord, RikishiRecord, ShikonaRecord
 
 
 def _read_csv_rows(path: Path) -> list[dict]:
@@ -94,6 +105,18 @@ class TestWriteFactCsv:
         assert b"\r\n" not in raw
         assert b"\n" in raw
 
+    def test_failed_write_keeps_previous_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "fact.csv"
+        write_fact_csv([_make_bout()], path)
+        before = path.read_bytes()
+
+        with pytest.raises(OSError):
+            with atomic_write(path) as f:
+                f.write("event_id\n")
+                raise OSError("disk full")
+        assert path.read_bytes() == before
+        assert list(tmp_path.iterdir()) == [path]
+
 
 class TestWriteDimShikonaCsv:
     def test_writes_headers_and_rows(self, tmp_path: Path) -> None:
@@ -314,6 +337,38 @@ class TestUpdateFactCsv:
         assert len(rows) == 1
 
 
+class TestRecordRows:
+    """Records are written straight from their fields, in column order."""
+
+    def test_columns_are_record_fields(self) -> None:
+        assert [f.name for f in fields(BoutRecord)] == FACT_COLUMNS
+        assert [f.name for f in fields(ShikonaRecord)] == DIM_SHIKONA_COLUMNS
+        assert [f.name for f in fields(RikishiRecord)] == DIM_RIKISHI_COLUMNS
+
+    def test_same_output_as_dict_rows(self, tmp_path: Path) -> None:
+        records = [_make_bout(day=d, bout_no=b) for d in (10, 2) for b in (11, 3)]
+        write_fact_csv(records, tmp_path / "records.csv")
+        upsert(
+            tmp_path / "dicts.csv",
+            [{k: str(v) for k, v in asdict(r).items()} for r in records],
+            FACT_KEY_COLUMNS, FACT_SORT_COLUMNS, FACT_COLUMNS,
+        )
+        assert (tmp_path / "records.csv").read_bytes() == (tmp_path / "dicts.csv").read_bytes()
+
+    def test_existing_file_with_other_column_order(self, tmp_path: Path) -> None:
+        path = tmp_path / "fact.csv"
+        columns = list(reversed(FACT_COLUMNS))
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, lineterminator="\n")
+            writer.writeheader()
+            writer.writerow({k: str(v) for k, v in asdict(_make_bout(day=2)).items()})
+        update_fact_csv([_make_bout(day=1)], path, False, "honbasho-202501")
+        rows = _read_csv_rows(path)
+        assert list(rows[0]) == FACT_COLUMNS
+        assert [r["day"] for r in rows] == ["1", "2"]
+        assert rows[1]["kimarite"] == "yorikiri"
+
+
 class TestUpdateDimShikonaCsv:
     """Tests for the high-level update_dim_shikona_csv function."""
 
@@ -340,3 +395,210 @@ class TestUpdateDimShikonaCsv:
         assert "10" in rids  # new
         assert "2" in rids   # 202503 preserved
         assert "1" not in rids  # old 202501 removed
+
+
+class TestBatchUpdates:
+    """Tests for the many-event updates used by range runs."""
+
+    def test_fact_batch_matches_per_event_updates(self, tmp_path: Path) -> None:
+        events = {
+            "honbasho-202501": [_make_bout(bout_no=2), _make_bout(bout_no=1)],
+            "honbasho-202501-playoff": [_make_bout(
+                event_id="honbasho-202501-playoff", day=16, bout_no=1,
+            )],
+            "honbasho-202503": [_make_bout(event_id="honbasho-202503", basho="202503")],
+        }
+        per_event = tmp_path / "per_event.csv"
+        batch = tmp_path / "batch.csv"
+        for force in (False, True):
+            for event_id, records in events.items():
+                update_fact_csv(records, per_event, force, event_id)
+            update_fact_csv_batch(events, batch, force)
+            assert batch.read_bytes() == per_event.read_bytes()
+
+    def test_fact_batch_force_replaces_only_given_events(self, tmp_path: Path) -> None:
+        path = tmp_path / "fact.csv"
+        update_fact_csv_batch({
+            "honbasho-202501": [_make_bout(bout_no=1), _make_bout(bout_no=2)],
+            "honbasho-202503": [_make_bout(event_id="honbasho-202503", basho="202503")],
+            "honbasho-202505": [_make_bout(event_id="honbasho-202505", basho="202505")],
+        }, path, force=False)
+        update_fact_csv_batch({
+            "honbasho-202501": [_make_bout(bout_no=1)],
+            "honbasho-202503": [],
+        }, path, force=True)
+        rows = _read_csv_rows(path)
+        assert [(r["event_id"], r["bout_no"]) for r in rows] == [
+            ("honbasho-202501", "1"), ("honbasho-202505", "1"),
+        ]
+
+    def test_dim_batch(self, tmp_path: Path) -> None:
+        path = tmp_path / "dim.csv"
+        update_dim_shikona_csv_batch({
+            "202501": [_make_shikona(rid=1)],
+            "202503": [_make_shikona(rid=2, basho="202503")],
+        }, path, force=False)
+        update_dim_shikona_csv_batch(
+            {"202503": [_make_shikona(rid=3, basho="202503")]}, path, force=True,
+        )
+        rows = _read_csv_rows(path)
+        assert [(r["basho"], r["rid"]) for r in rows] == [("202501", "1"), ("202503", "3")]
+
+
+class TestMergeFactCsv:
+    """Tests for merge_fact_csv(), the streamed update of range runs."""
+
+    @staticmethod
+    def _old() -> list[BoutRecord]:
+        return [
+            _make_bout(event_id="honbasho-202411", basho="202411"),
+            _make_bout(bout_no=1),
+            _make_bout(bout_no=3),
+            _make_bout(event_id="honbasho-202505", basho="202505"),
+        ]
+
+    @staticmethod
+    def _groups() -> list[dict]:
+        return [
+            {
+                "honbasho-202501": [
+                    _make_bout(bout_no=2), _make_bout(bout_no=1, kimarite="oshidashi"),
+                ],
+                "honbasho-202501-playoff": [
+                    _make_bout(event_id="honbasho-202501-playoff", day=16, bout_no=1),
+                ],
+            },
+            {},
+            {"honbasho-202503": [_make_bout(event_id="honbasho-202503", basho="202503")]},
+        ]
+
+    @pytest.mark.parametrize("force", [False, True])
+    def test_matches_batch_update(self, tmp_path: Path, force: bool) -> None:
+        merged, batch = tmp_path / "merged.csv", tmp_path / "batch.csv"
+        write_fact_csv(self._old(), merged)
+        write_fact_csv(self._old(), batch)
+        merge_fact_csv(self._groups(), merged, force)
+        update_fact_csv_batch(
+            {k: v for group in self._groups() for k, v in group.items()}, batch, force,
+        )
+        assert merged.read_bytes() == batch.read_bytes()
+
+    def test_each_group_is_written_before_the_next(self, tmp_path: Path) -> None:
+        path = tmp_path / "fact.csv"
+        write_fact_csv(self._old(), path)
+        tmp = tmp_path / "fact.csv.tmp"
+
+        def groups():
+            first, _, last = self._groups()
+            yield first
+            # Rows up to the playoff are already in the new file
+            assert tmp.exists()
+            yield last
+
+        merge_fact_csv(groups(), path, False)
+        assert [r["event_id"] for r in _read_csv_rows(path)] == [
+            "honbasho-202411", "honbasho-202501", "honbasho-202501", "honbasho-202501",
+            "honbasho-202501-playoff", "honbasho-202503", "honbasho-202505",
+        ]
+
+    def test_unsorted_file_falls_back(self, tmp_path: Path) -> None:
+        merged, batch = tmp_path / "merged.csv", tmp_path / "batch.csv"
+        for path in (merged, batch):
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerow(FACT_COLUMNS)
+                for record in reversed(self._old()):
+                    writer.writerow(asdict(record).values())
+        merge_fact_csv(self._groups(), merged, False)
+        update_fact_csv_batch(
+            {k: v for group in self._groups() for k, v in group.items()}, batch, False,
+        )
+        assert merged.read_bytes() == batch.read_bytes()
+
+    def test_nothing_to_merge(self, tmp_path: Path) -> None:
+        merge_fact_csv([{}, {}], tmp_path / "fact.csv", True)
+        assert not (tmp_path / "fact.csv").exists()
+
+
+class TestReplaceFactDays:
+    def test_replaces_only_given_pages(self, tmp_path: Path) -> None:
+        path = tmp_path / "fact.csv"
+        write_fact_csv([
+            _make_bout(day=1, bout_no=1),
+            _make_bout(day=2, bout_no=1),
+            _make_bout(day=2, bout_no=2),
+            _make_bout(event_id="honbasho-202501-playoff", day=16, bout_no=1),
+        ], path)
+        # Day 2's schedule shrank to one bout
+        replace_fact_days({
+            ("honbasho-202501", 2): [_make_bout(day=2, bout_no=1, kimarite="oshidashi")],
+        }, path)
+        rows = _read_csv_rows(path)
+        assert [(r["event_id"], r["day"], r["bout_no"]) for r in rows] == [
+            ("honbasho-202501", "1", "1"),
+            ("honbasho-202501", "2", "1"),
+            ("honbasho-202501-playoff", "16", "1"),
+        ]
+        assert rows[1]["kimarite"] == "oshidashi"
+
+
+class TestFactIndex:
+    def _live(self, day: int, bout_no: int, kimarite: str = "yorikiri") -> BoutRecord:
+        return _make_bout(
+            event_id="honbasho-202503", basho="202503", day=day, bout_no=bout_no,
+            kimarite=kimarite,
+        )
+
+    def test_tail_rewrite_matches_full_write(self, tmp_path: Path) -> None:
+        path = tmp_path / "fact.csv"
+        expected = tmp_path / "expected.csv"
+        old = [_make_bout(bout_no=1), _make_bout(bout_no=2)]
+        write_fact_csv(old + [self._live(1, 1)], path)
+
+        index = FactIndex(path, ["honbasho-202503", "honbasho-202503-playoff"])
+        assert len(index.rows()) == 1
+        index.replace_days({("honbasho-202503", 1): [self._live(1, 1, "oshidashi")]})
+        index.flush()
+        index.replace_days({("honbasho-202503", 2): [self._live(2, 2), self._live(2, 1)]})
+        index.flush()
+
+        write_fact_csv(
+            old + [self._live(1, 1, "oshidashi"), self._live(2, 1), self._live(2, 2)],
+            expected,
+        )
+        assert path.read_bytes() == expected.read_bytes()
+
+    def test_failed_flush_keeps_previous_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        path = tmp_path / "fact.csv"
+        write_fact_csv([_make_bout(), self._live(1, 1)], path)
+        index = FactIndex(path, ["honbasho-202503"])
+        index.flush()
+        before = path.read_bytes()
+
+        def fail(fd: int) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr(io_csv.os, "fsync", fail)
+        index.replace_days({("honbasho-202503", 2): [self._live(2, 1)]})
+        with pytest.raises(OSError):
+            index.flush()
+        assert path.read_bytes() == before
+        monkeypatch.undo()
+        index.flush()
+        assert [r["day"] for r in _read_csv_rows(path)] == ["1", "1", "2"]
+
+    def test_live_event_not_last(self, tmp_path: Path) -> None:
+        path = tmp_path / "fact.csv"
+        expected = tmp_path / "expected.csv"
+        later = _make_bout(event_id="honbasho-202505", basho="202505")
+        write_fact_csv([later], path)
+
+        index = FactIndex(path, ["honbasho-202503"])
+        for _ in range(2):
+            index.replace_days({("honbasho-202503", 1): [self._live(1, 1)]})
+            index.flush()
+
+        write_fact_csv([self._live(1, 1), later], expected)
+        assert path.read_bytes() == expected.read_bytes()
@@ -0,0 +1,70 @@
+"""Tests for sumodata.journal."""
+
+from pathlib import Path
+
+import pytest
+
+from sumodata.journal import JOURNAL_FILE, JournalError, RunJournal
+from sumodata.models import ShikonaRecord
+
+RUN = {"bashos": ["202501"], "force": False, "playoff": True}
+
+
+def _shikona(rid: int) -> ShikonaRecord:
+    return ShikonaRecord(
+        basho="202501", rid=rid, shikona_at_basho="琴櫻",
+        source_url="https://example.com", division="Makuuchi", rank="Ye",
+    )
+
+
+class TestRunJournal:
+    def test_resume_restores_states_and_records(self, tmp_path: Path) -> None:
+        journal = RunJournal.open(tmp_path / "j", RUN, resume=False)
+        journal.mark("202501", "results_d01", "fetched")
+        journal.save_parsed("202501", "banzuke", [_shikona(1), _shikona(2)])
+        journal.mark("202501", "playoff", "absent")
+        journal.close()
+
+        resumed = RunJournal.open(tmp_path / "j", RUN, resume=True)
+        assert resumed.state("202501", "results_d01") == "fetched"
+        assert resumed.is_parsed("202501", "banzuke")
+        assert resumed.state("202501", "playoff") == "absent"
+        assert resumed.state("202501", "results_d02") is None
+        assert resumed.load_parsed("202501", "banzuke", ShikonaRecord) == [
+            _shikona(1), _shikona(2),
+        ]
+
+    def test_without_resume_starts_over(self, tmp_path: Path) -> None:
+        journal = RunJournal.open(tmp_path / "j", RUN, resume=False)
+        journal.save_parsed("202501", "banzuke", [_shikona(1)])
+        journal.close()
+        fresh = RunJournal.open(tmp_path / "j", RUN, resume=False)
+        assert not fresh.is_parsed("202501", "banzuke")
+
+    def test_resume_other_run_rejected(self, tmp_path: Path) -> None:
+        RunJournal.open(tmp_path / "j", RUN, resume=False).close()
+        with pytest.raises(JournalError):
+            RunJournal.open(tmp_path / "j", {**RUN, "force": True}, resume=True)
+
+    def test_partial_last_line_ignored(self, tmp_path: Path) -> None:
+        journal = RunJournal.open(tmp_path / "j", RUN, resume=False)
+        journal.mark("202501", "results_d01", "fetched")
+        journal.close()
+        with open(tmp_path / "j" / JOURNAL_FILE, "a", encoding="utf-8") as f:
+            f.write('{"basho": "202501", "pa')
+        resumed = RunJournal.open(tmp_path / "j", RUN, resume=True)
+        assert resumed.state("202501", "results_d01") == "fetched"
+
+    def test_committed_and_finish(self, tmp_path: Path) -> None:
+        journal = RunJournal.open(tmp_path / "j", RUN, resume=False)
+        journal.mark_committed(["202501"])
+        journal.close()
+        resumed = RunJournal.open(tmp_path / "j", RUN, resume=True)
+        assert resumed.is_committed("202501")
+        resumed.finish()
+        assert not (tmp_path / "j").exists()
+
+    def test_unknown_state(self, tmp_path: Path) -> None:
+        journal = RunJournal.open(tmp_path / "j", RUN, resume=False)
+        with pytest.raises(ValueError):
+            journal.mark("202501", "banzuke", "done")
@@ -0,0 +1,316 @@
+"""Tests for sumodata.live."""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from sumodata import cli, fetch
+from sumodata.cache import DirectoryCache
+from sumodata.fetch import (
+    DEFAULT_BASE_URL,
+    DEFAULT_RATE,
+    configure_base_url,
+    configure_rate_limit,
+)
+from sumodata.io_csv import FactIndex, write_fact_csv
+from sumodata.live import LiveBasho, final_days, update_live, watch
+from sumodata.models import BoutRecord
+from sumodata.standin import StandinServer
+from sumodata.util import ParseError
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+BASHO = "202501"
+
+
+def _results_page(published: list[int], decided: bool | None) -> str:
+    """Results page with a daytable; ``decided=None`` means no bouts yet."""
+    links = "".join(
+        f'<tr><td><a href="Results.aspx?b={BASHO}&d={d}">Day {d}</a></td></tr>'
+        for d in published
+    )
+    rows = ""
+    if decided is not None:
+        kekka = '<img src="img/hoshi_shiro.gif"/>' if decided else ""
+        kimarite = "yorikiri" if decided else ""
+        rows = (
+            '<table class="tk_table"><tr><td class="tk_kaku" colspan="5">Makuuchi</td></tr>'
+            + "".join(
+                f'<tr><td class="tk_kekka">{kekka}</td>'
+                f'<td class="tk_east"><font size="1">M{n}e</font><br/>'
+                f'<a href="Rikishi.aspx?r={100 + n}">E{n}</a></td>'
+                f'<td class="tk_kim"><font size="1"><br/></font>{kimarite}<br/></td>'
+                f'<td class="tk_west"><font size="1">M{n}w</font><br/>'
+                f'<a href="Rikishi.aspx?r={200 + n}">W{n}</a></td>'
+                f'<td class="tk_kekka"></td></tr>'
+                for n in (1, 2)
+            )
+            + "</table>"
+        )
+    return f'<html><body><table class="daytable">{links}</table>{rows}</body></html>'
+
+
+class LiveSource:
+    """Stand-in source whose days are published and decided step by step."""
+
+    def __init__(self) -> None:
+        self.days: dict[int, bool] = {}  # day -> all bouts decided
+        self._banzuke = (FIXTURES_DIR / "banzuke_sample.html").read_text(encoding="utf-8")
+
+    def get(self, event_id: str, name: str) -> str | None:
+        if name == "banzuke.html":
+            return self._banzuke
+        day = int(name[len("results_d"):-len(".html")])
+        return _results_page(sorted(self.days), self.days.get(day))
+
+
+def _fact_rows(root: Path) -> list[dict]:
+    with open(root / "fact.csv", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class TestUpdateLive:
+    def setup_method(self) -> None:
+        configure_rate_limit(1000)
+
+    def teardown_method(self) -> None:
+        configure_base_url(DEFAULT_BASE_URL)
+        configure_rate_limit(DEFAULT_RATE)
+
+    def _update(self, tmp_path: Path):
+        return update_live(
+            BASHO, tmp_path / "raw", tmp_path / "fact.csv", tmp_path / "dim.csv", True,
+        )
+
+    def test_fetches_only_new_days(self, tmp_path: Path) -> None:
+        source = LiveSource()
+        with StandinServer(source) as server:
+            configure_base_url(server.base_url)
+
+            # Before day 1: one probe, nothing written, banzuke stored once
+            result = self._update(tmp_path)
+            assert result.fetched == [1]
+            assert result.shikona == 3
+            assert not (tmp_path / "fact.csv").exists()
+
+            # Day 1 under way: rows written, page not cached
+            source.days = {1: False}
+            result = self._update(tmp_path)
+            assert result.fetched == [1]
+            assert result.final == []
+            assert {r["result_type"] for r in _fact_rows(tmp_path)} == {"unknown"}
+            day1 = tmp_path / "raw" / f"honbasho-{BASHO}" / "results_d01.html"
+            assert DirectoryCache().get(day1) is None
+
+            # Day 1 over and day 2's schedule out: both fetched, only day 1 cached
+            source.days = {1: True, 2: False}
+            result = self._update(tmp_path)
+            assert result.fetched == [1, 2]
+            assert result.final == [1]
+            assert DirectoryCache().get(day1) is not None
+            assert final_days(tmp_path / "fact.csv", BASHO) == {1}
+
+            # Day 2 over: a single request
+            source.days = {1: True, 2: True}
+            before = server.counts["requests"]
+            result = self._update(tmp_path)
+            assert result.fetched == [2]
+            assert server.counts["requests"] - before == 1
+
+        rows = _fact_rows(tmp_path)
+        assert sorted({(r["day"], r["result_type"]) for r in rows}) == [
+            ("1", "normal"), ("2", "normal"),
+        ]
+        assert len(rows) == 4
+
+    def test_cli_live(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        source = LiveSource()
+        source.days = {1: True}
+        with StandinServer(source) as server:
+            cli.main([
+                "--basho", BASHO, "--live", "--base-url", server.base_url,
+                "--rate", "1000", "--adaptive-rate", "off",
+            ])
+        # Day 1 and the banzuke; day 2 is not in the daytable
+        assert server.counts["pages"] == 2
+        assert (tmp_path / "data" / "fact" / "fact_bout_daily.csv").exists()
+        assert not (tmp_path / "data" / "journal").exists()
+
+    def test_cli_live_needs_single_basho(self) -> None:
+        with pytest.raises(SystemExit):
+            cli.main(["--from", "202501", "--to", "202505", "--live"])
+
+
+def _old_bout(bout_no: int) -> BoutRecord:
+    return BoutRecord(
+        event_id="honbasho-202411", event_type="honbasho_regular", is_regular="T",
+        basho="202411", day=1, division="Makuuchi", bout_no=bout_no,
+        east_rid=1, west_rid=2, winner_side="E", kimarite="yorikiri",
+        east_rank="Y1e", west_rank="O1e", result_type="normal", note="",
+        source_url="", source_row_index=bout_no, fetched_at="",
+    )
+
+
+class TestWatch:
+    def setup_method(self) -> None:
+        configure_rate_limit(1000)
+
+    def teardown_method(self) -> None:
+        configure_base_url(DEFAULT_BASE_URL)
+        configure_rate_limit(DEFAULT_RATE)
+
+    def test_applies_only_changed_pages(self, tmp_path: Path) -> None:
+        fact_path = tmp_path / "fact.csv"
+        write_fact_csv([_old_bout(1), _old_bout(2)], fact_path)
+        source = LiveSource()
+        source.days = {1: False}
+        # What the server shows before each poll after the first
+        steps = {1: {1: False}, 2: {1: True, 2: False}}
+        writes = []
+
+        def on_poll(n: int) -> None:
+            writes.append(fact_path.stat().st_mtime_ns)
+            source.days = steps.get(n, source.days)
+
+        with StandinServer(source) as server:
+            configure_base_url(server.base_url)
+            polls = watch(
+                BASHO, tmp_path / "raw", fact_path, tmp_path / "dim.csv", True,
+                interval=0, max_polls=3, on_poll=on_poll,
+            )
+        assert polls == 3
+        # Poll 2 saw day 1 unchanged (304) and wrote nothing
+        assert server.counts["not_modified"] == 1
+        assert writes[0] == writes[1]
+        assert writes[2] != writes[1]
+
+        rows = _fact_rows(tmp_path)
+        assert [(r["event_id"], r["day"], r["result_type"]) for r in rows] == [
+            ("honbasho-202411", "1", "normal"),
+            ("honbasho-202411", "1", "normal"),
+            (f"honbasho-{BASHO}", "1", "normal"),
+            (f"honbasho-{BASHO}", "1", "normal"),
+            (f"honbasho-{BASHO}", "2", "unknown"),
+            (f"honbasho-{BASHO}", "2", "unknown"),
+        ]
+
+    def test_survives_parse_and_write_errors(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        source = LiveSource()
+        source.days = {1: True}
+        failures = [ParseError("half-rendered page"), OSError("disk full")]
+        poll, flush = LiveBasho.poll, FactIndex.flush
+
+        def failing_poll(self: LiveBasho) -> dict:
+            if failures and isinstance(failures[0], ParseError):
+                raise failures.pop(0)
+            return poll(self)
+
+        def failing_flush(self: FactIndex) -> None:
+            if failures:
+                raise failures.pop(0)
+            flush(self)
+
+        monkeypatch.setattr(LiveBasho, "poll", failing_poll)
+        monkeypatch.setattr(FactIndex, "flush", failing_flush)
+        with StandinServer(source) as server:
+            configure_base_url(server.base_url)
+            polls = watch(
+                BASHO, tmp_path / "raw", tmp_path / "fact.csv", tmp_path / "dim.csv", True,
+                interval=0, max_polls=3,
+            )
+        assert polls == 3
+        # Day 1 was applied on poll 2 but its write failed; poll 3 saw no
+        # change (304) and still wrote it
+        assert [r["day"] for r in _fact_rows(tmp_path)] == ["1", "1"]
+
+    def test_fetch_error_mid_poll_keeps_earlier_days(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(fetch, "BACKOFF_BASE", 0)
+        source = LiveSource()
+        source.days = {1: True, 2: True}
+        missing = ["results_d02.html"]  # day 2 fails on the first poll only
+
+        class FlakySource:
+            def get(self, event_id: str, name: str) -> str | None:
+                if name in missing:
+                    return None
+                return source.get(event_id, name)
+
+        def on_poll(n: int) -> None:
+            missing.clear()
+
+        with StandinServer(FlakySource()) as server:
+            configure_base_url(server.base_url)
+            polls = watch(
+                BASHO, tmp_path / "raw", tmp_path / "fact.csv", tmp_path / "dim.csv", True,
+                interval=0, max_polls=2, on_poll=on_poll,
+            )
+        assert polls == 2
+        # Day 1 turned final on the failed poll; it is still written
+        assert [r["day"] for r in _fact_rows(tmp_path)] == ["1", "1", "2", "2"]
+
+    def test_does_not_stop_before_the_write(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        source = LiveSource()
+        source.days = {d: True for d in range(1, 16)}
+        failures = [OSError("disk full")]
+        flush = FactIndex.flush
+
+        def failing_flush(self: FactIndex) -> None:
+            if failures:
+                raise failures.pop()
+            flush(self)
+
+        monkeypatch.setattr(FactIndex, "flush", failing_flush)
+        with StandinServer(source) as server:
+            configure_base_url(server.base_url)
+            polls = watch(
+                BASHO, tmp_path / "raw", tmp_path / "fact.csv", tmp_path / "dim.csv", True,
+                interval=0,
+            )
+        # Every day was final on poll 1, whose write failed
+        assert polls == 2
+        assert len(_fact_rows(tmp_path)) == 30
+
+    def test_stops_when_complete(self, tmp_path: Path) -> None:
+        source = LiveSource()
+        source.days = {d: True for d in range(1, 16)}
+        with StandinServer(source) as server:
+            configure_base_url(server.base_url)
+            polls = watch(
+                BASHO, tmp_path / "raw", tmp_path / "fact.csv", tmp_path / "dim.csv", True,
+                interval=0, max_polls=5,
+            )
+        # All 15 days and the banzuke; day 15 links no playoff
+        assert polls == 1
+        assert server.counts["pages"] == 16
+        assert len(_fact_rows(tmp_path)) == 30
+
+    def test_cli_watch(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        source = LiveSource()
+        source.days = {1: False}
+        with StandinServer(source) as server:
+            cli.main([
+                "watch", "--basho", BASHO, "--interval", "0", "--max-polls", "2",
+                "--base-url", server.base_url, "--rate", "1000", "--adaptive-rate", "off",
+                "--metrics-json", "metrics.json",
+            ])
+        assert server.counts["not_modified"] == 1
+        assert (tmp_path / "metrics.json").exists()
+        assert (tmp_path / "data" / "fact" / "fact_bout_daily.csv").exists()
@@ -0,0 +1,91 @@
+"""Tests for sumodata.metrics."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from sumodata.metrics import FetchMetrics, Histogram
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self) -> None:
+        h = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            h.observe(value)
+        assert h.cumulative() == [("0.1", 2), ("1", 3), ("+Inf", 4)]
+        assert h.count == 4
+        assert h.sum == pytest.approx(3.65)
+
+
+class TestFetchMetrics:
+    def _sample(self) -> FetchMetrics:
+        m = FetchMetrics()
+        m.record_response(200, 0.2, size=1000)
+        m.record_response(503, 0.1)
+        m.record_response("error", 0.3)
+        m.record_backoff(2.0)
+        m.record_rate_wait(0.5)
+        m.record_cache("hit")
+        m.record_cache("miss")
+        m.record_cache("not_modified")
+        return m
+
+    def test_to_dict(self) -> None:
+        data = self._sample().to_dict()
+        assert data["requests"] == 3
+        assert data["responses"] == {"200": 1, "503": 1, "error": 1}
+        assert data["bytes_downloaded"] == 1000
+        assert data["retries"] == 1
+        assert data["backoff_seconds"] == 2.0
+        assert data["rate_wait_seconds"] == 0.5
+        assert data["cache"] == {"hit": 1, "miss": 1, "not_modified": 1, "modified": 0}
+        assert data["cache_hit_rate"] == pytest.approx(2 / 3)
+        assert data["latency_seconds"]["buckets"]["+Inf"] == 3
+
+    def test_empty_hit_rate(self) -> None:
+        assert FetchMetrics().to_dict()["cache_hit_rate"] is None
+
+    def test_phase_accumulates(self) -> None:
+        m = FetchMetrics()
+        with m.phase("parse"):
+            pass
+        with m.phase("parse"):
+            pass
+        assert list(m.to_dict()["phase_seconds"]) == ["parse"]
+
+    def test_reset(self) -> None:
+        m = self._sample()
+        m.reset()
+        assert m.to_dict()["requests"] == 0
+        assert m.to_dict()["responses"] == {}
+
+    def test_prometheus_format(self) -> None:
+        text = self._sample().to_prometheus()
+        assert "# TYPE sumodata_request_latency_seconds histogram" in text
+        assert 'sumodata_request_latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "sumodata_request_latency_seconds_count 3" in text
+        assert 'sumodata_http_responses_total{status="503"} 1' in text
+        assert 'sumodata_cache_lookups_total{outcome="hit"} 1' in text
+        assert "sumodata_downloaded_bytes_total 1000" in text
+        assert text.endswith("\n")
+
+    def test_prometheus_values_are_exact(self) -> None:
+        m = FetchMetrics()
+        m.record_response(200, 0.25, size=12345678)
+        m.record_backoff(1234567.5)
+        text = m.to_prometheus()
+        assert "sumodata_downloaded_bytes_total 12345678\n" in text
+        assert "sumodata_backoff_seconds_total 1234567.5\n" in text
+        assert "sumodata_request_latency_seconds_sum 0.25\n" in text
+
+    def test_write_files(self, tmp_path: Path) -> None:
+        m = self._sample()
+        m.write_json(tmp_path / "out" / "metrics.json")
+        m.write_prometheus(tmp_path / "out" / "sumodata.prom")
+        data = json.loads((tmp_path / "out" / "metrics.json").read_text(encoding="utf-8"))
+        assert data["retries"] == 1
+        assert (tmp_path / "out" / "sumodata.prom").read_text(encoding="utf-8").startswith("# HELP")
+        assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [
+            "metrics.json", "sumodata.prom",
+        ]
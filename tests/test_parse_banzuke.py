@@ -11,6 +11,10 @@ class TestParseBanzukePage:
         source_url="https://example.com/banzuke",
     )
 
+    def test_strained_matches_full(self, banzuke_multi_division_html: str) -> None:
+        full = parse_banzuke_page(banzuke_multi_division_html, strained=False, **self._COMMON)
+        assert parse_banzuke_page(banzuke_multi_division_html, **self._COMMON) == full
+
     def test_correct_number_of_records(self, banzuke_sample_html: str) -> None:
         records = parse_banzuke_page(html=banzuke_sample_html, **self._COMMON)
         assert len(records) == 3
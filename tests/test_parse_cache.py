@@ -0,0 +1,97 @@
+"""Tests for sumodata.parse_cache."""
+
+from pathlib import Path
+
+import pytest
+
+from sumodata import parse_cache, pipeline
+from sumodata.metrics import get_metrics
+from sumodata.parse_cache import ParseCache
+from sumodata.parsers import configure_parser
+from sumodata.pipeline import PipelineOptions, iter_basho
+from tests.conftest import CacheBasho
+
+
+class TestParseCache:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        cache = ParseCache.open(tmp_path)
+        key = ParseCache.key("<html></html>", "202501", 1)
+        assert cache.get(key) is None
+        cache.put(key, (["a", "b"], [1, 2]))
+        assert cache.get(key) == (["a", "b"], [1, 2])
+
+    def test_key_depends_on_context_and_version(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        key = ParseCache.key("<html></html>", "202501", 1)
+        assert ParseCache.key("<html> </html>", "202501", 1) != key
+        assert ParseCache.key("<html></html>", "202501", 2) != key
+        monkeypatch.setattr(parse_cache, "PARSER_VERSION", parse_cache.PARSER_VERSION + 1)
+        assert ParseCache.key("<html></html>", "202501", 1) != key
+
+    def test_unreadable_entry_is_a_miss(self, tmp_path: Path) -> None:
+        cache = ParseCache.open(tmp_path)
+        key = ParseCache.key("", "202501", 1)
+        cache.path(key).parent.mkdir(parents=True)
+        cache.path(key).write_bytes(b"not zlib")
+        assert cache.get(key) is None
+
+    def test_open_drops_other_versions(self, tmp_path: Path) -> None:
+        (tmp_path / "v0").mkdir()
+        (tmp_path / "keep").mkdir()
+        cache = ParseCache.open(tmp_path)
+        cache.put(ParseCache.key("", "x"), 1)
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "keep", f"v{parse_cache.PARSER_VERSION}",
+        ]
+
+
+class TestPipelineParseCache:
+    @pytest.mark.parametrize("pool", ["thread", "process"])
+    def test_warm_run_skips_parser(
+        self,
+        pool: str,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        cache_basho: CacheBasho,
+    ) -> None:
+        raw_dir = tmp_path / "raw"
+        cache_basho(raw_dir, "202501")
+        cache = ParseCache.open(tmp_path / "parsed")
+        options = PipelineOptions(parse_workers=2, parse_pool=pool)
+        [cold] = iter_basho(["202501"], raw_dir, options, parsed=cache)
+
+        class NoParser:
+            name = "bs4"
+
+            def __getattr__(self, name: str):
+                def parse(*args: object) -> None:
+                    raise AssertionError(f"{name} called with a warm parse cache")
+                return parse
+
+        monkeypatch.setattr(pipeline, "get_parser", NoParser)
+        metrics = get_metrics()
+        metrics.reset()
+        [warm] = iter_basho(["202501"], raw_dir, PipelineOptions(), parsed=cache)
+
+        # Banzuke, 15 days and day 15's playoff check
+        assert metrics.to_dict()["parse_cache"] == {"hit": 17, "miss": 0}
+        assert warm.shikona == cold.shikona
+        assert len(warm.bouts) == len(cold.bouts)
+        for w, c in zip(warm.bouts, cold.bouts):
+            assert w.fetched_at >= c.fetched_at
+            w.fetched_at = c.fetched_at
+        assert warm.bouts == cold.bouts
+
+    def test_other_parser_misses(self, tmp_path: Path, cache_basho: CacheBasho) -> None:
+        pytest.importorskip("lxml")
+        raw_dir = tmp_path / "raw"
+        cache_basho(raw_dir, "202501")
+        cache = ParseCache.open(tmp_path / "parsed")
+        list(iter_basho(["202501"], raw_dir, PipelineOptions(), parsed=cache))
+        metrics = get_metrics()
+        metrics.reset()
+        configure_parser("lxml")
+        try:
+            list(iter_basho(["202501"], raw_dir, PipelineOptions(), parsed=cache))
+        finally:
+            configure_parser("bs4")
+        assert metrics.to_dict()["parse_cache"] == {"hit": 0, "miss": 17}
@@ -1,6 +1,12 @@
 """Tests for sumodata.parse_results."""
 
-from sumodata.parse_results import detect_playoff, parse_results_page
+from sumodata.parse_results import (
+    BoutCounts,
+    detect_playoff,
+    parse_results_page,
+    published_days,
+    read_results_page,
+)
 
 
 class TestParseResultsPage:
@@ -218,3 +224,75 @@ class TestDetectPlayoff:
     def test_wrong_basho_no_match(self, results_sample_html: str) -> None:
         """Playoff link for different basho should not match."""
         assert detect_playoff(results_sample_html, "202503") is False
+
+
+class TestPublishedDays:
+    """Tests for published_days()."""
+
+    def test_days_from_daytable(self, results_sample_html: str) -> None:
+        # Playoff link (d=16) is not a regular day
+        assert published_days(results_sample_html, "202501") == {1, 15}
+
+    def test_other_basho_ignored(self, results_sample_html: str) -> None:
+        assert published_days(results_sample_html, "202503") == set()
+
+    def test_no_daytable(self) -> None:
+        assert published_days("<html><body></body></html>", "202501") == set()
+
+
+class TestReadResultsPage:
+    """Tests for read_results_page(): one parse, every extraction."""
+
+    def test_everything_from_one_parse(self, results_sample_html: str) -> None:
+        page = read_results_page(results_sample_html)
+        assert page.divisions == ["Makuuchi"]
+        assert page.published_days("202501") == {1, 15}
+        assert page.has_playoff("202501") is True
+        assert page.has_playoff("202503") is False
+        assert page.day_links == [("202501", 1), ("202501", 15), ("202501", 16)]
+
+    def test_bouts_match_parse_results_page(self, results_multi_division_html: str) -> None:
+        common = TestParseResultsPage._COMMON
+        page = read_results_page(results_multi_division_html)
+        expected = parse_results_page(html=results_multi_division_html, **common)
+        assert page.bouts(**common) == expected
+        # The page can be turned into records more than once
+        assert page.bouts(**common) == expected
+
+    def test_strained_matches_full(self, results_sample_html: str) -> None:
+        common = TestParseResultsPage._COMMON
+        full = read_results_page(results_sample_html, strained=False)
+        page = read_results_page(results_sample_html)
+        assert page.bouts(**common) == full.bouts(**common)
+        assert (page.day_links, page.playoff_links, page.title) == (
+            full.day_links, full.playoff_links, full.title,
+        )
+
+    def test_title(self) -> None:
+        page = read_results_page("<html><head><title> SumoDB Results </title></head></html>")
+        assert page.title == "SumoDB Results"
+        assert page.tables == []
+
+
+class TestBoutCounts:
+    """Tests for BoutCounts."""
+
+    def test_counts_as_records_are_yielded(self, results_multi_division_html: str) -> None:
+        counts = BoutCounts()
+        stream = counts.count(
+            parse_results_page(html=results_multi_division_html, **TestParseResultsPage._COMMON),
+        )
+        first = next(stream)
+        assert counts.total == 1
+        assert counts.divisions == {first.division: 1}
+        rest = list(stream)
+        assert counts.total == 1 + len(rest)
+        assert set(counts.divisions) == {"Makuuchi", "Juryo"}
+
+    def test_counts_exceptions(self, results_kyujo_html: str) -> None:
+        counts = BoutCounts()
+        records = list(counts.count(
+            parse_results_page(html=results_kyujo_html, **TestParseResultsPage._COMMON),
+        ))
+        assert counts.exceptions == sum(r.result_type == "kyujo" for r in records) > 0
+        assert counts.summary().endswith(f"exceptions={counts.exceptions}")
@@ -0,0 +1,30 @@
+"""Tests for sumodata.parse_rikishi."""
+
+import pytest
+
+from sumodata.parse_rikishi import parse_rikishi_page
+from sumodata.util import ParseError
+
+
+class TestParseRikishiPage:
+    """Tests for parse_rikishi_page()."""
+
+    _COMMON = dict(
+        rid=12270,
+        source_url="https://example.com/rikishi",
+        updated_at="2025-01-27T00:00:00+00:00",
+    )
+
+    def test_current_shikona(self, rikishi_sample_html: str) -> None:
+        record = parse_rikishi_page(html=rikishi_sample_html, **self._COMMON)
+        assert record.current_shikona == "Kotozakura Masakatsu"
+
+    def test_passes_through_fields(self, rikishi_sample_html: str) -> None:
+        record = parse_rikishi_page(html=rikishi_sample_html, **self._COMMON)
+        assert record.rid == 12270
+        assert record.source_url == "https://example.com/rikishi"
+        assert record.updated_at == "2025-01-27T00:00:00+00:00"
+
+    def test_missing_profile_raises(self) -> None:
+        with pytest.raises(ParseError):
+            parse_rikishi_page(html="<html><body></body></html>", **self._COMMON)
@@ -0,0 +1,94 @@
+"""Tests for sumodata.parsers and the lxml backend."""
+
+import pytest
+
+from sumodata import parse_banzuke, parse_lxml, parse_results
+from sumodata.parsers import LxmlParser, SoupParser, configure_parser, get_parser
+from sumodata.util import ParseError
+from tests.conftest import FIXTURES_DIR
+
+RESULTS_FIXTURES = sorted(FIXTURES_DIR.glob("results_*.html"))
+BANZUKE_FIXTURES = sorted(FIXTURES_DIR.glob("banzuke_*.html"))
+
+
+def _parse_results(module, html: str, day: int = 1) -> list:
+    return module.parse_results_page(
+        html=html, event_id="202501-01", event_type="honbasho_regular",
+        is_regular="T", basho="202501", day=day,
+        source_url="https://example.com", fetched_at="2025-01-12T00:00:00",
+    )
+
+
+class TestConfigureParser:
+    """Tests for configure_parser() / get_parser()."""
+
+    def teardown_method(self) -> None:
+        configure_parser("bs4")
+
+    def test_default_is_bs4(self) -> None:
+        assert isinstance(get_parser(), SoupParser)
+
+    def test_select_lxml(self) -> None:
+        pytest.importorskip("lxml")
+        configure_parser("lxml")
+        assert isinstance(get_parser(), LxmlParser)
+
+    def test_unknown_parser(self) -> None:
+        with pytest.raises(ParseError):
+            configure_parser("html5lib")
+
+
+class TestLxmlMatchesSoup:
+    """The lxml backend must produce exactly what the bs4 parser does."""
+
+    @pytest.fixture(autouse=True)
+    def _need_lxml(self) -> None:
+        pytest.importorskip("lxml")
+
+    @pytest.mark.parametrize("path", RESULTS_FIXTURES, ids=lambda p: p.name)
+    @pytest.mark.parametrize("day", [1, 16])
+    def test_results(self, path, day: int) -> None:
+        html = path.read_text(encoding="utf-8")
+        expected = _parse_results(parse_results, html, day)
+        assert expected
+        assert _parse_results(parse_lxml, html, day) == expected
+
+    @pytest.mark.parametrize("path", RESULTS_FIXTURES, ids=lambda p: p.name)
+    def test_daytable(self, path) -> None:
+        html = path.read_text(encoding="utf-8")
+        for basho in ("202501", "202401"):
+            assert parse_lxml.published_days(html, basho) == parse_results.published_days(html, basho)
+            assert parse_lxml.detect_playoff(html, basho) == parse_results.detect_playoff(html, basho)
+
+    @pytest.mark.parametrize("path", RESULTS_FIXTURES, ids=lambda p: p.name)
+    def test_page_metadata(self, path) -> None:
+        html = path.read_text(encoding="utf-8")
+        soup, fast = parse_results.read_results_page(html), parse_lxml.read_results_page(html)
+        assert fast.divisions == soup.divisions
+        assert fast.day_links == soup.day_links
+        assert fast.playoff_links == soup.playoff_links
+        assert fast.title == soup.title
+
+    @pytest.mark.parametrize("path", BANZUKE_FIXTURES, ids=lambda p: p.name)
+    def test_banzuke(self, path) -> None:
+        html = path.read_text(encoding="utf-8")
+        expected = parse_banzuke.parse_banzuke_page(html, "202501", "https://example.com")
+        assert expected
+        assert parse_lxml.parse_banzuke_page(html, "202501", "https://example.com") == expected
+
+    def test_kimarite_after_br(self) -> None:
+        html = (
+            '<table class="tk_table"><tr><td class="tk_kaku">Makuuchi</td></tr>'
+            '<tr><td class="tk_kekka"><img src="img/hoshi_shiro.gif"></td>'
+            '<td class="tk_east"><a href="Rikishi.aspx?r=1">A</a></td>'
+            '<td class="tk_kim"><font size="1"></font><br> yorikiri <br>(1-0)</td>'
+            '<td class="tk_west"><a href="Rikishi.aspx?r=2">B</a></td>'
+            '<td class="tk_kekka"><img src="img/hoshi_kuro.gif"></td></tr></table>'
+        )
+        expected = _parse_results(parse_results, html)
+        assert expected[0].kimarite == "yorikiri"
+        assert _parse_results(parse_lxml, html) == expected
+
+    def test_empty_page(self) -> None:
+        assert _parse_results(parse_lxml, "") == []
+        assert parse_lxml.published_days("", "202501") == set()
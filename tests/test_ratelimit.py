@@ -0,0 +1,128 @@
+"""Tests for sumodata.ratelimit."""
+
+import asyncio
+
+import pytest
+
+from sumodata.ratelimit import AdaptiveRateController, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    def test_first_request_is_immediate(self) -> None:
+        bucket = TokenBucket(rate=2.0, clock=FakeClock())
+        assert bucket.reserve() == 0.0
+
+    def test_back_to_back_requests_are_spaced(self) -> None:
+        bucket = TokenBucket(rate=2.0, clock=FakeClock())
+        bucket.reserve()
+        assert bucket.reserve() == pytest.approx(0.5)
+        assert bucket.reserve() == pytest.approx(1.0)  # queued behind the second
+
+    def test_tokens_refill_over_time(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, clock=clock)
+        bucket.reserve()
+        clock.now = 0.5
+        assert bucket.reserve() == 0.0
+
+    def test_burst_caps_idle_accumulation(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=2, clock=clock)
+        clock.now = 100.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(1.0)
+
+    def test_invalid_rate(self) -> None:
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_concurrent_acquires_queue_up(self) -> None:
+        bucket = TokenBucket(rate=100.0)
+        waits = asyncio.run(_acquire_concurrently(bucket, 3))
+        assert waits[0] == 0.0
+        assert waits[2] > waits[1] > 0
+
+    def test_pause_holds_back_next_caller(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, clock=clock)
+        bucket.pause(10.0)
+        assert bucket.reserve() == pytest.approx(10.5)
+
+    def test_set_rate_keeps_earned_tokens(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=5, clock=clock)
+        for _ in range(5):
+            bucket.reserve()
+        clock.now = 2.0  # two tokens earned at the old rate
+        bucket.set_rate(10.0)
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.1)
+
+
+class TestAdaptiveRateController:
+    def _controller(self, clock: FakeClock, rate: float = 1.0) -> AdaptiveRateController:
+        return AdaptiveRateController(
+            TokenBucket(rate, clock=clock), max_rate=2.0, min_rate=0.1, clock=clock,
+        )
+
+    def test_additive_increase_up_to_ceiling(self) -> None:
+        ctl = self._controller(FakeClock())
+        for _ in range(5):
+            ctl.on_success(0.2)
+        assert ctl.rate == pytest.approx(1.5)
+        for _ in range(20):
+            ctl.on_success(0.2)
+        assert ctl.rate == 2.0
+
+    def test_throttle_halves_rate(self) -> None:
+        ctl = self._controller(FakeClock())
+        ctl.on_throttle(429)
+        assert ctl.rate == pytest.approx(0.5)
+
+    def test_slow_response_backs_off(self) -> None:
+        ctl = self._controller(FakeClock())
+        ctl.on_success(10.0)
+        assert ctl.rate == pytest.approx(0.5)
+
+    def test_connection_error_backs_off(self) -> None:
+        ctl = self._controller(FakeClock())
+        ctl.on_error()
+        assert ctl.rate == pytest.approx(0.5)
+
+    def test_decreases_coalesced_within_cooldown(self) -> None:
+        clock = FakeClock()
+        ctl = self._controller(clock)
+        ctl.on_throttle(503)
+        ctl.on_throttle(503)
+        assert ctl.rate == pytest.approx(0.5)
+        clock.now = 5.0
+        ctl.on_throttle(503)
+        assert ctl.rate == pytest.approx(0.25)
+
+    def test_never_below_min_rate(self) -> None:
+        clock = FakeClock()
+        ctl = self._controller(clock)
+        for i in range(20):
+            clock.now = i * 10.0
+            ctl.on_error()
+        assert ctl.rate == pytest.approx(0.1)
+
+    def test_retry_after_pauses_bucket(self) -> None:
+        clock = FakeClock()
+        ctl = self._controller(clock)
+        ctl.on_throttle(429, retry_after=30.0)
+        assert ctl.bucket.reserve() >= 30.0
+
+
+async def _acquire_concurrently(bucket: TokenBucket, n: int) -> list[float]:
+    return list(await asyncio.gather(*(bucket.acquire() for _ in range(n))))
@@ -0,0 +1,141 @@
+"""Tests for sumodata.reparse."""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from sumodata import cli, fetch
+from sumodata.cache import CacheMeta, DirectoryCache
+from sumodata.fetch import results_url
+from sumodata.pipeline import PLAYOFF_DAY, PipelineOptions, page_cache_path
+from sumodata.reparse import cached_bashos, reparse
+from sumodata.util import FetchError
+from tests.conftest import FIXTURES_DIR, CacheBasho
+
+FETCHED_AT = "2025-01-27T00:00:00+00:00"
+
+
+def _put(raw_dir: Path, basho: str, day: int, fixture: str) -> None:
+    DirectoryCache().put(
+        page_cache_path(raw_dir, basho, day),
+        (FIXTURES_DIR / fixture).read_text(encoding="utf-8"),
+        CacheMeta(results_url(basho, day), FETCHED_AT),
+    )
+
+
+def _link_playoff(raw_dir: Path, basho: str) -> None:
+    """Make day 15 of ``basho`` link a playoff page (not cached)."""
+    _put(raw_dir, basho, 15, "results_sample.html")
+
+
+def _rows(path: Path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class TestCachedBashos:
+    def test_only_complete_basho(self, tmp_path: Path, cache_basho: CacheBasho) -> None:
+        cache_basho(tmp_path, "202501")
+        cache_basho(tmp_path, "202503", range(1, 10))
+        assert cached_bashos(tmp_path) == ["202501"]
+
+    def test_empty(self, tmp_path: Path) -> None:
+        assert cached_bashos(tmp_path / "missing") == []
+
+    def test_needs_linked_playoff(self, tmp_path: Path, cache_basho: CacheBasho) -> None:
+        cache_basho(tmp_path, "202501")
+        cache_basho(tmp_path, "202503")
+        _link_playoff(tmp_path, "202501")
+        assert cached_bashos(tmp_path) == ["202503"]
+        assert cached_bashos(tmp_path, playoff=False) == ["202501", "202503"]
+
+        _put(tmp_path, "202501", PLAYOFF_DAY, "results_sample.html")
+        assert cached_bashos(tmp_path) == ["202501", "202503"]
+
+
+class TestReparse:
+    def test_rebuilds_tables_from_cache(self, tmp_path: Path, cache_basho: CacheBasho) -> None:
+        raw_dir = tmp_path / "raw"
+        cache_basho(raw_dir, "202501")
+        fact, dim = tmp_path / "fact.csv", tmp_path / "dim.csv"
+        result = reparse(["202501"], raw_dir, fact, dim, PipelineOptions(parse_workers=2))
+
+        rows = _rows(fact)
+        assert result.bouts == len(rows) > 0
+        assert {r["event_id"] for r in rows} == {"honbasho-202501"}
+        assert {int(r["day"]) for r in rows} == set(range(1, 16))
+        assert result.shikona == len(_rows(dim)) > 0
+
+    def test_replaces_existing_rows(self, tmp_path: Path, cache_basho: CacheBasho) -> None:
+        raw_dir = tmp_path / "raw"
+        cache_basho(raw_dir, "202501")
+        fact, dim = tmp_path / "fact.csv", tmp_path / "dim.csv"
+        options = PipelineOptions()
+        reparse(["202501"], raw_dir, fact, dim, options)
+        first = _rows(fact)
+        reparse(["202501"], raw_dir, fact, dim, options)
+        assert len(_rows(fact)) == len(first)
+
+    def test_missing_page_is_not_fetched(self, tmp_path: Path, cache_basho: CacheBasho) -> None:
+        raw_dir = tmp_path / "raw"
+        cache_basho(raw_dir, "202501", range(1, 15))
+        with pytest.raises(FetchError, match="offline"):
+            reparse(
+                ["202501"], raw_dir, tmp_path / "fact.csv", tmp_path / "dim.csv",
+                PipelineOptions(),
+            )
+
+    def test_offline_is_reset(self, tmp_path: Path) -> None:
+        with pytest.raises(FetchError):
+            reparse(
+                ["202501"], tmp_path, tmp_path / "fact.csv", tmp_path / "dim.csv",
+                PipelineOptions(),
+            )
+        assert not fetch._offline
+
+    def test_rikishi_profiles(self, tmp_path: Path) -> None:
+        raw_dir = tmp_path / "raw"
+        DirectoryCache().put(
+            raw_dir / "rikishi" / "r12270.html",
+            (FIXTURES_DIR / "rikishi_sample.html").read_text(encoding="utf-8"),
+            CacheMeta("u", FETCHED_AT),
+        )
+        rikishi = tmp_path / "rikishi.csv"
+        result = reparse(
+            [], raw_dir, tmp_path / "fact.csv", tmp_path / "dim.csv",
+            PipelineOptions(parse_pool="thread"), rikishi,
+        )
+        rows = _rows(rikishi)
+        assert result.rikishi == 1
+        assert rows[0]["rid"] == "12270"
+        assert rows[0]["updated_at"] == FETCHED_AT
+
+
+class TestReparseCli:
+    def test_all(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, cache_basho: CacheBasho,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        cache_basho(tmp_path / "data" / "raw", "202501")
+        cli.main(["reparse", "--all", "--parse-workers", "2", "--parse-pool", "thread"])
+        assert _rows(tmp_path / "data" / "fact" / "fact_bout_daily.csv")
+        assert _rows(tmp_path / "data" / "dim" / "dim_shikona_by_basho.csv")
+
+    def test_all_skips_uncached_playoff(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, cache_basho: CacheBasho,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        raw_dir = tmp_path / "data" / "raw"
+        cache_basho(raw_dir, "202501")
+        cache_basho(raw_dir, "202503")
+        _link_playoff(raw_dir, "202501")
+        cli.main(["reparse", "--all", "--parse-pool", "thread", "--rikishi", "off"])
+        rows = _rows(tmp_path / "data" / "fact" / "fact_bout_daily.csv")
+        assert {r["basho"] for r in rows} == {"202503"}
+
+    def test_needs_a_target(self) -> None:
+        with pytest.raises(SystemExit):
+            cli.main(["reparse"])
@@ -0,0 +1,138 @@
+"""Tests for sumodata.rikishi."""
+
+import csv
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from sumodata import fetch
+from sumodata.fetch import (
+    DEFAULT_BASE_URL,
+    DEFAULT_RATE,
+    configure_base_url,
+    configure_rate_limit,
+)
+from sumodata.io_csv import write_fact_csv
+from sumodata.models import BoutRecord
+from sumodata.rikishi import plan_refresh, refresh_rikishi
+from sumodata.standin import FixtureSource, StandinServer
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+NOW = datetime(2025, 3, 1, tzinfo=timezone.utc)
+TTL = timedelta(days=90)
+
+
+def _bout(bout_no: int, east_rid: int, west_rid: int) -> BoutRecord:
+    return BoutRecord(
+        event_id="honbasho-202501", event_type="honbasho_regular", is_regular="T",
+        basho="202501", day=1, division="Makuuchi", bout_no=bout_no,
+        east_rid=east_rid, west_rid=west_rid, winner_side="E", kimarite="oshidashi",
+        east_rank="Y1e", west_rank="O1e", result_type="normal", note="",
+        source_url="", source_row_index=bout_no, fetched_at="",
+    )
+
+
+class TestPlanRefresh:
+    def test_splits_new_and_stale(self) -> None:
+        known = {
+            1: {"updated_at": (NOW - timedelta(days=10)).isoformat()},
+            2: {"updated_at": (NOW - timedelta(days=100)).isoformat()},
+            3: {"updated_at": "garbage"},
+            9: {"updated_at": (NOW - timedelta(days=500)).isoformat()},
+        }
+        plan = plan_refresh({1, 2, 3, 4, 5}, known, TTL, NOW)
+        assert plan.new == [4, 5]
+        assert plan.stale == [2, 3]
+        assert len(plan) == 4
+
+    def test_naive_timestamps_are_utc(self) -> None:
+        known = {1: {"updated_at": "2024-12-30T00:00:00"}}
+        assert plan_refresh({1}, known, TTL, NOW).stale == []
+
+
+class TestRefreshRikishi:
+    def setup_method(self) -> None:
+        configure_rate_limit(1000)
+
+    def teardown_method(self) -> None:
+        configure_base_url(DEFAULT_BASE_URL)
+        configure_rate_limit(DEFAULT_RATE)
+
+    def test_fetches_only_the_delta(self, tmp_path: Path) -> None:
+        fact_path = tmp_path / "fact.csv"
+        dim_path = tmp_path / "dim_rikishi.csv"
+        raw_dir = tmp_path / "raw"
+        write_fact_csv([_bout(1, 12270, 12451), _bout(2, 11980, 0)], fact_path)
+        source = FixtureSource(FIXTURES_DIR, rikishi="rikishi_sample.html")
+
+        with StandinServer(source) as server:
+            configure_base_url(server.base_url)
+            assert refresh_rikishi(fact_path, dim_path, raw_dir, True, TTL, now=NOW) == 3
+            assert server.counts["pages"] == 3
+
+            # Nothing new, nothing expired
+            assert refresh_rikishi(fact_path, dim_path, raw_dir, True, TTL, now=NOW) == 0
+
+            # One new rid is fetched; the others are still fresh
+            write_fact_csv([_bout(1, 12270, 12451), _bout(2, 11980, 13000)], fact_path)
+            assert refresh_rikishi(fact_path, dim_path, raw_dir, True, TTL, now=NOW) == 1
+            assert server.counts["pages"] == 4
+
+            # Past the TTL every profile is revalidated against the cache
+            later = datetime.now(timezone.utc) + TTL
+            assert refresh_rikishi(fact_path, dim_path, raw_dir, True, TTL, now=later) == 4
+            assert server.counts["not_modified"] == 4
+            assert server.counts["pages"] == 4
+
+        with open(dim_path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [r["rid"] for r in rows] == ["11980", "12270", "12451", "13000"]
+        assert {r["current_shikona"] for r in rows} == {"Kotozakura Masakatsu"}
+        assert rows[0]["source_url"] == f"{server.base_url}/Rikishi.aspx?r=11980"
+        assert (raw_dir / "rikishi" / "r12270.html").exists()
+
+    def test_unparsable_profile_is_skipped(self, tmp_path: Path) -> None:
+        fact_path = tmp_path / "fact.csv"
+        dim_path = tmp_path / "dim_rikishi.csv"
+        write_fact_csv([_bout(1, 11980, 12270), _bout(2, 12451, 0)], fact_path)
+
+        class BrokenProfile(FixtureSource):
+            def get(self, event_id: str, name: str) -> str | None:
+                if name == "r12270.html":
+                    return "<html><body>Under maintenance</body></html>"
+                return super().get(event_id, name)
+
+        source = BrokenProfile(FIXTURES_DIR, rikishi="rikishi_sample.html")
+        with StandinServer(source) as server:
+            configure_base_url(server.base_url)
+            assert refresh_rikishi(
+                fact_path, dim_path, tmp_path / "raw", False, TTL, concurrency=1, now=NOW,
+            ) == 2
+
+        with open(dim_path, encoding="utf-8", newline="") as f:
+            assert [r["rid"] for r in csv.DictReader(f)] == ["11980", "12451"]
+
+    def test_unfetchable_profile_is_skipped(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(fetch, "BACKOFF_BASE", 0)
+        fact_path = tmp_path / "fact.csv"
+        dim_path = tmp_path / "dim_rikishi.csv"
+        write_fact_csv([_bout(1, 11980, 12270), _bout(2, 12451, 0)], fact_path)
+
+        class MissingProfile(FixtureSource):
+            def get(self, event_id: str, name: str) -> str | None:
+                if name == "r12270.html":
+                    return None  # 404
+                return super().get(event_id, name)
+
+        source = MissingProfile(FIXTURES_DIR, rikishi="rikishi_sample.html")
+        with StandinServer(source) as server:
+            configure_base_url(server.base_url)
+            assert refresh_rikishi(
+                fact_path, dim_path, tmp_path / "raw", False, TTL, concurrency=1, now=NOW,
+            ) == 2
+
+        with open(dim_path, encoding="utf-8", newline="") as f:
+            assert [r["rid"] for r in csv.DictReader(f)] == ["11980", "12451"]
@@ -0,0 +1,33 @@
+"""Tests for sumodata.soup."""
+
+from bs4 import BeautifulSoup
+
+from sumodata.soup import PageFilter
+
+PAGE = """<html><head><title>Results</title><script>var x = "<table>";</script></head>
+<body><div class="menu"><a href="Banzuke.aspx">Banzuke</a> text</div>
+<table class="layout"><tr><td>
+  <table class="wide tk_table"><tr><td>bout</td></tr></table>
+</td></tr></table>
+<a href="Results.aspx?b=202501&d=16">Playoffs</a>
+</body></html>"""
+
+
+class TestPageFilter:
+    """Tests for PageFilter."""
+
+    def _soup(self, page_filter: PageFilter) -> BeautifulSoup:
+        return BeautifulSoup(PAGE, "html.parser", parse_only=page_filter)
+
+    def test_keeps_only_wanted_subtrees(self) -> None:
+        soup = self._soup(PageFilter(("tk_table",)))
+        assert [t["class"] for t in soup.find_all("table")] == [["wide", "tk_table"]]
+        assert soup.find("script") is None
+        assert soup.find("a") is None
+        assert "text" not in soup.get_text()
+
+    def test_names_and_hrefs(self) -> None:
+        soup = self._soup(PageFilter((), names=("title",), hrefs=("d=16",)))
+        assert soup.title.get_text() == "Results"
+        assert [a["href"] for a in soup.find_all("a")] == ["Results.aspx?b=202501&d=16"]
+        assert soup.find("table") is None
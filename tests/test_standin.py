@@ -0,0 +1,345 @@
+"""Tests for sumodata.standin."""
+
+import csv
+import json
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+from sumodata import cli, fetch, io_csv
+from sumodata.cache import CacheMeta, DirectoryCache, PackCache
+from sumodata.fact_store import FactStore
+from sumodata.fetch import (
+    DEFAULT_BASE_URL,
+    DEFAULT_RATE,
+    configure_base_url,
+    configure_rate_limit,
+)
+from sumodata.io_csv import update_fact_csv
+from sumodata.parse_results import parse_results_page
+from sumodata.standin import (
+    CacheSource,
+    FixtureSource,
+    StandinConfig,
+    StandinServer,
+    page_key,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture()
+def fixture_source() -> FixtureSource:
+    return FixtureSource(FIXTURES_DIR)
+
+
+class TestPageKey:
+    def test_results_day(self) -> None:
+        assert page_key("/Results.aspx", "b=202501&d=3") == (
+            "honbasho-202501", "results_d03.html",
+        )
+
+    def test_playoff_day(self) -> None:
+        assert page_key("/Results.aspx", "b=202501&d=16") == (
+            "honbasho-202501", "playoff.html",
+        )
+
+    def test_banzuke(self) -> None:
+        assert page_key("/Banzuke.aspx", "b=202501") == (
+            "honbasho-202501", "banzuke.html",
+        )
+
+    def test_rikishi(self) -> None:
+        assert page_key("/Rikishi.aspx", "r=12270") == ("rikishi", "r12270.html")
+
+    def test_unknown(self) -> None:
+        assert page_key("/Results.aspx", "b=202501") is None
+        assert page_key("/Other.aspx", "") is None
+
+
+class TestStandinServer:
+    def test_serves_fixture_pages(self, fixture_source: FixtureSource) -> None:
+        with StandinServer(fixture_source) as server:
+            resp = requests.get(f"{server.base_url}/Banzuke.aspx?b=202501")
+            missing = requests.get(f"{server.base_url}/Rikishi.aspx?r=1")
+        assert resp.status_code == 200
+        assert resp.text == (FIXTURES_DIR / "banzuke_multi_division.html").read_text(
+            encoding="utf-8",
+        )
+        assert missing.status_code == 404
+        assert server.counts["pages"] == 1
+        assert server.counts["not_found"] == 1
+
+    def test_serves_recorded_cache(self, tmp_path: Path) -> None:
+        PackCache().put(
+            tmp_path / "honbasho-202401" / "results_d01.html",
+            "<html>day 1</html>", CacheMeta(url="u", fetched_at="t"),
+        )
+        with StandinServer(CacheSource(tmp_path, "pack")) as server:
+            hit = requests.get(f"{server.base_url}/Results.aspx?b=202401&d=1")
+            miss = requests.get(f"{server.base_url}/Results.aspx?b=202401&d=2")
+        assert hit.text == "<html>day 1</html>"
+        assert miss.status_code == 404
+
+    def test_injected_errors(self, fixture_source: FixtureSource) -> None:
+        config = StandinConfig(error_rate=1.0, error_status=429, retry_after=5)
+        with StandinServer(fixture_source, config) as server:
+            resp = requests.get(f"{server.base_url}/Results.aspx?b=202501&d=1")
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "5"
+        assert server.counts["errors"] == 1
+
+    def test_conditional_request(self, fixture_source: FixtureSource) -> None:
+        url_path = "/Results.aspx?b=202501&d=1"
+        with StandinServer(fixture_source) as server:
+            first = requests.get(server.base_url + url_path)
+            second = requests.get(
+                server.base_url + url_path,
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+        assert second.status_code == 304
+        assert server.counts["not_modified"] == 1
+
+    def test_latency(self, fixture_source: FixtureSource) -> None:
+        with StandinServer(fixture_source, StandinConfig(latency=0.2)) as server:
+            t0 = time.monotonic()
+            requests.get(f"{server.base_url}/Banzuke.aspx?b=202501")
+        assert time.monotonic() - t0 >= 0.2
+
+
+class TestEndToEnd:
+    """cli.main against the stand-in through --base-url."""
+
+    def teardown_method(self) -> None:
+        configure_base_url(DEFAULT_BASE_URL)
+        configure_rate_limit(DEFAULT_RATE)
+
+    def test_full_pipeline(
+        self,
+        fixture_source: FixtureSource,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        with StandinServer(fixture_source) as server:
+            cli.main([
+                "--basho", "202501", "--base-url", server.base_url,
+                "--rate", "1000", "--adaptive-rate", "off",
+            ])
+        # 15 days, banzuke and the playoff linked from day 15
+        assert server.counts["pages"] == 17
+
+        with open(tmp_path / "data" / "fact" / "fact_bout_daily.csv", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert {r["day"] for r in rows} == {str(d) for d in range(1, 17)}
+        assert all(r["source_url"].startswith(server.base_url) for r in rows)
+        assert DirectoryCache().get(
+            tmp_path / "data" / "raw" / "honbasho-202501" / "banzuke.html",
+        ) is not None
+
+    def test_metrics_export(
+        self,
+        fixture_source: FixtureSource,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        config = StandinConfig(error_rate=0.2, seed=3)
+        with StandinServer(fixture_source, config) as server:
+            cli.main([
+                "--basho", "202501", "--base-url", server.base_url,
+                "--rate", "1000", "--adaptive-rate", "off",
+                "--metrics-json", "metrics.json", "--metrics-prom", "sumodata.prom",
+            ])
+        data = json.loads((tmp_path / "metrics.json").read_text(encoding="utf-8"))
+        assert data["requests"] == server.counts["requests"]
+        assert data["responses"].get("503", 0) == server.counts["errors"]
+        assert data["retries"] == server.counts["errors"]
+        assert data["bytes_downloaded"] == server.counts["bytes"]
+        assert data["cache"]["miss"] == 17
+        assert set(data["phase_seconds"]) == {"fetch", "parse", "write"}
+        assert (tmp_path / "sumodata.prom").exists()
+
+    @pytest.mark.parametrize("pool", ["thread", "process"])
+    def test_pipeline_matches_sequential_parse(
+        self,
+        pool: str,
+        fixture_source: FixtureSource,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        # Jitter makes pages complete out of order
+        config = StandinConfig(latency=0.01, jitter=0.05, seed=7)
+        with StandinServer(fixture_source, config) as server:
+            cli.main([
+                "--basho", "202501", "--base-url", server.base_url,
+                "--rate", "1000", "--adaptive-rate", "off", "--raw-cache", "off",
+                "--parse-pool", pool, "--parse-workers", "3",
+            ])
+        fact = tmp_path / "data" / "fact" / "fact_bout_daily.csv"
+        with open(fact, encoding="utf-8") as f:
+            fetched_at = {r["event_id"]: r["fetched_at"] for r in csv.DictReader(f)}
+
+        # The same pages parsed one after another, written the same way
+        base = server.base_url
+        records = []
+        for day in range(1, 17):
+            event_id = "honbasho-202501" if day < 16 else "honbasho-202501-playoff"
+            records.extend(parse_results_page(
+                html=fixture_source.get(*page_key("/Results.aspx", f"b=202501&d={day}")),
+                event_id=event_id,
+                event_type="honbasho_regular" if day < 16 else "honbasho_playoff",
+                is_regular="T" if day < 16 else "F",
+                basho="202501",
+                day=day,
+                source_url=f"{base}/Results.aspx?b=202501&d={day}",
+                fetched_at=fetched_at[event_id],
+            ))
+        expected = tmp_path / "expected.csv"
+        for event_id in ("honbasho-202501", "honbasho-202501-playoff"):
+            update_fact_csv(
+                [r for r in records if r.event_id == event_id], expected, False, event_id,
+            )
+        assert fact.read_bytes() == expected.read_bytes()
+
+    def test_range_run_writes_once(
+        self,
+        fixture_source: FixtureSource,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        writes: list[Path] = []
+        original = io_csv.atomic_write
+        monkeypatch.setattr(
+            io_csv, "atomic_write", lambda path: (writes.append(path), original(path))[1],
+        )
+        with StandinServer(fixture_source) as server:
+            cli.main([
+                "--from", "202411", "--to", "202503", "--base-url", server.base_url,
+                "--rate", "1000", "--adaptive-rate", "off", "--raw-cache", "off",
+                "--parse-workers", "3",
+            ])
+        # 3 basho x 16 pages; only 202501's day 15 links a playoff
+        assert server.counts["pages"] == 49
+        assert len(writes) == 2
+
+        with open(tmp_path / "data" / "fact" / "fact_bout_daily.csv", encoding="utf-8") as f:
+            event_ids = {r["event_id"] for r in csv.DictReader(f)}
+        assert event_ids == {
+            "honbasho-202411", "honbasho-202501", "honbasho-202501-playoff", "honbasho-202503",
+        }
+        with open(tmp_path / "data" / "dim" / "dim_shikona_by_basho.csv", encoding="utf-8") as f:
+            assert {r["basho"] for r in csv.DictReader(f)} == {"202411", "202501", "202503"}
+
+    def test_partitioned_run_writes_each_basho(
+        self,
+        fixture_source: FixtureSource,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        (tmp_path / "data").mkdir()
+        monkeypatch.chdir(tmp_path)
+        fact = tmp_path / "data" / "fact"
+        fact.mkdir()
+        FactStore(fact / "fact_bout_daily.csv").split()
+        log: list[str] = []
+        original_write, original_iter = io_csv.atomic_write, cli.iter_basho
+        monkeypatch.setattr(
+            io_csv, "atomic_write",
+            lambda path: (log.append(path.parent.name), original_write(path))[1],
+        )
+
+        def iter_basho(*args, **kwargs):
+            for result in original_iter(*args, **kwargs):
+                log.append(f"parsed {result.basho}")
+                yield result
+
+        monkeypatch.setattr(cli, "iter_basho", iter_basho)
+        with StandinServer(fixture_source) as server:
+            cli.main([
+                "--from", "202411", "--to", "202503", "--base-url", server.base_url,
+                "--rate", "1000", "--adaptive-rate", "off", "--raw-cache", "off",
+            ])
+        # Each partition is written before the next basho is taken in
+        assert log == [
+            "parsed 202411", "basho=202411",
+            "parsed 202501", "basho=202501",
+            "parsed 202503", "basho=202503",
+            "dim",
+        ]
+        assert FactStore(fact / "fact_bout_daily.csv").bashos() == ["202411", "202501", "202503"]
+
+    @pytest.mark.parametrize("argv", [
+        ["--basho", "202501", "--from", "202401", "--to", "202501"],
+        ["--from", "202401"],
+        ["--from", "202412", "--to", "202412"],
+        [],
+    ])
+    def test_invalid_basho_selection(self, argv: list[str]) -> None:
+        with pytest.raises(SystemExit):
+            cli.main(argv)
+
+    @pytest.mark.parametrize("rate", ["0", "-1", "nan", "fast"])
+    def test_invalid_rate_is_a_usage_error(
+        self, rate: str, capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        for argv in (["--basho", "202501"], ["watch", "--basho", "202501"]):
+            with pytest.raises(SystemExit) as exc:
+                cli.main([*argv, "--rate", rate])
+            assert exc.value.code == 2
+            assert "--rate" in capsys.readouterr().err
+
+    def test_resume_after_failure(
+        self,
+        fixture_source: FixtureSource,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(fetch, "BACKOFF_BASE", 0)
+        argv = [
+            "--from", "202411", "--to", "202503",
+            "--rate", "1000", "--adaptive-rate", "off", "--raw-cache", "off",
+        ]
+
+        class MissingPage:
+            def get(self, event_id: str, name: str) -> str | None:
+                if (event_id, name) == ("honbasho-202503", "results_d09.html"):
+                    return None
+                return fixture_source.get(event_id, name)
+
+        clean = tmp_path / "clean"
+        (clean / "data").mkdir(parents=True)
+        monkeypatch.chdir(clean)
+        with StandinServer(fixture_source) as server:
+            cli.main([*argv, "--base-url", server.base_url])
+
+        work = tmp_path / "work"
+        (work / "data").mkdir(parents=True)
+        monkeypatch.chdir(work)
+        with StandinServer(MissingPage()) as server, pytest.raises(SystemExit):
+            cli.main([*argv, "--base-url", server.base_url])
+        assert (work / "data" / "journal").is_dir()
+        assert not (work / "data" / "fact" / "fact_bout_daily.csv").exists()
+
+        with StandinServer(fixture_source) as server:
+            cli.main([*argv, "--base-url", server.base_url, "--resume"])
+        # Only pages that were not parsed before the failure are fetched again
+        assert 1 <= server.counts["pages"] < 49
+        assert not (work / "data" / "journal").exists()
+
+        def rows(root: Path) -> list[dict]:
+            with open(root / "data" / "fact" / "fact_bout_daily.csv", encoding="utf-8") as f:
+                return [
+                    {k: v for k, v in r.items() if k not in ("fetched_at", "source_url")}
+                    for r in csv.DictReader(f)
+                ]
+
+        assert rows(work) == rows(clean)
@@ -0,0 +1,29 @@
+"""Tests for sumodata.util."""
+
+import pytest
+
+from sumodata.util import honbasho_range
+
+
+class TestHonbashoRange:
+    def test_odd_months_inclusive(self) -> None:
+        assert honbasho_range("202411", "202505") == [
+            "202411", "202501", "202503", "202505",
+        ]
+
+    def test_even_month_bounds(self) -> None:
+        assert honbasho_range("202402", "202406") == ["202403", "202405"]
+
+    def test_single(self) -> None:
+        assert honbasho_range("202501", "202501") == ["202501"]
+
+    def test_reversed_is_empty(self) -> None:
+        assert honbasho_range("202503", "202501") == []
+
+    def test_full_history_count(self) -> None:
+        assert len(honbasho_range("200001", "202411")) == 150
+
+    @pytest.mark.parametrize("value", ["2025", "202513", "2025-01", "abcdef"])
+    def test_invalid(self, value: str) -> None:
+        with pytest.raises(ValueError):
+            honbasho_range(value, "202501")